@@ -1,38 +1,185 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 from dataclasses import asdict, dataclass
-from typing import Dict
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
 
-from fastapi import FastAPI
+import pandas as pd
+from fastapi import Body, FastAPI, Header, HTTPException, Response, WebSocket, WebSocketDisconnect
 
+from ..indicators.cache import IndicatorCache
+from ..main import TradingBot
+from ..strategies.base import Strategy
 from ..strategies.breakout import BreakoutStrategy
 from ..strategies.orderflow import OrderflowStrategy
 from ..strategies.reversion import MeanReversionStrategy
 from ..strategies.trend_following import TrendFollowingStrategy
-from ..utils.config import TradingBotConfig
+from ..utils.config import DEFAULT_CONFIG, TradingBotConfig
+from ..utils.data_loader import DataLoader
+from .snapshots import Payload, SnapshotService
+
+# The job queue pulls in backtrader (about a second), so it is imported when an app is created;
+# a live loop is only ever passed in.
+if TYPE_CHECKING:
+    from ..backtest.jobs import BacktestJobQueue
+    from ..live.trading_loop import LiveTradingLoop
 
 
 @dataclass
 class BotState:
     config: TradingBotConfig
+    strategies: List[Strategy]
+    snapshots: SnapshotService
+    backtests: BacktestJobQueue
+    live: Optional[LiveTradingLoop] = None
+
+
+def _payload_response(payload: Optional[Payload], if_none_match: Optional[str]) -> Response:
+    if payload is None:
+        return Response(status_code=503, content=b'{"detail":"No bar processed yet"}', media_type="application/json")
+    headers = {"ETag": payload.etag, "Cache-Control": "no-cache"}
+    if payload.matches(if_none_match):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload.body, media_type="application/json", headers=headers)
+
+
+def create_app(
+    config: TradingBotConfig = DEFAULT_CONFIG,
+    data_loader: Optional[DataLoader] = None,
+    poll_interval: Optional[float] = 30.0,
+    live_loop: Optional[LiveTradingLoop] = None,
+) -> FastAPI:
+    """API over a per-bar snapshot.
+
+    With ``poll_interval`` set, a background task fetches new bars into the store, checks the
+    store's last bar (metadata only) and recomputes signals and features once per new bar. A
+    ``live_loop``, when given, is started with the app and feeds the snapshot with its bars
+    instead (the stored bars before its first one serve as warmup). ``state.snapshots.refresh``
+    can also be fed directly. Backtest jobs run in a process pool owned by the app.
+    """
+
+    from ..backtest.jobs import BacktestJobQueue, BacktestRequest
+
+    strategies: List[Strategy] = [
+        TrendFollowingStrategy(),
+        BreakoutStrategy(),
+        MeanReversionStrategy(),
+        OrderflowStrategy(),
+    ]
+    state = BotState(
+        config=config,
+        strategies=strategies,
+        snapshots=SnapshotService(
+            strategies=strategies,
+            cache=IndicatorCache(max_bytes=config.indicator_cache_bytes),
+            sentiment=TradingBot(config).sentiment_features if config.sentiment.include_features else None,
+        ),
+        backtests=BacktestJobQueue(config.data, max_workers=config.api.backtest_workers),
+        live=live_loop,
+    )
+    strategy_params = {strat.name: dict(strat.__dict__) for strat in strategies}
+    loader = data_loader or DataLoader(config.data)
+
+    def last_bar() -> Optional[pd.Timestamp]:
+        return loader.store.last_timestamp(config.data.symbol, config.data.interval)
 
+    @contextlib.asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        state.backtests.start()
+        tasks: List["asyncio.Task[object]"] = []
+        if state.live is not None:
+            if state.snapshots.history is None and await asyncio.to_thread(last_bar) is not None:
+                state.snapshots.history = await asyncio.to_thread(loader.load_historical_data)
+            state.live.listeners.append(state.snapshots.on_bar)
+            tasks.append(asyncio.create_task(state.live.run()))
+        elif poll_interval is not None:
+            tasks.append(
+                asyncio.create_task(
+                    state.snapshots.poll(
+                        last_bar=last_bar,
+                        load=loader.load_historical_data,
+                        interval=poll_interval,
+                        update=loader.update_historical_data,
+                    )
+                )
+            )
+        yield
+        if state.live is not None:
+            state.live.listeners.remove(state.snapshots.on_bar)
+        for task in tasks:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        await asyncio.to_thread(state.backtests.shutdown)
 
-def create_app(config: TradingBotConfig) -> FastAPI:
-    app = FastAPI(title="AI Trading Bot")
-    state = BotState(config=config)
+    app = FastAPI(title="AI Trading Bot", lifespan=lifespan)
+    app.state.bot = state
 
     @app.get("/config")
     def get_config() -> Dict[str, object]:
         return asdict(state.config)
 
     @app.get("/strategies")
-    def list_strategies() -> Dict[str, Dict[str, float]]:
-        strategies = [
-            TrendFollowingStrategy(),
-            BreakoutStrategy(),
-            MeanReversionStrategy(),
-            OrderflowStrategy(),
-        ]
-        return {strat.name: strat.__dict__ for strat in strategies}
+    def list_strategies() -> Dict[str, Dict[str, object]]:
+        return strategy_params
+
+    @app.get("/signals")
+    def get_signals(if_none_match: Optional[str] = Header(default=None)) -> Response:
+        snapshot = state.snapshots.snapshot
+        return _payload_response(snapshot.signals if snapshot else None, if_none_match)
+
+    @app.get("/features/latest")
+    def get_latest_features(if_none_match: Optional[str] = Header(default=None)) -> Response:
+        snapshot = state.snapshots.snapshot
+        return _payload_response(snapshot.features if snapshot else None, if_none_match)
+
+    @app.get("/live/metrics")
+    def live_metrics() -> Dict[str, object]:
+        if state.live is None:
+            raise HTTPException(status_code=404, detail="No live loop attached")
+        return {"bars": state.live.bars, **state.live.metrics()}
+
+    @app.post("/backtests", status_code=202)
+    def submit_backtest(response: Response, payload: Dict[str, Any] = Body(default_factory=dict)) -> Dict[str, object]:
+        try:
+            request = BacktestRequest.from_json(payload)
+        except (TypeError, ValueError) as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from exc
+        job = state.backtests.submit(request)
+        if job.cached:
+            response.status_code = 200
+        return job.to_json()
+
+    @app.get("/backtests")
+    def list_backtests() -> List[Dict[str, object]]:
+        return [job.to_json() for job in state.backtests.recent()]
+
+    @app.get("/backtests/{job_id}")
+    def get_backtest(job_id: str) -> Dict[str, object]:
+        job = state.backtests.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Unknown backtest job")
+        return job.to_json()
+
+    @app.delete("/backtests/{job_id}")
+    def cancel_backtest(job_id: str) -> Dict[str, object]:
+        job = state.backtests.cancel(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Unknown backtest job")
+        return job.to_json()
+
+    @app.websocket("/ws/signals")
+    async def stream_signals(websocket: WebSocket) -> None:
+        await websocket.accept()
+        queue = state.snapshots.subscribe()
+        try:
+            while True:
+                body = await queue.get()
+                await websocket.send_text(body.decode())
+        except WebSocketDisconnect:
+            pass
+        finally:
+            state.snapshots.unsubscribe(queue)
 
     return app
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import math
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set
+
+import pandas as pd
+
+from ..indicators.cache import IndicatorCache
+from ..ml_engine.feature_engineering import SENTIMENT_COLUMNS, build_feature_matrix, feature_columns
+from ..strategies.base import Strategy
+from ..utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from ..live.trading_loop import BarEvent
+
+logger = get_logger(__name__)
+
+
+def _json_value(value: object) -> object:
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if hasattr(value, "item"):  # NumPy scalars
+        return _json_value(value.item())  # type: ignore[union-attr]
+    return value
+
+
+def _utc(stamp: pd.Timestamp) -> pd.Timestamp:
+    # Stores report UTC while frames may carry naive or local timestamps.
+    return stamp.tz_localize("UTC") if stamp.tzinfo is None else stamp.tz_convert("UTC")
+
+
+@dataclass(frozen=True)
+class Payload:
+    """A JSON document serialised once, with its strong ETag."""
+
+    body: bytes
+    etag: str
+
+    @classmethod
+    def build(cls, document: Dict[str, object]) -> "Payload":
+        body = json.dumps(document, separators=(",", ":"), default=str).encode()
+        return cls(body=body, etag=f'"{hashlib.sha1(body).hexdigest()}"')
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or self.etag in tags
+
+
+@dataclass(frozen=True)
+class SignalSnapshot:
+    bar: pd.Timestamp
+    signals: Payload
+    features: Payload
+
+
+@dataclass
+class SnapshotService:
+    """Computes strategy signals and the latest feature row once per new bar.
+
+    Request handlers only read the current ``SignalSnapshot``; WebSocket subscribers get each new
+    signal document pushed through a one-slot queue, so a slow client skips to the newest bar
+    instead of building a backlog. ``sentiment`` (e.g. ``TradingBot.sentiment_features``) maps
+    the bars to bar-aligned sentiment columns, which are then part of the feature row.
+
+    The bars come either from ``poll`` over the market store or from a live loop through
+    ``on_bar``, which appends each live bar to ``history`` (seeded with stored bars for the
+    indicator warmup) and keeps its last ``max_bars``.
+    """
+
+    strategies: List[Strategy]
+    cache: IndicatorCache = field(default_factory=IndicatorCache)
+    sentiment: Optional[Callable[[pd.DataFrame], Optional[pd.DataFrame]]] = None
+    snapshot: Optional[SignalSnapshot] = None
+    history: Optional[pd.DataFrame] = None
+    max_bars: int = 5_000
+    _subscribers: Set["asyncio.Queue[bytes]"] = field(default_factory=set, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _latest: Optional[pd.DataFrame] = field(default=None, repr=False)
+    _publisher: Optional["asyncio.Task[None]"] = field(default=None, repr=False)
+
+    def refresh(self, data: pd.DataFrame) -> bool:
+        """Rebuild the snapshot when ``data`` ends on a new bar; returns whether it changed."""
+
+        if data.empty:
+            return False
+        bar = data.index[-1]
+        with self._lock:
+            if self.snapshot is not None and self.snapshot.bar == bar:
+                return False
+            self.snapshot = SignalSnapshot(
+                bar=bar,
+                signals=Payload.build(self._signals_document(data, bar)),
+                features=Payload.build(self._features_document(data, bar)),
+            )
+        logger.info("Refreshed signal snapshot for bar %s", bar)
+        return True
+
+    def _signals_document(self, data: pd.DataFrame, bar: pd.Timestamp) -> Dict[str, object]:
+        signals: Dict[str, object] = {}
+        for strat in self.strategies:
+            try:
+                result = strat.generate_signal(data, cache=self.cache)
+            except Exception as exc:  # pragma: no cover - runtime safety
+                logger.exception("Strategy %s failed during snapshot: %s", strat.name, exc)
+                result = None
+            signals[strat.name] = None if result is None else {k: _json_value(v) for k, v in asdict(result).items()}
+        return {"bar": bar.isoformat(), "signals": signals}
+
+    def _features_document(self, data: pd.DataFrame, bar: pd.Timestamp) -> Dict[str, object]:
+        sentiment = self._sentiment(data)
+        features = build_feature_matrix(
+            data, cache=self.cache, sentiment=sentiment, dropna=False, columns=feature_columns(sentiment is not None)
+        )
+        latest = features.iloc[-1]
+        return {"bar": bar.isoformat(), "features": {c: _json_value(latest[c]) for c in features.columns}}
+
+    def _sentiment(self, data: pd.DataFrame) -> Optional[pd.DataFrame]:
+        if self.sentiment is None:
+            return None
+        try:
+            return self.sentiment(data)
+        except Exception as exc:  # pragma: no cover - runtime safety
+            logger.exception("Sentiment features failed during snapshot: %s", exc)
+            return pd.DataFrame(float("nan"), index=data.index, columns=SENTIMENT_COLUMNS)
+
+    def subscribe(self) -> "asyncio.Queue[bytes]":
+        queue: "asyncio.Queue[bytes]" = asyncio.Queue(maxsize=1)
+        if self.snapshot is not None:
+            queue.put_nowait(self.snapshot.signals.body)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: "asyncio.Queue[bytes]") -> None:
+        self._subscribers.discard(queue)
+
+    def broadcast(self) -> int:
+        """Hand the current signal document to every subscriber; call from the event loop."""
+
+        if self.snapshot is None:
+            return 0
+        body = self.snapshot.signals.body
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(body)
+        return len(self._subscribers)
+
+    async def publish(self, data: pd.DataFrame) -> bool:
+        """Refresh off the event loop and push to subscribers when the bar is new."""
+
+        changed = await asyncio.to_thread(self.refresh, data)
+        if changed:
+            self.broadcast()
+        return changed
+
+    def on_bar(self, event: "BarEvent") -> None:
+        """Live-loop listener: append the bar to ``history`` and publish it in the background.
+
+        Runs on the event loop. While a refresh is in flight only the newest history waits, so a
+        slow refresh skips bars instead of falling behind.
+        """
+
+        history = self.history
+        columns = list(history.columns) if history is not None else ["open", "high", "low", "close", "volume"]
+        bar = pd.DataFrame(
+            [[event.row.get(column, math.nan) for column in columns]],
+            columns=columns,
+            index=pd.DatetimeIndex([event.timestamp], name="timestamp"),
+        )
+        if history is not None:
+            # A replayed or restarted feed may begin inside the stored bars.
+            history = history[history.index < event.timestamp]
+            bar = pd.concat([history, bar]).iloc[-self.max_bars :]
+        self.history = self._latest = bar
+        if self._publisher is None or self._publisher.done():
+            self._publisher = asyncio.get_running_loop().create_task(self._publish_latest())
+
+    async def _publish_latest(self) -> None:
+        while self._latest is not None:
+            data, self._latest = self._latest, None
+            try:
+                await self.publish(data)
+            except Exception as exc:  # pragma: no cover - keep following the live loop
+                logger.exception("Snapshot refresh failed: %s", exc)
+
+    async def poll(
+        self,
+        last_bar: Callable[[], Optional[pd.Timestamp]],
+        load: Callable[[], pd.DataFrame],
+        interval: float,
+        update: Optional[Callable[[], object]] = None,
+    ) -> None:
+        """Every ``interval`` seconds run ``update`` (e.g. fetch new bars into the store), check
+        ``last_bar`` (cheap) and ``load`` only on a new bar."""
+
+        while True:
+            try:
+                if update is not None:
+                    await asyncio.to_thread(update)
+                latest = await asyncio.to_thread(last_bar)
+                current = self.snapshot.bar if self.snapshot is not None else None
+                if latest is not None and (current is None or _utc(latest) != _utc(current)):
+                    await self.publish(await asyncio.to_thread(load))
+            except Exception as exc:  # pragma: no cover - keep polling after transient failures
+                logger.exception("Snapshot refresh failed: %s", exc)
+            await asyncio.sleep(interval)
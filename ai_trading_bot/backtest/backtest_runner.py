@@ -1,15 +1,25 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
 
 import backtrader as bt
 import pandas as pd
 
+from ..indicators.cache import IndicatorCache
 from ..strategies.base import Strategy
-from ..utils.logger import get_logger
+from ..utils.logger import get_bar_logger, get_logger
+from .vectorized_engine import signal_directions, simulate
 
 logger = get_logger(__name__)
+bar_logger = get_bar_logger(__name__)
+
+# Called with (fraction done, stage); it may raise ``BacktestCancelled`` to abort the run.
+ProgressCallback = Callable[[float, str], None]
+
+
+class BacktestCancelled(Exception):
+    """Raised from a progress callback to stop a running backtest."""
 
 
 class PandasData(bt.feeds.PandasData):
@@ -25,46 +35,105 @@ class PandasData(bt.feeds.PandasData):
 
 
 class SignalStrategy(bt.Strategy):
-    params = dict(strategies=None, risk_per_trade=0.01, historical_df=None)
+    params = dict(signals=None, risk_per_trade=0.01, warmup=50, progress=None, bars=0)
 
     def __init__(self):
-        self.strategies: List[Strategy] = self.params.strategies or []
-        self.historical_df: pd.DataFrame = self.params.historical_df
+        self.signals: Dict[str, pd.DataFrame] = self.params.signals or {}
+        self._columns = {
+            name: (
+                frame["signal"].to_numpy(),
+                frame["confidence"].to_numpy(),
+                frame["reason"].to_numpy(),
+            )
+            for name, frame in self.signals.items()
+        }
+        self.equity: List[float] = []
+        self._report_every = max(self.params.bars // 100, 1)
 
     def next(self):
-        current_dt = self.data.datetime.datetime(0)
-        current_history = self.historical_df.loc[: current_dt].copy()
-        if len(current_history) < 50:
+        value = self.broker.getvalue()
+        self.equity.append(value)
+        bar = len(self.data) - 1
+        if self.params.progress is not None and bar % self._report_every == 0:
+            self.params.progress(0.5 + 0.5 * bar / max(self.params.bars, 1), "simulating")
+        # Sizing off a non-positive value would flip or zero the orders, so a wiped-out account
+        # stops trading (as ``vectorized_engine.simulate`` does).
+        if bar + 1 < self.params.warmup or value <= 0.0:
             return
-        for strat in self.strategies:
-            try:
-                result = strat.generate_signal(current_history)
-            except Exception as exc:  # pragma: no cover - runtime safety
-                logger.exception("Strategy %s failed: %s", strat.name, exc)
-                continue
-            if result is None:
+        for name, (signals, confidences, reasons) in self._columns.items():
+            signal = signals[bar]
+            if signal is None:
                 continue
-            size = (self.broker.getvalue() * self.params.risk_per_trade) / self.data.close[0]
-            if result.signal == "buy":
+            size = (value * self.params.risk_per_trade) / self.data.close[0]
+            if signal == "buy":
                 self.buy(size=size)
-            elif result.signal == "sell":
+            elif signal == "sell":
                 self.sell(size=size)
-            logger.info(
+            bar_logger.info(
                 "Executed %s signal with confidence %.2f: %s",
-                strat.name,
-                result.confidence,
-                result.reason,
+                name,
+                confidences[bar],
+                reasons[bar],
             )
 
 
+def precompute_signals(
+    strategies: List[Strategy],
+    data: pd.DataFrame,
+    cache: Optional[IndicatorCache] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> Dict[str, pd.DataFrame]:
+    cache = cache or IndicatorCache()
+    signals: Dict[str, pd.DataFrame] = {}
+    for done, strat in enumerate(strategies, start=1):
+        try:
+            signals[strat.name] = strat.generate_signals(data, cache=cache)
+        except Exception as exc:  # pragma: no cover - runtime safety
+            logger.exception("Strategy %s failed: %s", strat.name, exc)
+        if progress is not None:
+            progress(0.5 * done / len(strategies), f"signals: {strat.name}")
+    return signals
+
+
+ENGINES = ("backtrader", "vectorized")
+
+
 @dataclass
 class BacktestRunner:
     cash: float = 10_000.0
     commission: float = 0.00075
     risk_per_trade: float = 0.01
     strategies: Optional[List[Strategy]] = None
+    engine: str = "backtrader"
+    warmup: int = 50
+    cache: Optional[IndicatorCache] = None
+    progress: Optional[ProgressCallback] = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.engine not in ENGINES:
+            raise ValueError(f"Unsupported backtest engine: {self.engine}")
 
     def run(self, data: pd.DataFrame) -> Dict[str, float]:
+        metrics, _ = self.run_with_equity(data)
+        return metrics
+
+    def run_with_equity(self, data: pd.DataFrame) -> Tuple[Dict[str, float], pd.Series]:
+        signals = precompute_signals(self.strategies or [], data, cache=self.cache, progress=self.progress)
+        if self.progress is not None:
+            self.progress(0.5, "simulating")
+        logger.info("Starting %s backtest with cash %.2f", self.engine, self.cash)
+        if self.engine == "vectorized":
+            equity = self._run_vectorized(data, signals)
+        else:
+            equity = self._run_backtrader(data, signals)
+        final_value = float(equity.iloc[-1]) if len(equity) else self.cash
+        pnl = final_value - self.cash
+        logger.info("Backtest completed. Final value: %.2f", final_value)
+        if self.progress is not None:
+            self.progress(1.0, "done")
+        return {"final_value": final_value, "pnl": pnl, "return_pct": pnl / self.cash}, equity
+
+    def _run_backtrader(self, data: pd.DataFrame, signals: Dict[str, pd.DataFrame]) -> pd.Series:
         cerebro = bt.Cerebro()
         cerebro.broker.setcash(self.cash)
         cerebro.broker.setcommission(commission=self.commission)
@@ -73,13 +142,24 @@ class BacktestRunner:
         cerebro.adddata(feed)
         cerebro.addstrategy(
             SignalStrategy,
-            strategies=self.strategies or [],
+            signals=signals,
             risk_per_trade=self.risk_per_trade,
-            historical_df=data,
+            warmup=self.warmup,
+            progress=self.progress,
+            bars=len(data),
         )
-        logger.info("Starting backtest with cash %.2f", self.cash)
-        cerebro.run()
-        final_value = cerebro.broker.getvalue()
-        pnl = final_value - self.cash
-        logger.info("Backtest completed. Final value: %.2f", final_value)
-        return {"final_value": final_value, "pnl": pnl, "return_pct": pnl / self.cash}
+        strategy = cerebro.run()[0]
+        return pd.Series(strategy.equity, index=data.index[: len(strategy.equity)], name="equity")
+
+    def _run_vectorized(self, data: pd.DataFrame, signals: Dict[str, pd.DataFrame]) -> pd.Series:
+        result = simulate(
+            data["open"].to_numpy(dtype=float),
+            data["close"].to_numpy(dtype=float),
+            signal_directions(signals, len(data)),
+            cash=self.cash,
+            commission=self.commission,
+            risk_per_trade=self.risk_per_trade,
+            warmup=self.warmup,
+        )
+        logger.info("Vectorized backtest filled %d orders (%d rejected)", result.fills, result.rejected)
+        return pd.Series(result.equity, index=data.index, name="equity")
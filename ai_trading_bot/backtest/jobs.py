@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import multiprocessing
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
+from typing import Dict, List, Mapping, Optional
+
+from ..indicators.registry import registered
+from ..utils.config import BacktestConfig, DataSourceConfig
+from ..utils.data_loader import DataLoader
+from ..utils.logger import get_logger
+from ..utils.market_store import _to_utc
+from .backtest_runner import ENGINES, BacktestCancelled, BacktestRunner
+from .parameter_sweep import STRATEGY_TYPES, build_strategies
+
+logger = get_logger(__name__)
+
+JOB_STATES = ("queued", "running", "cancelling", "done", "failed", "cancelled")
+_FINAL_STATES = ("done", "failed", "cancelled")
+
+
+def _check_fields(owner: type, values: Mapping[str, object], label: str) -> None:
+    """Reject keys that are not fields of the dataclass ``owner`` and values of the wrong type."""
+
+    defaults = {f.name: f.default for f in fields(owner) if f.init and f.name != "name"}
+    unknown = set(values) - set(defaults)
+    if unknown:
+        raise ValueError(f"Unknown {label}: {', '.join(sorted(unknown))}")
+    for key, value in values.items():
+        expected = type(defaults[key])
+        if expected in (int, float):
+            valid = isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+            kind = "a finite number"
+        else:
+            valid = isinstance(value, expected)
+            kind = f"a {expected.__name__}"
+        if not valid:
+            raise ValueError(f"{key} of {label} must be {kind}, got {value!r}")
+
+
+@dataclass(frozen=True)
+class BacktestRequest:
+    """What to backtest: a stored data range, strategy overrides and broker settings."""
+
+    start: Optional[str] = None
+    end: Optional[str] = None
+    # strategy name -> field overrides; an empty mapping runs that strategy with its defaults.
+    strategies: Mapping[str, Mapping[str, float]] = field(
+        default_factory=lambda: {name: {} for name in STRATEGY_TYPES}
+    )
+    config: BacktestConfig = field(default_factory=BacktestConfig)
+
+    @classmethod
+    def from_json(cls, payload: Mapping[str, object]) -> "BacktestRequest":
+        """Parse a request body, validating it fully so a bad request fails at submission
+        (``ValueError``) instead of in the worker."""
+
+        strategies = payload.get("strategies") or {name: {} for name in STRATEGY_TYPES}
+        if isinstance(strategies, list):
+            strategies = {name: {} for name in strategies}
+        if not isinstance(strategies, Mapping):
+            raise ValueError("strategies must be a list of names or a mapping of name to parameters")
+        for name, params in strategies.items():
+            if name not in STRATEGY_TYPES:
+                raise ValueError(f"Unknown strategy: {name}")
+            if not isinstance(params, Mapping):
+                raise ValueError(f"Parameters of {name} must be a mapping")
+            _check_fields(STRATEGY_TYPES[name], params, f"{name} parameters")
+        overrides = payload.get("config") or {}
+        if not isinstance(overrides, Mapping):
+            raise ValueError("config must be a mapping of backtest settings")
+        _check_fields(BacktestConfig, overrides, "backtest settings")
+        config = BacktestConfig(**overrides)
+        if config.engine not in ENGINES:
+            raise ValueError(f"Unsupported backtest engine: {config.engine}")
+        for bound in ("start", "end"):
+            value = payload.get(bound)
+            if value is not None and not isinstance(value, str):
+                raise ValueError(f"{bound} must be a date string")
+            if value is not None:
+                _to_utc(value)  # raises ValueError for unparsable dates
+        request = cls(
+            start=payload.get("start"),  # type: ignore[arg-type]
+            end=payload.get("end"),  # type: ignore[arg-type]
+            strategies={name: dict(params) for name, params in strategies.items()},
+            config=config,
+        )
+        # Parameters such as the breakout session name the indicators a strategy reads.
+        for strategy in build_strategies(list(request.strategies), request.parameters()):
+            missing = [column for column in strategy.indicator_map().values() if not registered(column)]
+            if missing:
+                raise ValueError(f"{strategy.name} reads unknown indicators: {', '.join(missing)}")
+        return request
+
+    def parameters(self) -> Dict[str, float]:
+        """Overrides in the ``"strategy.field"`` form used by the parameter sweep."""
+
+        return {f"{name}.{key}": value for name, params in self.strategies.items() for key, value in params.items()}
+
+    def to_json(self) -> Dict[str, object]:
+        return {
+            "start": self.start,
+            "end": self.end,
+            "strategies": {name: dict(params) for name, params in self.strategies.items()},
+            "config": asdict(self.config),
+        }
+
+
+@dataclass
+class BacktestJob:
+    id: str
+    key: str
+    request: BacktestRequest
+    state: str = "queued"
+    progress: float = 0.0
+    stage: str = "queued"
+    result: Optional[Dict[str, float]] = None
+    error: Optional[str] = None
+    cached: bool = False
+    submitted_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    def to_json(self) -> Dict[str, object]:
+        return {
+            "id": self.id,
+            "key": self.key,
+            "state": self.state,
+            "progress": round(self.progress, 4),
+            "stage": self.stage,
+            "result": self.result,
+            "error": self.error,
+            "cached": self.cached,
+            "submitted_at": self.submitted_at,
+            "finished_at": self.finished_at,
+            "request": self.request.to_json(),
+        }
+
+
+def _run_job(
+    job_id: str,
+    data_config: DataSourceConfig,
+    request: BacktestRequest,
+    progress: Mapping[str, object],
+    cancelled: Mapping[str, bool],
+) -> Dict[str, float]:
+    def report(fraction: float, stage: str) -> None:
+        if cancelled.get(job_id):
+            raise BacktestCancelled(job_id)
+        progress[job_id] = (fraction, stage)  # type: ignore[index]
+
+    report(0.0, "loading data")
+    data = DataLoader(data_config).load_range(start=request.start, end=request.end)
+    if data.empty:
+        raise ValueError("No stored data in the requested range")
+    config = request.config
+    runner = BacktestRunner(
+        cash=config.initial_cash,
+        commission=config.commission,
+        risk_per_trade=config.risk_per_trade,
+        strategies=build_strategies(list(request.strategies), request.parameters()),
+        engine=config.engine,
+        progress=report,
+    )
+    metrics = runner.run(data)
+    return {**metrics, "bars": float(len(data))}
+
+
+@dataclass
+class BacktestJobQueue:
+    """Runs backtests in a bounded process pool; the pool's own queue holds waiting jobs.
+
+    Results are cached by a hash of the resolved data range, the metadata of the partitions it
+    covers, the strategy overrides and the ``BacktestConfig``, so an identical submission returns
+    a finished job immediately, and one that is still queued or running is shared. Workers report
+    progress through a manager dict and check a cancellation flag at every progress step.
+    """
+
+    data: DataSourceConfig
+    max_workers: int = 2
+    max_cached: int = 256
+    jobs: Dict[str, BacktestJob] = field(default_factory=dict)
+    _results: "OrderedDict[str, Dict[str, float]]" = field(default_factory=OrderedDict, repr=False)
+    _futures: Dict[str, Future] = field(default_factory=dict, repr=False)
+    _pool: Optional[ProcessPoolExecutor] = field(default=None, repr=False)
+    _manager: Optional[object] = field(default=None, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def start(self) -> None:
+        if self._pool is None:
+            manager = multiprocessing.Manager()
+            self._manager = manager
+            self._progress = manager.dict()
+            self._cancelled = manager.dict()
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            with self._lock:
+                active = list(self._futures)
+            for job_id in active:
+                self.cancel(job_id)
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._manager.shutdown()  # type: ignore[union-attr]
+            self._pool = None
+            self._manager = None
+
+    def cache_key(self, request: BacktestRequest) -> str:
+        store = DataLoader(self.data).store
+        metas = store.partitions(self.data.symbol, self.data.interval)
+        first = _to_utc(metas[0].first) if metas else None
+        last = _to_utc(metas[-1].last) if metas else None
+        start = max(_to_utc(request.start), first) if request.start and first is not None else first
+        end = min(_to_utc(request.end), last) if request.end and last is not None else last
+        # Rewritten or re-fetched partitions keep their first and last bar, so the metadata of
+        # every partition in the range is part of the key.
+        partitions = [
+            meta.to_json()
+            for meta in metas
+            if (start is None or _to_utc(meta.last) >= start) and (end is None or _to_utc(meta.first) <= end)
+        ]
+        payload = {
+            "symbol": self.data.symbol,
+            "interval": self.data.interval,
+            "start": start.isoformat() if start is not None else None,
+            "end": end.isoformat() if end is not None else None,
+            "partitions": partitions,
+            "strategies": {name: dict(sorted(params.items())) for name, params in request.strategies.items()},
+            "config": asdict(request.config),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def submit(self, request: BacktestRequest) -> BacktestJob:
+        self.start()
+        key = self.cache_key(request)
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                job = BacktestJob(
+                    id=uuid.uuid4().hex,
+                    key=key,
+                    request=request,
+                    state="done",
+                    progress=1.0,
+                    stage="done",
+                    result=self._results[key],
+                    cached=True,
+                    finished_at=time.time(),
+                )
+                self._remember(job)
+                return job
+            for job_id in self._futures:
+                active = self.jobs[job_id]
+                if active.key == key and active.state in ("queued", "running"):
+                    return active
+            job = BacktestJob(id=uuid.uuid4().hex, key=key, request=request)
+            self._remember(job)
+            assert self._pool is not None
+            future = self._pool.submit(_run_job, job.id, self.data, request, self._progress, self._cancelled)
+            self._futures[job.id] = future
+        future.add_done_callback(lambda done, job_id=job.id: self._finish(job_id, done))
+        logger.info("Queued backtest job %s", job.id)
+        return job
+
+    def _remember(self, job: BacktestJob) -> None:
+        self.jobs[job.id] = job
+        # Keep the job table bounded like the result cache; active jobs are never dropped.
+        excess = len(self.jobs) - self.max_cached
+        for job_id in [j for j, known in self.jobs.items() if known.state in _FINAL_STATES][: max(excess, 0)]:
+            del self.jobs[job_id]
+
+    def _finish(self, job_id: str, future: Future) -> None:
+        with self._lock:
+            job = self.jobs[job_id]
+            self._futures.pop(job_id, None)
+            job.finished_at = time.time()
+            if future.cancelled():
+                job.state, job.stage = "cancelled", "cancelled"
+            else:
+                error = future.exception()
+                if isinstance(error, BacktestCancelled):
+                    job.state, job.stage = "cancelled", "cancelled"
+                elif error is not None:
+                    job.state, job.stage, job.error = "failed", "failed", f"{type(error).__name__}: {error}"
+                else:
+                    job.state, job.stage, job.progress = "done", "done", 1.0
+                    job.result = future.result()
+                    self._results[job.key] = job.result
+                    while len(self._results) > self.max_cached:
+                        self._results.popitem(last=False)
+            if self._pool is not None:
+                self._progress.pop(job_id, None)
+                self._cancelled.pop(job_id, None)
+        logger.info("Backtest job %s finished: %s", job_id, job.state)
+
+    def get(self, job_id: str) -> Optional[BacktestJob]:
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is not None and job.state not in _FINAL_STATES and self._pool is not None:
+                reported = self._progress.get(job_id)
+                if reported is not None:
+                    job.progress, job.stage = reported
+                    if job.state == "queued":
+                        job.state = "running"
+            return job
+
+    def cancel(self, job_id: str) -> Optional[BacktestJob]:
+        """Drop a queued job or ask a running one to stop at its next progress step."""
+
+        with self._lock:
+            future = self._futures.get(job_id)
+            job = self.jobs.get(job_id)
+        # ``future.cancel()`` runs ``_finish`` in this thread, so the lock is not held around it.
+        if job is None or future is None:
+            return job
+        if not future.cancel():
+            with self._lock:
+                self._cancelled[job_id] = True
+                if job.state not in _FINAL_STATES:
+                    job.state = "cancelling"
+        return job
+
+    def recent(self, limit: int = 50) -> List[BacktestJob]:
+        jobs = (self.get(job_id) for job_id in list(self.jobs)[-limit:])
+        return [job for job in jobs if job is not None]
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import argparse
+import bisect
+import itertools
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..indicators.cache import IndicatorCache
+from ..strategies.base import Strategy
+from ..strategies.breakout import BreakoutStrategy
+from ..strategies.orderflow import OrderflowStrategy
+from ..strategies.reversion import MeanReversionStrategy
+from ..strategies.trend_following import TrendFollowingStrategy
+from ..utils.config import BacktestConfig
+from ..utils.logger import get_logger
+from .backtest_runner import BacktestRunner
+
+logger = get_logger(__name__)
+
+STRATEGY_TYPES = {
+    strategy.name: strategy
+    for strategy in (TrendFollowingStrategy, BreakoutStrategy, MeanReversionStrategy, OrderflowStrategy)
+}
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+ParameterSet = Dict[str, float]
+
+
+def grid_samples(grid: Dict[str, Sequence[float]]) -> List[ParameterSet]:
+    """Cartesian product of ``{"strategy.param": values}``."""
+
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def random_samples(bounds: Dict[str, Tuple[float, float]], n: int, seed: Optional[int] = None) -> List[ParameterSet]:
+    rng = np.random.default_rng(seed)
+    names = list(bounds)
+    low = np.array([bounds[name][0] for name in names])
+    high = np.array([bounds[name][1] for name in names])
+    points = low + rng.random((n, len(names))) * (high - low)
+    return [dict(zip(names, map(float, row))) for row in points]
+
+
+def sobol_samples(bounds: Dict[str, Tuple[float, float]], n: int, seed: Optional[int] = None) -> List[ParameterSet]:
+    try:
+        from scipy.stats import qmc
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise ImportError("scipy is required for Sobol sampling. Install with `pip install scipy`.") from exc
+    names = list(bounds)
+    sampler = qmc.Sobol(d=len(names), scramble=True, seed=seed)
+    points = qmc.scale(
+        sampler.random(n),
+        [bounds[name][0] for name in names],
+        [bounds[name][1] for name in names],
+    )
+    return [dict(zip(names, map(float, row))) for row in points]
+
+
+def build_strategies(names: Sequence[str], params: ParameterSet) -> List[Strategy]:
+    """Instantiate ``names`` with ``params`` overrides addressed as ``"strategy.field"``."""
+
+    overrides: Dict[str, Dict[str, float]] = {name: {} for name in names}
+    for key, value in params.items():
+        strategy, _, attribute = key.partition(".")
+        if strategy not in overrides:
+            raise ValueError(f"Parameter {key} targets a strategy that is not part of the sweep")
+        overrides[strategy][attribute] = value
+    return [STRATEGY_TYPES[name](**overrides[name]) for name in names]
+
+
+@dataclass
+class SharedOHLCV:
+    """OHLCV frame placed in a shared-memory block so pool workers map it instead of unpickling it."""
+
+    name: str
+    rows: int
+    index_name: Optional[str]
+    tz: Optional[str]
+
+    @classmethod
+    def create(cls, data: pd.DataFrame) -> Tuple["SharedOHLCV", shared_memory.SharedMemory]:
+        rows = len(data)
+        block = shared_memory.SharedMemory(create=True, size=max(rows * 8 * (len(OHLCV_COLUMNS) + 1), 1))
+        timestamps, values = cls._views(block, rows)
+        index = pd.DatetimeIndex(data.index)
+        timestamps[:] = index.as_unit("ns").asi8
+        values[:] = data[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+        tz = str(index.tz) if index.tz is not None else None
+        return cls(name=block.name, rows=rows, index_name=data.index.name, tz=tz), block
+
+    def attach(self) -> Tuple[pd.DataFrame, shared_memory.SharedMemory]:
+        block = shared_memory.SharedMemory(name=self.name)
+        timestamps, values = self._views(block, self.rows)
+        index = pd.DatetimeIndex(timestamps.view("datetime64[ns]"), name=self.index_name)
+        if self.tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self.tz)
+        frame = pd.DataFrame(values, index=index, columns=OHLCV_COLUMNS, copy=False)
+        return frame, block
+
+    @staticmethod
+    def _views(block: shared_memory.SharedMemory, rows: int) -> Tuple[np.ndarray, np.ndarray]:
+        timestamps = np.ndarray((rows,), dtype=np.int64, buffer=block.buf)
+        values = np.ndarray((rows, len(OHLCV_COLUMNS)), dtype=np.float64, buffer=block.buf, offset=rows * 8)
+        return timestamps, values
+
+
+# Per-process state populated once by ``_init_worker``.
+_WORKER: Dict[str, object] = {}
+
+
+def _init_worker(shared: SharedOHLCV, strategies: Sequence[str], config: BacktestConfig) -> None:
+    frame, block = shared.attach()
+    _WORKER.update(
+        data=frame,
+        block=block,
+        strategies=list(strategies),
+        config=config,
+        # Indicators depend on the data only, so every trial in this worker reuses them.
+        cache=IndicatorCache(),
+    )
+
+
+def _run_trial(params: ParameterSet) -> Dict[str, float]:
+    config: BacktestConfig = _WORKER["config"]  # type: ignore[assignment]
+    runner = BacktestRunner(
+        cash=config.initial_cash,
+        commission=config.commission,
+        risk_per_trade=config.risk_per_trade,
+        strategies=build_strategies(_WORKER["strategies"], params),  # type: ignore[arg-type]
+        engine=config.engine,
+        cache=_WORKER["cache"],  # type: ignore[arg-type]
+    )
+    metrics = runner.run(_WORKER["data"])  # type: ignore[arg-type]
+    return {**params, **metrics}
+
+
+@dataclass
+class ParameterSweep:
+    samples: List[ParameterSet]
+    strategies: List[str] = field(default_factory=lambda: list(STRATEGY_TYPES))
+    config: BacktestConfig = field(default_factory=lambda: BacktestConfig(engine="vectorized"))
+    max_workers: Optional[int] = None
+    rank_by: str = "return_pct"
+
+    def iter_results(self, data: pd.DataFrame) -> Iterator[Dict[str, float]]:
+        """Yield one row of parameters and metrics per trial, in completion order."""
+
+        for name in self.strategies:
+            if name not in STRATEGY_TYPES:
+                raise ValueError(f"Unknown strategy: {name}")
+        shared, block = SharedOHLCV.create(data)
+        workers = self.max_workers or os.cpu_count() or 1
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(shared, self.strategies, self.config),
+            ) as pool:
+                # Keep a bounded window of submissions so huge samples do not all sit in the queue.
+                pending = set()
+                samples = iter(self.samples)
+                for params in itertools.islice(samples, workers * 2):
+                    pending.add(pool.submit(_run_trial, params))
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+                        following = next(samples, None)
+                        if following is not None:
+                            pending.add(pool.submit(_run_trial, following))
+        finally:
+            block.close()
+            block.unlink()
+
+    def run(
+        self,
+        data: pd.DataFrame,
+        on_result: Optional[Callable[[Dict[str, float], int, int], None]] = None,
+    ) -> pd.DataFrame:
+        """Run every trial and return the ranked table.
+
+        ``on_result(row, rank, completed)`` is called as each trial finishes with the row's current
+        1-based rank among the ``completed`` trials.
+        """
+
+        ranked: List[Dict[str, float]] = []
+        keys: List[float] = []
+        for row in self.iter_results(data):
+            key = -row[self.rank_by]
+            position = bisect.bisect_right(keys, key)
+            keys.insert(position, key)
+            ranked.insert(position, row)
+            if on_result is not None:
+                on_result(row, position + 1, len(ranked))
+        table = pd.DataFrame(ranked)
+        table.index = pd.RangeIndex(1, len(table) + 1, name="rank")
+        return table
+
+
+def _parse_grid(items: Sequence[str]) -> Dict[str, List[float]]:
+    grid: Dict[str, List[float]] = {}
+    for item in items:
+        key, _, values = item.partition("=")
+        grid[key] = [float(v) for v in values.split(",")]
+    return grid
+
+
+def _parse_bounds(items: Sequence[str]) -> Dict[str, Tuple[float, float]]:
+    bounds: Dict[str, Tuple[float, float]] = {}
+    for item in items:
+        key, _, values = item.partition("=")
+        low, high = (float(v) for v in values.split(":"))
+        bounds[key] = (low, high)
+    return bounds
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Parallel strategy parameter sweep.")
+    parser.add_argument("data", help="Parquet file with open/high/low/close/volume columns")
+    parser.add_argument("--grid", nargs="*", default=[], help="strategy.param=v1,v2,... (grid search)")
+    parser.add_argument("--bounds", nargs="*", default=[], help="strategy.param=low:high (random/sobol)")
+    parser.add_argument("--sampler", choices=["grid", "random", "sobol"], default="grid")
+    parser.add_argument("--samples", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--strategies", nargs="*", default=list(STRATEGY_TYPES))
+    parser.add_argument("--engine", choices=["backtrader", "vectorized"], default="vectorized")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.sampler == "grid":
+        samples = grid_samples(_parse_grid(args.grid))
+    elif args.sampler == "random":
+        samples = random_samples(_parse_bounds(args.bounds), args.samples, args.seed)
+    else:
+        samples = sobol_samples(_parse_bounds(args.bounds), args.samples, args.seed)
+
+    data = pd.read_parquet(args.data)
+    sweep = ParameterSweep(
+        samples=samples,
+        strategies=args.strategies,
+        config=replace(BacktestConfig(), engine=args.engine),
+        max_workers=args.workers,
+    )
+
+    def report(row: Dict[str, float], rank: int, completed: int) -> None:
+        print(f"[{completed}/{len(samples)}] rank {rank}: {row}", flush=True)
+
+    table = sweep.run(data, on_result=report)
+    print(table.head(args.top).to_string())
+
+
+if __name__ == "__main__":
+    main()
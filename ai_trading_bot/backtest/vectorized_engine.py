@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class SimulationResult:
+    equity: np.ndarray
+    fills: int
+    rejected: int
+
+
+def signal_directions(signals: Dict[str, pd.DataFrame], length: int) -> np.ndarray:
+    """Stack strategy signal frames into a ``(strategies, bars)`` array of +1 (buy), -1 (sell) or 0."""
+
+    directions = np.zeros((len(signals), length), dtype=np.int8)
+    for row, frame in enumerate(signals.values()):
+        column = frame["signal"].to_numpy()
+        directions[row, column == "buy"] = 1
+        directions[row, column == "sell"] = -1
+    return directions
+
+
+def simulate(
+    open_: np.ndarray,
+    close: np.ndarray,
+    directions: np.ndarray,
+    cash: float,
+    commission: float,
+    risk_per_trade: float,
+    warmup: int = 50,
+) -> SimulationResult:
+    """Replay precomputed signals with the broker semantics of the backtrader path.
+
+    A signal on bar ``i`` becomes a market order sized ``value * risk_per_trade / close[i]``
+    (value marked at ``close[i]``) that fills at ``open[i + 1]``. Commission is charged as a
+    percentage of the traded notional, shorts credit their proceeds to cash, and an order is
+    rejected when the cash left after pseudo-executing it at ``close[i]`` would be negative,
+    as backtrader's ``check_submitted`` does. Once the value is no longer positive no orders are
+    placed (``SignalStrategy`` stops likewise), since sizing off it would flip or zero them; an
+    open position is kept. Cash and position only change on fill bars, so the
+    loop visits bars carrying a signal and the equity curve is filled in vectorized afterwards.
+    """
+
+    length = len(close)
+    if length == 0:
+        return SimulationResult(equity=np.empty(0), fills=0, rejected=0)
+    active = np.flatnonzero(directions[:, : length - 1].any(axis=0))
+    active = active[active + 1 >= warmup]
+
+    starting_cash = cash
+    change_bars: List[int] = []
+    change_cash: List[float] = []
+    change_position: List[float] = []
+    position = 0.0
+    fills = 0
+    rejected = 0
+
+    for bar in active:
+        price = close[bar]
+        value = cash + position * price
+        if value <= 0.0:
+            continue
+        size = value * risk_per_trade / price
+        check_cash = cash
+        fill_price = open_[bar + 1]
+        for direction in directions[:, bar]:
+            if direction == 0:
+                continue
+            signed = size * direction
+            check_cash -= signed * price + abs(signed) * price * commission
+            if check_cash < 0.0:
+                check_cash += signed * price + abs(signed) * price * commission
+                rejected += 1
+                continue
+            cash -= signed * fill_price + abs(signed) * fill_price * commission
+            position += signed
+            fills += 1
+        change_bars.append(bar + 1)
+        change_cash.append(cash)
+        change_position.append(position)
+
+    # Fill bars are distinct and never bar 0, so the starting state can seed the forward fill.
+    cash_path = np.full(length, np.nan)
+    position_path = np.full(length, np.nan)
+    cash_path[0] = starting_cash
+    position_path[0] = 0.0
+    cash_path[change_bars] = change_cash
+    position_path[change_bars] = change_position
+    cash_path = pd.Series(cash_path).ffill().to_numpy()
+    position_path = pd.Series(position_path).ffill().to_numpy()
+    return SimulationResult(equity=cash_path + position_path * close, fills=fills, rejected=rejected)
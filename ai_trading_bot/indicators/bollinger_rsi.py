@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from typing import Optional
+
 import pandas as pd
 
-from .ema_rsi_volume import rsi
+from .cache import IndicatorCache
 
 
 def bollinger_bands(series: pd.Series, period: int = 20, std_dev: float = 2.0) -> pd.DataFrame:
@@ -10,12 +12,11 @@ def bollinger_bands(series: pd.Series, period: int = 20, std_dev: float = 2.0) -
     std = series.rolling(window=period).std(ddof=0)
     upper = mid + std_dev * std
     lower = mid - std_dev * std
-    return pd.DataFrame({"bb_mid": mid, "bb_upper": upper, "bb_lower": lower})
+    # ``concat`` also takes wide (bars x symbols) frames, giving (band, symbol) columns.
+    return pd.concat({"bb_mid": mid, "bb_upper": upper, "bb_lower": lower}, axis=1)
+
 
+def compute_reversion_indicators(df: pd.DataFrame, cache: Optional[IndicatorCache] = None) -> pd.DataFrame:
+    from .registry import REVERSION_COLUMNS, indicator_columns
 
-def compute_reversion_indicators(df: pd.DataFrame) -> pd.DataFrame:
-    data = df.copy()
-    bands = bollinger_bands(data["close"], 20, 2)
-    data = data.join(bands)
-    data["rsi_14"] = rsi(data["close"], 14)
-    return data
+    return df.assign(**indicator_columns(df, REVERSION_COLUMNS, cache))
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import itertools
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, Hashable, Iterator, List, Optional, Tuple, TypeVar, Union
+
+import pandas as pd
+
+if TYPE_CHECKING:
+    from .timeframes import TimeframeView
+
+Column = TypeVar("Column", pd.Series, pd.DataFrame)
+CacheKey = Tuple[Hashable, ...]
+
+
+def _nbytes(value: Union[pd.Series, pd.DataFrame]) -> int:
+    usage = value.memory_usage(index=False)
+    return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+
+
+@dataclass
+class IndicatorCache:
+    """Per-DataFrame indicator store shared by strategies and feature engineering.
+
+    Entries are keyed by the identity of the source frame (object id, length and last
+    timestamp) plus the indicator name and parameters. Entries of a frame are dropped as soon as
+    that frame is garbage collected; beyond that the least recently used entries are evicted once
+    ``max_bytes`` is exceeded.
+
+    The key does not look at the values: a frame mutated in place that keeps its length and last
+    timestamp (e.g. a revised close) still returns the old entries. Pass a new frame, or call
+    ``clear``, after changing bars in place.
+
+    The higher-timeframe bars of each series are kept per timeframe as well (see
+    ``timeframes.TimeframeView``); they outlive the frames, grow as bars are appended and share
+    the LRU order and ``max_bytes`` budget with the entries.
+    """
+
+    max_bytes: int = 256_000_000
+    hits: int = 0
+    misses: int = 0
+    _entries: "OrderedDict[CacheKey, Union[pd.Series, pd.DataFrame, TimeframeView]]" = field(
+        default_factory=OrderedDict, repr=False
+    )
+    _sizes: Dict[CacheKey, int] = field(default_factory=dict, repr=False)
+    _views: Dict[str, List[CacheKey]] = field(default_factory=dict, repr=False)
+    _serial: Iterator[int] = field(default_factory=itertools.count, repr=False)
+    _finalizers: Dict[int, weakref.finalize] = field(default_factory=dict, repr=False)
+    _nbytes: int = field(default=0, repr=False)
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, data: pd.DataFrame, name: str, params: Tuple[Hashable, ...], compute: Callable[[], Column]) -> Column:
+        key = self._key(data, name, params)
+        cached = self._entries.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return cached  # type: ignore[return-value]
+
+        self.misses += 1
+        value = compute()
+        size = _nbytes(value)
+        if size <= self.max_bytes:
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._nbytes += size
+            self._evict()
+        return value
+
+    def views(self, timeframe: str) -> List[Tuple[CacheKey, "TimeframeView"]]:
+        """Kept views of ``timeframe`` with their keys, most recently used first."""
+
+        return [(key, self._entries[key]) for key in reversed(self._views.get(timeframe, []))]  # type: ignore[misc]
+
+    def keep_view(self, view: "TimeframeView", key: Optional[CacheKey] = None) -> CacheKey:
+        """Store ``view`` as the most recently used entry, under ``key`` when it replaces or
+        extends a kept view; its current size counts towards ``max_bytes``."""
+
+        if key is None:
+            key = ("timeframe", view.timeframe, next(self._serial))
+        self._drop(key)
+        self._views.setdefault(view.timeframe, []).append(key)
+        self._entries[key] = view
+        self._sizes[key] = view.nbytes
+        self._nbytes += self._sizes[key]
+        self._evict()
+        return key
+
+    def clear(self) -> None:
+        for finalizer in self._finalizers.values():
+            finalizer.detach()
+        self._finalizers.clear()
+        self._views.clear()
+        self._entries.clear()
+        self._sizes.clear()
+        self._nbytes = 0
+
+    def _key(self, data: pd.DataFrame, name: str, params: Tuple[Hashable, ...]) -> CacheKey:
+        token = id(data)
+        if token not in self._finalizers:
+            self._finalizers[token] = weakref.finalize(data, self._forget, token)
+        last = data.index[-1] if len(data) else None
+        return (token, len(data), last, name, params)
+
+    def _forget(self, token: int) -> None:
+        self._finalizers.pop(token, None)
+        for key in [k for k in self._entries if k[0] == token]:
+            self._drop(key)
+
+    def _drop(self, key: CacheKey) -> None:
+        if self._entries.pop(key, None) is not None and key[0] == "timeframe":
+            self._views[key[1]].remove(key)  # type: ignore[index]
+        self._nbytes -= self._sizes.pop(key, 0)
+
+    def _evict(self) -> None:
+        while self._nbytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+
+
+def cached(
+    cache: Optional[IndicatorCache],
+    data: pd.DataFrame,
+    name: str,
+    params: Tuple[Hashable, ...],
+    compute: Callable[[], Column],
+) -> Column:
+    """Look ``name``/``params`` up in ``cache`` or compute directly when no cache is in use."""
+
+    if cache is None:
+        return compute()
+    return cache.get(data, name, params, compute)
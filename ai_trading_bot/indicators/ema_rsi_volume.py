@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+from typing import Optional
+
 import numpy as np
 import pandas as pd
 
+from .cache import IndicatorCache
+
 
 def ema(series: pd.Series, period: int) -> pd.Series:
     return series.ewm(span=period, adjust=False).mean()
 
 
 def rsi(series: pd.Series, period: int = 14) -> pd.Series:
-    delta = series.diff()
+    return rsi_from_delta(series.diff(), period)
+
+
+def rsi_from_delta(delta: pd.Series, period: int = 14) -> pd.Series:
     up = delta.clip(lower=0)
     down = -delta.clip(upper=0)
     avg_gain = up.rolling(window=period).mean()
@@ -20,15 +27,15 @@ def rsi(series: pd.Series, period: int = 14) -> pd.Series:
 
 
 def obv(close: pd.Series, volume: pd.Series) -> pd.Series:
-    direction = np.sign(close.diff()).fillna(0)
+    return obv_from_delta(close.diff(), volume)
+
+
+def obv_from_delta(delta: pd.Series, volume: pd.Series) -> pd.Series:
+    direction = np.sign(delta).fillna(0)
     return (direction * volume).cumsum()
 
 
-def compute_trend_indicators(df: pd.DataFrame) -> pd.DataFrame:
-    data = df.copy()
-    data["ema_20"] = ema(data["close"], 20)
-    data["ema_50"] = ema(data["close"], 50)
-    data["rsi_14"] = rsi(data["close"], 14)
-    data["obv"] = obv(data["close"], data["volume"])
-    data["volume_ma"] = data["volume"].rolling(window=20).mean()
-    return data
+def compute_trend_indicators(df: pd.DataFrame, cache: Optional[IndicatorCache] = None) -> pd.DataFrame:
+    from .registry import TREND_COLUMNS, indicator_columns
+
+    return df.assign(**indicator_columns(df, TREND_COLUMNS, cache))
@@ -1,14 +1,27 @@
 from __future__ import annotations
 
+from typing import Mapping, Optional, Union
+
+import numpy as np
 import pandas as pd
 
+from .cache import IndicatorCache
+
+# Bars, or their columns by name (the columns may be wide frames with one column per symbol).
+Bars = Union[pd.DataFrame, Mapping[str, pd.Series]]
+
 
-def delta_volume(df: pd.DataFrame) -> pd.Series:
-    signed_volume = (df["close"] - df["open"]).apply(lambda x: 1 if x > 0 else (-1 if x < 0 else 0))
+def delta_volume(df: Bars) -> pd.Series:
+    """Cumulative delta: aggressor buy minus sell volume when the bars carry it (tick bars),
+    otherwise the whole bar volume signed by the candle direction."""
+
+    if "buy_volume" in df and "sell_volume" in df:
+        return (df["buy_volume"] - df["sell_volume"]).cumsum()
+    signed_volume = np.sign(df["close"] - df["open"]).fillna(0)
     return (signed_volume * df["volume"]).cumsum()
 
 
-def fair_value_gap(df: pd.DataFrame, lookback: int = 5) -> pd.Series:
+def fair_value_gap(df: Bars, lookback: int = 5) -> pd.Series:
     previous_high = df["high"].shift(1)
     previous_low = df["low"].shift(1)
     gap = previous_low - df["high"]
@@ -16,9 +29,7 @@ def fair_value_gap(df: pd.DataFrame, lookback: int = 5) -> pd.Series:
     return imbalance.rolling(window=lookback).max()
 
 
-def compute_orderflow_indicators(df: pd.DataFrame) -> pd.DataFrame:
-    data = df.copy()
-    data["delta_volume"] = delta_volume(data)
-    data["fair_value_gap"] = fair_value_gap(data)
-    data["rolling_volume"] = data["volume"].rolling(window=10).mean()
-    return data
+def compute_orderflow_indicators(df: pd.DataFrame, cache: Optional[IndicatorCache] = None) -> pd.DataFrame:
+    from .registry import ORDERFLOW_COLUMNS, indicator_columns
+
+    return df.assign(**indicator_columns(df, ORDERFLOW_COLUMNS, cache))
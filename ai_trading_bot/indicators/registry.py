@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+from .bollinger_rsi import bollinger_bands
+from .cache import IndicatorCache, cached
+from .ema_rsi_volume import ema, obv_from_delta, rsi_from_delta
+from .orderflow_liquidity import delta_volume, fair_value_gap
+from .sessions import SESSIONS, Session, session_ids, session_range, session_vwap
+from .timeframes import BAR_COLUMNS, parse_column, timeframe_columns
+from .vwap_range import typical_price, vwap_from_price
+
+Inputs = Mapping[str, pd.Series]
+# Requested columns: registry names, or output name -> registry name where the caller renames.
+ColumnRequest = Union[Sequence[str], Mapping[str, str]]
+
+
+@dataclass(frozen=True)
+class Indicator:
+    """A node of the indicator graph.
+
+    ``inputs`` are bar columns or outputs of other nodes; ``optional`` bar columns are passed
+    only when the data has them. ``name``/``params`` key the ``IndicatorCache`` entry, so a node
+    shared by several requests is computed once per frame. ``warmup`` is the number of bars
+    before the node's own output is valid, or ``None`` when it depends on more than a fixed
+    number of bars (cumulative sums, calendar sessions). ``lookahead`` lists outputs whose value
+    at a bar also uses later bars (e.g. the completed session range).
+    """
+
+    name: str
+    outputs: Tuple[str, ...]
+    inputs: Tuple[str, ...]
+    compute: Callable[[Inputs], Union[pd.Series, pd.DataFrame]]
+    params: Tuple[Hashable, ...] = ()
+    warmup: Optional[int] = 0
+    optional: Tuple[str, ...] = ()
+    lookahead: Tuple[str, ...] = ()
+
+
+REGISTRY: Dict[str, Indicator] = {}
+# Alternative names for registered columns, e.g. the breakout range of the default session.
+ALIASES: Dict[str, str] = {}
+
+
+def register(indicator: Indicator) -> Indicator:
+    for output in indicator.outputs:
+        if output in REGISTRY:
+            raise ValueError(f"Indicator column {output!r} is already registered by {REGISTRY[output].name}")
+    for output in indicator.outputs:
+        REGISTRY[output] = indicator
+    plan.cache_clear()
+    return indicator
+
+
+def register_alias(name: str, column: str) -> None:
+    if name in REGISTRY:
+        raise ValueError(f"Indicator column {name!r} is already registered by {REGISTRY[name].name}")
+    ALIASES[name] = column
+    plan.cache_clear()
+
+
+def registered(name: str) -> bool:
+    """Whether ``name`` can be computed: a registered column, or ``<column>@<timeframe>`` of one
+    (or of a bar column)."""
+
+    parsed = parse_column(name)
+    if parsed is not None:
+        return parsed[0] in BAR_COLUMNS or registered(parsed[0])
+    return name in REGISTRY or name in ALIASES
+
+
+@dataclass(frozen=True)
+class IndicatorPlan:
+    """The nodes behind ``columns`` in dependency order; names outside the registry are bar columns."""
+
+    columns: Tuple[str, ...]
+    nodes: Tuple[Indicator, ...]
+    # ``<column>@<timeframe>`` columns, computed on higher-timeframe bars by ``timeframe_columns``.
+    timeframes: Tuple[str, ...] = ()
+
+    @property
+    def warmup(self) -> int:
+        """Bars before every requested column is valid, ignoring nodes with unbounded warmup and
+        higher-timeframe columns."""
+
+        warmups = self._warmups()
+        columns = [column for column in self.columns if column not in self.timeframes and registered(column)]
+        return max((warmups[ALIASES.get(column, column)] for column in columns), default=0)
+
+    @property
+    def lookahead(self) -> Tuple[str, ...]:
+        """Requested columns whose value at a bar uses later bars, directly or through an input."""
+
+        leaking = set()
+        for node in self.nodes:
+            tainted = any(name in leaking for name in node.inputs)
+            leaking.update(node.outputs if tainted else node.lookahead)
+        return tuple(column for column in self.columns if ALIASES.get(column, column) in leaking)
+
+    def _warmups(self) -> Dict[str, int]:
+        # Chained nodes add up: RSI on bar-to-bar changes needs one bar more than its window.
+        warmups: Dict[str, int] = {}
+        for node in self.nodes:
+            total = (node.warmup or 0) + max((warmups.get(name, 0) for name in node.inputs), default=0)
+            warmups.update({output: total for output in node.outputs})
+        return warmups
+
+    def compute(self, df: pd.DataFrame, cache: Optional[IndicatorCache] = None) -> Dict[str, pd.Series]:
+        """Requested columns of ``df``.
+
+        Nodes only use column-wise pandas operations, so ``df`` may also be a panel with
+        (bar column, symbol) columns: every value is then a wide (bars x symbols) frame.
+        Higher-timeframe columns need a plain bar frame.
+        """
+
+        values: Dict[str, pd.Series] = {}
+        for node in self.nodes:
+            inputs = {name: values[name] if name in values else df[name] for name in node.inputs}
+            inputs.update({name: df[name] for name in node.optional if name in df.columns})
+            result = cached(cache, df, node.name, node.params, lambda: node.compute(inputs))
+            if len(node.outputs) > 1:
+                values.update({output: result[output] for output in node.outputs})
+            else:
+                values[node.outputs[0]] = result
+        if self.timeframes:
+            values.update(timeframe_columns(df, self.timeframes, cache))
+        resolved = {column: ALIASES.get(column, column) for column in self.columns}
+        return {column: values[name] if name in values else df[name] for column, name in resolved.items()}
+
+
+@lru_cache(maxsize=256)
+def plan(columns: Tuple[str, ...]) -> IndicatorPlan:
+    """Resolve ``columns`` to the nodes they need, each once, inputs before their consumers."""
+
+    ordered: List[Indicator] = []
+    visiting: set = set()
+
+    def visit(column: str) -> None:
+        node = REGISTRY.get(ALIASES.get(column, column))
+        if node is None or node in ordered:
+            return
+        if node in visiting:
+            raise ValueError(f"Indicator dependency cycle at {node.name}")
+        visiting.add(node)
+        for name in node.inputs:
+            visit(name)
+        visiting.discard(node)
+        ordered.append(node)
+
+    timeframes = tuple(column for column in columns if parse_column(column) is not None)
+    for column in columns:
+        if column not in timeframes:
+            visit(column)
+    return IndicatorPlan(columns=tuple(columns), nodes=tuple(ordered), timeframes=timeframes)
+
+
+def _request(columns: ColumnRequest) -> Mapping[str, str]:
+    return columns if isinstance(columns, Mapping) else {column: column for column in columns}
+
+
+def indicator_columns(
+    df: pd.DataFrame, columns: ColumnRequest, cache: Optional[IndicatorCache] = None
+) -> Dict[str, pd.Series]:
+    """Compute just the requested columns of ``df`` (and what they depend on), keyed by output name."""
+
+    request = _request(columns)
+    computed = plan(tuple(dict.fromkeys(request.values()))).compute(df, cache)
+    return {output: computed[column] for output, column in request.items()}
+
+
+def lookahead_columns(columns: Iterable[str]) -> Tuple[str, ...]:
+    return plan(tuple(dict.fromkeys(columns))).lookahead
+
+
+def _prefixed(frame: pd.DataFrame, name: str) -> pd.DataFrame:
+    # Output names are the first column level; panels add a symbol level below them.
+    return frame.rename(columns=lambda column: f"{name}_{column}", level=0)
+
+
+def register_session(session: Session) -> None:
+    """Register ``<name>_high``/``_low``/``_vwap`` and ``<name>_running_*`` columns for ``session``."""
+
+    name = session.name
+    SESSIONS[name] = session
+    # ``high`` only lends its bar index; the ids depend on bar times alone.
+    register(
+        Indicator(
+            "session_ids",
+            (f"{name}_session",),
+            ("high",),
+            lambda c: pd.Series(session_ids(c["high"].index, session), index=c["high"].index),
+            (session,),
+            warmup=None,
+        )
+    )
+    register(
+        Indicator(
+            "session_range",
+            (f"{name}_high", f"{name}_low", f"{name}_running_high", f"{name}_running_low"),
+            (f"{name}_session", "high", "low"),
+            lambda c: _prefixed(session_range(c["high"], c["low"], c[f"{name}_session"].to_numpy()), name),
+            (session,),
+            warmup=None,
+            lookahead=(f"{name}_high", f"{name}_low"),
+        )
+    )
+    register(
+        Indicator(
+            "session_vwap",
+            (f"{name}_vwap", f"{name}_running_vwap"),
+            (f"{name}_session", "typical_price", "volume"),
+            lambda c: _prefixed(session_vwap(c["typical_price"], c["volume"], c[f"{name}_session"].to_numpy()), name),
+            (session,),
+            warmup=None,
+            lookahead=(f"{name}_vwap",),
+        )
+    )
+
+
+def _rolling_volume(window: int) -> Callable[[Inputs], pd.Series]:
+    return lambda columns: columns["volume"].rolling(window=window).mean()
+
+
+register(Indicator("price_change", ("price_change",), ("close",), lambda c: c["close"].diff(), warmup=1))
+register(Indicator("typical_price", ("typical_price",), ("high", "low", "close"), typical_price))
+# EMAs never forget their seed; three spans leave it well under 1% of the weight.
+register(Indicator("ema", ("ema_20",), ("close",), lambda c: ema(c["close"], 20), ("close", 20), warmup=60))
+register(Indicator("ema", ("ema_50",), ("close",), lambda c: ema(c["close"], 50), ("close", 50), warmup=150))
+register(
+    Indicator(
+        "rsi",
+        ("rsi_14",),
+        ("price_change",),
+        lambda c: rsi_from_delta(c["price_change"], 14),
+        ("close", 14),
+        warmup=14,
+    )
+)
+register(
+    Indicator(
+        "obv",
+        ("obv",),
+        ("price_change", "volume"),
+        lambda c: obv_from_delta(c["price_change"], c["volume"]),
+        warmup=None,
+    )
+)
+register(Indicator("volume_ma", ("volume_ma",), ("volume",), _rolling_volume(20), (20,), warmup=20))
+register(Indicator("volume_ma", ("volume_ma_30",), ("volume",), _rolling_volume(30), (30,), warmup=30))
+register(Indicator("volume_ma", ("rolling_volume",), ("volume",), _rolling_volume(10), (10,), warmup=10))
+register(
+    Indicator(
+        "vwap",
+        ("vwap",),
+        ("typical_price", "volume"),
+        lambda c: vwap_from_price(c["typical_price"], c["volume"]),
+        warmup=None,
+    )
+)
+for _session in list(SESSIONS.values()):
+    register_session(_session)
+# The breakout range columns of the feature matrix are the Asian session's.
+register_alias("range_high", "asia_high")
+register_alias("range_low", "asia_low")
+register(
+    Indicator(
+        "bollinger_bands",
+        ("bb_mid", "bb_upper", "bb_lower"),
+        ("close",),
+        lambda c: bollinger_bands(c["close"], 20, 2),
+        ("close", 20, 2.0),
+        warmup=20,
+    )
+)
+register(
+    Indicator(
+        "delta_volume",
+        ("delta_volume",),
+        ("open", "close", "volume"),
+        delta_volume,
+        warmup=None,
+        optional=("buy_volume", "sell_volume"),
+    )
+)
+register(
+    Indicator(
+        "fair_value_gap",
+        ("fair_value_gap",),
+        ("high", "low"),
+        fair_value_gap,
+        (5,),
+        warmup=6,
+    )
+)
+
+# The column groups behind the ``compute_*_indicators`` helpers.
+TREND_COLUMNS = {name: name for name in ("ema_20", "ema_50", "rsi_14", "obv", "volume_ma")}
+BREAKOUT_COLUMNS = {"vwap": "vwap", "range_high": "range_high", "range_low": "range_low", "volume_ma": "volume_ma_30"}
+# Range as known at each bar rather than the completed session; see ``session_range``.
+RUNNING_RANGE_COLUMNS = {"range_high": "asia_running_high", "range_low": "asia_running_low"}
+REVERSION_COLUMNS = {name: name for name in ("bb_mid", "bb_upper", "bb_lower", "rsi_14")}
+ORDERFLOW_COLUMNS = {name: name for name in ("delta_volume", "fair_value_gap", "rolling_volume")}
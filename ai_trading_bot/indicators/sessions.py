@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone, tzinfo
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from zoneinfo import ZoneInfo
+
+_DAY_NS = 86_400_000_000_000
+_MINUTE_NS = 60_000_000_000
+_QUARTER_NS = 15 * _MINUTE_NS
+# Session id of bars outside the session.
+NO_SESSION = np.iinfo(np.int64).min
+# A bar series, or a wide frame with one column per symbol.
+Levels = Union[pd.Series, pd.DataFrame]
+
+
+@dataclass(frozen=True)
+class Session:
+    """A daily trading window in local wall-clock time, both ends inclusive.
+
+    ``tz=None`` reads the clock of the bar index itself (UTC for the stored series); with a zone
+    name the window follows that zone's daylight saving shifts. A window whose end is before its
+    start runs past midnight and belongs to the day it starts on.
+    """
+
+    name: str
+    start: str
+    end: str
+    tz: Optional[str] = None
+
+    def bounds(self) -> Tuple[int, int]:
+        return _minutes(self.start) * _MINUTE_NS, _minutes(self.end) * _MINUTE_NS
+
+
+@lru_cache(maxsize=None)
+def _minutes(clock: str) -> int:
+    hours, minutes = clock.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+SESSIONS: Dict[str, Session] = {
+    session.name: session
+    for session in (
+        Session("asia", "00:00", "06:00"),
+        Session("london", "08:00", "16:30", "Europe/London"),
+        Session("new_york", "09:30", "16:00", "America/New_York"),
+    )
+}
+
+
+def _wall_clock(index: pd.DatetimeIndex, tz: Optional[str]) -> np.ndarray:
+    """Local wall-clock time of every bar as int64 nanoseconds."""
+
+    # Stay in the index's own unit until the end; ``as_unit`` on millions of bars is slow.
+    scale = pd.Timedelta(1, unit=index.unit).value
+    stamps = index.asi8
+    zone = tz if tz is not None else index.tz
+    if zone is None or len(index) == 0:
+        return stamps * scale
+    if index.tz is None:
+        index = index.tz_localize("UTC")
+        stamps = index.asi8
+    # UTC offsets only change on quarter hours, so convert one bar per quarter-hour run and repeat
+    # its offset; a full ``tz_convert`` costs several times more on minute bars.
+    quarter = stamps // (_QUARTER_NS // scale)
+    runs = np.flatnonzero(np.r_[True, quarter[1:] != quarter[:-1]])
+    sample = index[runs].tz_convert(zone).tz_localize(None).asi8
+    return (stamps + np.repeat(sample - stamps[runs], np.diff(np.r_[runs, len(stamps)]))) * scale
+
+
+def _assign(wall: np.ndarray, session: Session) -> np.ndarray:
+    start, end = session.bounds()
+    day, clock = np.divmod(wall, _DAY_NS)
+    if start <= end:
+        return np.where((clock >= start) & (clock <= end), day, NO_SESSION)
+    return np.where(clock >= start, day, np.where(clock <= end, day - 1, NO_SESSION))
+
+
+def session_ids(index: pd.DatetimeIndex, session: Session) -> np.ndarray:
+    """Per bar, the local day number the session started on, or ``NO_SESSION`` outside it."""
+
+    return _assign(_wall_clock(pd.DatetimeIndex(index), session.tz), session)
+
+
+@lru_cache(maxsize=4096)
+def _offset(zone: Union[str, tzinfo], quarter: int) -> int:
+    """UTC offset in nanoseconds of ``zone`` during the given UTC quarter hour."""
+
+    moment = datetime.fromtimestamp(quarter * 900, tz=timezone.utc)
+    offset = moment.astimezone(ZoneInfo(zone) if isinstance(zone, str) else zone).utcoffset()
+    return (offset.days * 86_400 + offset.seconds) * 1_000_000_000 if offset is not None else 0
+
+
+def session_id(stamp: pd.Timestamp, session: Session) -> Optional[int]:
+    """``session_ids`` for a single bar time, without building an index (for the live loop)."""
+
+    zone = session.tz if session.tz is not None else stamp.tzinfo
+    wall = stamp.value
+    if zone is not None:
+        # Naive stamps are UTC like the stored series; offsets only change on quarter hours.
+        wall += _offset(zone, wall // _QUARTER_NS)
+    day, clock = divmod(wall, _DAY_NS)
+    start, end = session.bounds()
+    if start <= end:
+        return day if start <= clock <= end else None
+    if clock >= start:
+        return day
+    return day - 1 if clock <= end else None
+
+
+def _segments(ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Positions of in-session bars, their session number and where each session begins.
+
+    Bars are time ordered, so every session is one contiguous run of positions.
+    """
+
+    positions = np.flatnonzero(ids != NO_SESSION)
+    inside = ids[positions]
+    begins = np.empty(len(inside), dtype=bool)
+    begins[:1] = True
+    begins[1:] = inside[1:] != inside[:-1]
+    return positions, np.cumsum(begins) - 1, np.flatnonzero(begins)
+
+
+@dataclass(frozen=True)
+class _Carry:
+    """Spreads per in-session-bar values over all bars, carrying the last one across the gaps."""
+
+    positions: np.ndarray
+    # For every bar, the index into ``positions`` of the latest in-session bar (0 before the first).
+    take: np.ndarray
+    # Bars before the first in-session bar have nothing to carry.
+    head: int
+
+    @classmethod
+    def build(cls, length: int, positions: np.ndarray) -> "_Carry":
+        marks = np.zeros(length, dtype=np.intp)
+        marks[positions] = np.arange(len(positions))
+        head = int(positions[0]) if len(positions) else length
+        return cls(positions, np.maximum.accumulate(marks) if length else marks, head)
+
+    def frame(self, columns: Dict[str, np.ndarray], like: Levels) -> pd.DataFrame:
+        """Outputs as columns for a ``Series`` input; for a wide (bars x symbols) input one column
+        per output and symbol, with the output as the first column level."""
+
+        index = like.index
+        width = like.shape[1] if like.ndim == 2 else 1
+        # Fill one (outputs, bars, symbols) block so the frame wraps it without another copy.
+        block = np.empty((len(columns), len(index), width))
+        for out, values in zip(block, columns.values()):
+            values = values.reshape(len(values), width)
+            if np.isnan(values).any():
+                # Missing values carry the previous one too, like ``ffill``.
+                out[:] = np.nan
+                out[self.positions] = values
+                last = np.maximum.accumulate(np.where(np.isnan(out), -1, np.arange(len(out))[:, None]), axis=0)
+                out[:] = np.take_along_axis(out, np.maximum(last, 0), axis=0)
+                out[last < 0] = np.nan
+                continue
+            if len(values):
+                np.take(values, self.take, axis=0, out=out)
+            out[: self.head] = np.nan
+        if like.ndim == 1:
+            return pd.DataFrame(block[:, :, 0].T, index=index, columns=list(columns), copy=False)
+        labels = pd.MultiIndex.from_product([list(columns), like.columns])
+        return pd.DataFrame(block.transpose(1, 0, 2).reshape(len(index), -1), index=index, columns=labels, copy=False)
+
+
+def _check_order(index: pd.Index) -> None:
+    if not index.is_monotonic_increasing:
+        raise ValueError("Session levels need bars in time order")
+
+
+def _session_values(levels: Levels, positions: np.ndarray) -> np.ndarray:
+    # In-session rows as (bars, symbols), a single column for a ``Series``.
+    width = levels.shape[1] if levels.ndim == 2 else 1
+    return levels.to_numpy(dtype=float)[positions].reshape(len(positions), width)
+
+
+def session_range(high: Levels, low: Levels, ids: np.ndarray) -> pd.DataFrame:
+    """Session high/low per bar: ``running_*`` as known at the bar, ``high``/``low`` for the
+    whole session (including its later bars). Outside a session both carry the last session.
+
+    ``high``/``low`` may also be wide (bars x symbols) frames; see ``_Carry.frame`` for the layout.
+    """
+
+    _check_order(high.index)
+    positions, segment, begins = _segments(ids)
+    carry = _Carry.build(len(high), positions)
+    highs = _session_values(high, positions)
+    lows = _session_values(low, positions)
+    # One grouped pass for both sides: the running low is the running maximum of ``-low``.
+    running = pd.DataFrame(np.hstack([highs, -lows])).groupby(segment).cummax().to_numpy()
+    width = highs.shape[1]
+    columns = {
+        "high": np.fmax.reduceat(highs, begins, axis=0)[segment] if len(begins) else highs,
+        "low": np.fmin.reduceat(lows, begins, axis=0)[segment] if len(begins) else lows,
+        "running_high": running[:, :width],
+        "running_low": -running[:, width:],
+    }
+    return carry.frame(columns, high)
+
+
+def session_vwap(price: Levels, volume: Levels, ids: np.ndarray) -> pd.DataFrame:
+    """Volume-weighted ``price`` per session, ``running_vwap`` as known at the bar and ``vwap`` over
+    the whole session, carried like ``session_range``."""
+
+    _check_order(price.index)
+    positions, segment, begins = _segments(ids)
+    weights = np.nan_to_num(_session_values(volume, positions))
+    weighted = np.nan_to_num(_session_values(price, positions)) * weights
+    width = weights.shape[1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if len(begins):
+            total = (np.add.reduceat(weighted, begins, axis=0) / np.add.reduceat(weights, begins, axis=0))[segment]
+        else:
+            total = weighted
+        sums = pd.DataFrame(np.hstack([weighted, weights])).groupby(segment).cumsum().to_numpy()
+        running = sums[:, :width] / sums[:, width:]
+    carry = _Carry.build(len(price), positions)
+    return carry.frame({"vwap": total, "running_vwap": running}, price)
+
+
+def session_levels(df: pd.DataFrame, sessions: Iterable[Session] = tuple(SESSIONS.values())) -> pd.DataFrame:
+    """``<name>_high``/``_low``/``_vwap`` and their ``<name>_running_*`` forms for each session."""
+
+    price = (df["high"] + df["low"] + df["close"]) / 3
+    frames = []
+    for session in sessions:
+        ids = session_ids(df.index, session)
+        ranges = session_range(df["high"], df["low"], ids)
+        frames.append(pd.concat([ranges, session_vwap(price, df["volume"], ids)], axis=1).add_prefix(f"{session.name}_"))
+    return pd.concat(frames, axis=1) if frames else pd.DataFrame(index=df.index)
@@ -0,0 +1,445 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+from dataclasses import dataclass, field, fields
+from typing import Deque, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .bollinger_rsi import bollinger_bands
+from .ema_rsi_volume import ema, obv, rsi
+from .orderflow_liquidity import delta_volume, fair_value_gap
+from .sessions import SESSIONS, session_id, session_levels
+from .vwap_range import running_session_range, vwap
+
+# Running sums are rebuilt from the window this often so add/subtract round-off cannot drift.
+_RESYNC_EVERY = 1024
+
+
+class StreamingIndicator:
+    """Constant-time per-bar counterpart of a batch indicator.
+
+    ``snapshot`` returns plain Python containers so state can be persisted (e.g. as JSON) and
+    handed to ``restore`` on a fresh instance with the same parameters.
+    """
+
+    def snapshot(self) -> Dict[str, object]:
+        state: Dict[str, object] = {}
+        for item in fields(self):
+            value = getattr(self, item.name)
+            if isinstance(value, StreamingIndicator):
+                state[item.name] = value.snapshot()
+            elif isinstance(value, deque):
+                state[item.name] = list(value)
+            else:
+                state[item.name] = value
+        return state
+
+    def restore(self, state: Mapping[str, object]) -> None:
+        for item in fields(self):
+            if item.name not in state:
+                continue
+            current = getattr(self, item.name)
+            value = state[item.name]
+            if isinstance(current, StreamingIndicator):
+                current.restore(value)  # type: ignore[arg-type]
+            elif isinstance(current, deque):
+                setattr(self, item.name, deque(value, maxlen=current.maxlen))  # type: ignore[arg-type]
+            else:
+                setattr(self, item.name, value)
+
+
+@dataclass
+class RollingWindow(StreamingIndicator):
+    """Ring buffer with O(1) rolling mean/std and amortised O(1) rolling max.
+
+    Mirrors ``Series.rolling(window)`` with the default ``min_periods``: statistics are NaN until
+    the window is full or while it contains a NaN.
+    """
+
+    window: int
+    values: Deque[float] = field(default_factory=deque)
+    maxima: Deque[List[float]] = field(default_factory=deque)
+    total: float = 0.0
+    # Mean and sum of squared deviations of the finite values (Welford), so the variance does not
+    # come from the difference of two huge sums at BTC-scale prices.
+    centre: float = 0.0
+    deviations: float = 0.0
+    nan_count: int = 0
+    position: int = 0
+
+    def __post_init__(self) -> None:
+        self.values = deque(self.values, maxlen=self.window)
+
+    def update(self, value: float) -> None:
+        value = float(value)
+        if len(self.values) == self.window:
+            self._evict(self.values[0])
+        self.values.append(value)
+        if math.isnan(value):
+            self.nan_count += 1
+        else:
+            self.total += value
+            count = len(self.values) - self.nan_count
+            delta = value - self.centre
+            self.centre += delta / count
+            self.deviations += delta * (value - self.centre)
+            while self.maxima and self.maxima[-1][1] <= value:
+                self.maxima.pop()
+            self.maxima.append([self.position, value])
+        self.position += 1
+        if self.position % _RESYNC_EVERY == 0:
+            self._resync()
+
+    def _evict(self, value: float) -> None:
+        if math.isnan(value):
+            self.nan_count -= 1
+        else:
+            self.total -= value
+            # Count of finite values left once ``value`` is gone.
+            count = len(self.values) - self.nan_count - 1
+            if count == 0:
+                self.centre = self.deviations = 0.0
+            else:
+                delta = value - self.centre
+                self.centre -= delta / count
+                self.deviations = max(self.deviations - delta * (value - self.centre), 0.0)
+        oldest = self.position - self.window
+        if self.maxima and self.maxima[0][0] <= oldest:
+            self.maxima.popleft()
+
+    def _resync(self) -> None:
+        finite = [v for v in self.values if not math.isnan(v)]
+        self.total = math.fsum(finite)
+        self.centre = self.total / len(finite) if finite else 0.0
+        self.deviations = math.fsum((v - self.centre) ** 2 for v in finite)
+
+    def restore(self, state: Mapping[str, object]) -> None:
+        super().restore(state)
+        if "deviations" not in state:
+            # Snapshots from before the centred sums; rebuild them from the window.
+            self._resync()
+
+    @property
+    def ready(self) -> bool:
+        return len(self.values) == self.window and self.nan_count == 0
+
+    def mean(self) -> float:
+        if not self.ready:
+            return float("nan")
+        return self.total / self.window
+
+    def std(self, ddof: int = 1) -> float:
+        if not self.ready or self.window - ddof <= 0:
+            return float("nan")
+        return math.sqrt(max(self.deviations, 0.0) / (self.window - ddof))
+
+    def max(self) -> float:
+        if not self.ready:
+            return float("nan")
+        return self.maxima[0][1]
+
+
+@dataclass
+class StreamingEMA(StreamingIndicator):
+    period: int
+    value: Optional[float] = None
+
+    def update(self, price: float) -> float:
+        alpha = 2.0 / (self.period + 1)
+        if self.value is None:
+            self.value = float(price)
+        else:
+            self.value = (1 - alpha) * self.value + alpha * float(price)
+        return self.value
+
+
+@dataclass
+class StreamingRSI(StreamingIndicator):
+    period: int = 14
+    previous: Optional[float] = None
+    gains: Optional[RollingWindow] = None
+    losses: Optional[RollingWindow] = None
+
+    def __post_init__(self) -> None:
+        self.gains = self.gains or RollingWindow(self.period)
+        self.losses = self.losses or RollingWindow(self.period)
+
+    def update(self, price: float) -> float:
+        assert self.gains is not None and self.losses is not None
+        price = float(price)
+        if self.previous is None:
+            change = float("nan")
+        else:
+            change = price - self.previous
+        self.previous = price
+        self.gains.update(max(change, 0.0) if not math.isnan(change) else change)
+        self.losses.update(max(-change, 0.0) if not math.isnan(change) else change)
+
+        avg_gain = self.gains.mean()
+        avg_loss = self.losses.mean()
+        if math.isnan(avg_gain) or math.isnan(avg_loss) or (avg_gain == 0 and avg_loss == 0):
+            return 50.0
+        if avg_loss == 0:
+            return 100.0
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+@dataclass
+class StreamingOBV(StreamingIndicator):
+    previous_close: Optional[float] = None
+    value: float = 0.0
+
+    def update(self, close: float, volume: float) -> float:
+        if self.previous_close is not None:
+            self.value += float(np.sign(close - self.previous_close)) * float(volume)
+        self.previous_close = float(close)
+        return self.value
+
+
+@dataclass
+class StreamingVWAP(StreamingIndicator):
+    cumulative_pv: float = 0.0
+    cumulative_volume: float = 0.0
+
+    def update(self, high: float, low: float, close: float, volume: float) -> float:
+        price = (high + low + close) / 3
+        self.cumulative_pv += price * volume
+        self.cumulative_volume += volume
+        if self.cumulative_volume == 0:
+            return float("nan")
+        return self.cumulative_pv / self.cumulative_volume
+
+
+@dataclass
+class StreamingDeltaVolume(StreamingIndicator):
+    value: float = 0.0
+
+    def update(
+        self,
+        open_: float,
+        close: float,
+        volume: float,
+        buy_volume: Optional[float] = None,
+        sell_volume: Optional[float] = None,
+    ) -> float:
+        if buy_volume is not None and sell_volume is not None:
+            self.value += float(buy_volume) - float(sell_volume)
+        else:
+            self.value += float(np.sign(close - open_)) * float(volume)
+        return self.value
+
+
+@dataclass
+class StreamingFairValueGap(StreamingIndicator):
+    lookback: int = 5
+    previous_low: Optional[float] = None
+    gaps: Optional[RollingWindow] = None
+
+    def __post_init__(self) -> None:
+        self.gaps = self.gaps or RollingWindow(self.lookback)
+
+    def update(self, high: float, low: float) -> float:
+        assert self.gaps is not None
+        gap = float("nan")
+        if self.previous_low is not None and self.previous_low - high > 0:
+            gap = self.previous_low - high
+        self.previous_low = float(low)
+        self.gaps.update(gap)
+        return self.gaps.max()
+
+
+@dataclass
+class StreamingBollinger(StreamingIndicator):
+    period: int = 20
+    std_dev: float = 2.0
+    window: Optional[RollingWindow] = None
+
+    def __post_init__(self) -> None:
+        self.window = self.window or RollingWindow(self.period)
+
+    def update(self, price: float) -> Dict[str, float]:
+        assert self.window is not None
+        self.window.update(price)
+        mid = self.window.mean()
+        std = self.window.std(ddof=0)
+        return {"bb_mid": mid, "bb_upper": mid + self.std_dev * std, "bb_lower": mid - self.std_dev * std}
+
+
+@dataclass
+class StreamingSession(StreamingIndicator):
+    """High/low/VWAP of one session as known at each bar, matching its ``<name>_running_*`` columns.
+
+    The last levels carry across bars outside the session, and over missing values, like the
+    batch columns do.
+    """
+
+    name: str = "asia"
+    day: Optional[int] = None
+    high: float = float("nan")
+    low: float = float("nan")
+    weighted: float = 0.0
+    volume: float = 0.0
+    levels: List[float] = field(default_factory=lambda: [float("nan")] * 3)
+
+    def update(self, stamp: pd.Timestamp, high: float, low: float, price: float, volume: float) -> Dict[str, float]:
+        day = session_id(stamp, SESSIONS[self.name])
+        if day is not None:
+            if day != self.day:
+                self.day, self.high, self.low, self.weighted, self.volume = day, float("nan"), float("nan"), 0.0, 0.0
+            # fmax/fmin skip NaN like the batch ``cummax``; NaN prices or volumes add nothing.
+            self.high = float(np.fmax(self.high, high))
+            self.low = float(np.fmin(self.low, low))
+            weight = 0.0 if math.isnan(volume) else float(volume)
+            self.weighted += (0.0 if math.isnan(price) else price) * weight
+            self.volume += weight
+            vwap = self.weighted / self.volume if self.volume else float("nan")
+            self.levels = [new if not math.isnan(new) else old for new, old in zip((self.high, self.low, vwap), self.levels)]
+        high_, low_, vwap_ = self.levels
+        return {
+            f"{self.name}_running_high": high_,
+            f"{self.name}_running_low": low_,
+            f"{self.name}_running_vwap": vwap_,
+        }
+
+
+@dataclass
+class StreamingSessions(StreamingIndicator):
+    """One ``StreamingSession`` per name, all of ``SESSIONS`` by default."""
+
+    names: Tuple[str, ...] = tuple(SESSIONS)
+    sessions: List[StreamingSession] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self.sessions = self.sessions or [StreamingSession(name) for name in self.names]
+
+    def snapshot(self) -> Dict[str, object]:
+        return {"names": list(self.names), "sessions": [session.snapshot() for session in self.sessions]}
+
+    def restore(self, state: Mapping[str, object]) -> None:
+        self.names = tuple(state.get("names", self.names))  # type: ignore[arg-type]
+        self.sessions = [StreamingSession(name) for name in self.names]
+        for session, saved in zip(self.sessions, state.get("sessions", ())):  # type: ignore[call-overload]
+            session.restore(saved)
+
+    def update(self, stamp: pd.Timestamp, high: float, low: float, close: float, volume: float) -> Dict[str, float]:
+        price = (high + low + close) / 3
+        values: Dict[str, float] = {}
+        for session in self.sessions:
+            values.update(session.update(stamp, high, low, price, volume))
+        return values
+
+
+@dataclass
+class StreamingIndicatorEngine(StreamingIndicator):
+    """Updates every streaming indicator from one OHLCV bar.
+
+    Output keys match the batch column names; the 30-bar breakout volume average is
+    ``volume_ma_30`` so it does not collide with the 20-bar trend ``volume_ma``. Session levels
+    need the bar time and are only produced when the bar carries a ``timestamp``.
+    """
+
+    ema_20: StreamingEMA = field(default_factory=lambda: StreamingEMA(20))
+    ema_50: StreamingEMA = field(default_factory=lambda: StreamingEMA(50))
+    rsi_14: StreamingRSI = field(default_factory=lambda: StreamingRSI(14))
+    obv: StreamingOBV = field(default_factory=StreamingOBV)
+    vwap: StreamingVWAP = field(default_factory=StreamingVWAP)
+    bollinger: StreamingBollinger = field(default_factory=StreamingBollinger)
+    delta_volume: StreamingDeltaVolume = field(default_factory=StreamingDeltaVolume)
+    fair_value_gap: StreamingFairValueGap = field(default_factory=StreamingFairValueGap)
+    volume_ma: RollingWindow = field(default_factory=lambda: RollingWindow(20))
+    volume_ma_30: RollingWindow = field(default_factory=lambda: RollingWindow(30))
+    rolling_volume: RollingWindow = field(default_factory=lambda: RollingWindow(10))
+    sessions: StreamingSessions = field(default_factory=StreamingSessions)
+
+    def update(self, bar: Mapping[str, float]) -> Dict[str, float]:
+        open_, high, low = bar["open"], bar["high"], bar["low"]
+        close, volume = bar["close"], bar["volume"]
+        self.volume_ma.update(volume)
+        self.volume_ma_30.update(volume)
+        self.rolling_volume.update(volume)
+        values = {
+            "ema_20": self.ema_20.update(close),
+            "ema_50": self.ema_50.update(close),
+            "rsi_14": self.rsi_14.update(close),
+            "obv": self.obv.update(close, volume),
+            "vwap": self.vwap.update(high, low, close, volume),
+            "delta_volume": self.delta_volume.update(
+                open_, close, volume, bar.get("buy_volume"), bar.get("sell_volume")
+            ),
+            "fair_value_gap": self.fair_value_gap.update(high, low),
+            "volume_ma": self.volume_ma.mean(),
+            "volume_ma_30": self.volume_ma_30.mean(),
+            "rolling_volume": self.rolling_volume.mean(),
+        }
+        values.update(self.bollinger.update(close))
+        if "timestamp" in bar:
+            values.update(self.sessions.update(bar["timestamp"], high, low, close, volume))  # type: ignore[arg-type]
+            # The breakout range of the default session, under its original keys.
+            values["range_high"], values["range_low"] = values["asia_running_high"], values["asia_running_low"]
+        return values
+
+
+def batch_reference(df: pd.DataFrame) -> pd.DataFrame:
+    """Batch indicator columns in the layout produced by ``StreamingIndicatorEngine``."""
+
+    bands = bollinger_bands(df["close"], 20, 2)
+    ranges = running_session_range(df)
+    levels = session_levels(df)
+    return pd.DataFrame(
+        {
+            "ema_20": ema(df["close"], 20),
+            "ema_50": ema(df["close"], 50),
+            "rsi_14": rsi(df["close"], 14),
+            "obv": obv(df["close"], df["volume"]),
+            "vwap": vwap(df),
+            "delta_volume": delta_volume(df),
+            "fair_value_gap": fair_value_gap(df),
+            "volume_ma": df["volume"].rolling(window=20).mean(),
+            "volume_ma_30": df["volume"].rolling(window=30).mean(),
+            "rolling_volume": df["volume"].rolling(window=10).mean(),
+            "bb_mid": bands["bb_mid"],
+            "bb_upper": bands["bb_upper"],
+            "bb_lower": bands["bb_lower"],
+            "range_high": ranges["range_high"],
+            "range_low": ranges["range_low"],
+            **{column: levels[column] for column in levels.columns if "_running_" in column},
+        },
+        index=df.index,
+    )
+
+
+def replay(df: pd.DataFrame, engine: Optional[StreamingIndicatorEngine] = None) -> pd.DataFrame:
+    """Feed ``df`` bar by bar through ``engine`` and collect the outputs."""
+
+    engine = engine or StreamingIndicatorEngine()
+    columns = [c for c in ("open", "high", "low", "close", "volume", "buy_volume", "sell_volume") if c in df.columns]
+    rows = [
+        engine.update({"timestamp": stamp, **dict(zip(columns, bar))})
+        for stamp, bar in zip(df.index, df[columns].itertuples(index=False))
+    ]
+    return pd.DataFrame(rows, index=df.index)
+
+
+def compare_with_batch(df: pd.DataFrame, rtol: float = 1e-9, atol: float = 1e-9) -> Dict[str, float]:
+    """Replay ``df`` through the streaming engine and check every column against the batch functions.
+
+    Returns the largest absolute deviation per column and raises ``AssertionError`` when a column
+    differs beyond tolerance or disagrees on which bars are NaN.
+    """
+
+    streamed = replay(df)
+    reference = batch_reference(df)
+    deviations: Dict[str, float] = {}
+    for column in reference.columns:
+        expected = reference[column].to_numpy(dtype=float)
+        actual = streamed[column].to_numpy(dtype=float)
+        if not np.array_equal(np.isnan(expected), np.isnan(actual)):
+            raise AssertionError(f"NaN pattern of {column} differs from the batch indicator")
+        if not np.allclose(actual, expected, rtol=rtol, atol=atol, equal_nan=True):
+            raise AssertionError(f"{column} diverges from the batch indicator")
+        finite = ~np.isnan(expected)
+        deviations[column] = float(np.max(np.abs(actual[finite] - expected[finite]), initial=0.0))
+    return deviations
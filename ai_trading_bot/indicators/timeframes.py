@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Dict, Hashable, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .cache import IndicatorCache, cached
+
+# Bar columns a higher timeframe is built from: first, max, min, last and summed volumes.
+_FIRST, _LAST = ("open",), ("close",)
+_MAX, _MIN = ("high",), ("low",)
+_SUM = ("volume", "buy_volume", "sell_volume")
+BAR_COLUMNS = (*_FIRST, *_MAX, *_MIN, *_LAST, *_SUM)
+
+
+def parse_column(name: str) -> Optional[Tuple[str, str]]:
+    """``"ema_20@4h"`` -> ``("ema_20", "4h")``; ``None`` for a base timeframe column."""
+
+    column, separator, timeframe = name.partition("@")
+    if not separator or not column or not timeframe or "@" in timeframe:
+        return None
+    return column, timeframe
+
+
+def timeframe_period(timeframe: str) -> int:
+    """Length of ``timeframe`` (``"15m"``, ``"4h"``, ``"1d"``, ...) in nanoseconds."""
+
+    try:
+        # pandas spells days and weeks in upper case.
+        period = pd.Timedelta(timeframe.replace("m", "min").replace("d", "D").replace("w", "W")).value
+    except ValueError:
+        raise ValueError(f"Unsupported timeframe: {timeframe}") from None
+    if period <= 0:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return period
+
+
+def _datetimes(index: pd.Index) -> pd.DatetimeIndex:
+    # Re-wrapping an index that already is a DatetimeIndex costs more than the lookups it serves.
+    return index if isinstance(index, pd.DatetimeIndex) else pd.DatetimeIndex(index)
+
+
+def _nanoseconds(index: pd.DatetimeIndex) -> np.ndarray:
+    # Epoch (UTC) nanoseconds without ``as_unit``, which copies the whole index.
+    return index.asi8 * pd.Timedelta(1, unit=index.unit).value
+
+
+def _timestamp(nanoseconds: int, index: pd.DatetimeIndex) -> pd.Timestamp:
+    stamp = pd.Timestamp(nanoseconds, unit="ns", tz="UTC")
+    return stamp.tz_convert(index.tz) if index.tz is not None else stamp.tz_localize(None)
+
+
+def _step(stamps: np.ndarray) -> int:
+    """Base bar length, taken as the smallest gap between bars."""
+
+    gaps = np.diff(stamps)
+    gaps = gaps[gaps > 0]
+    return int(gaps.min()) if len(gaps) else 0
+
+
+def resample_bars(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """Higher-timeframe OHLCV bars of ``df``, epoch aligned and labelled by bin start.
+
+    Bins without base bars are skipped. ``open``/``close`` are those of the first/last base bar,
+    ``high``/``low`` skip missing values and volumes are summed, ``buy_volume``/``sell_volume``
+    included when ``df`` has them.
+    """
+
+    period = timeframe_period(timeframe)
+    stamps = _nanoseconds(_datetimes(df.index))
+    bins = stamps // period
+    starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]]) if len(bins) else np.empty(0, dtype=np.intp)
+    ends = np.r_[starts[1:], len(bins)] - 1
+    columns: Dict[str, np.ndarray] = {}
+    for column in BAR_COLUMNS:
+        if column not in df.columns:
+            continue
+        values = df[column].to_numpy(dtype=float)
+        if not len(starts):
+            columns[column] = values
+        elif column in _FIRST:
+            columns[column] = values[starts]
+        elif column in _LAST:
+            columns[column] = values[ends]
+        elif column in _MAX:
+            columns[column] = np.fmax.reduceat(values, starts)
+        elif column in _MIN:
+            columns[column] = np.fmin.reduceat(values, starts)
+        else:
+            columns[column] = np.add.reduceat(np.nan_to_num(values), starts)
+    index = pd.DatetimeIndex(pd.to_datetime(bins[starts] * period, unit="ns", utc=True), name=df.index.name)
+    index = index.tz_convert(df.index.tz) if df.index.tz is not None else index.tz_localize(None)
+    return pd.DataFrame(columns, index=index.as_unit(df.index.unit))
+
+
+@dataclass
+class TimeframeView:
+    """Completed higher-timeframe bars of a growing base series.
+
+    A bin is complete once its last base bar (bin end minus one base bar) has been seen, or a bar
+    of a later bin has; ``available`` holds that moment per completed bar so base bars are only
+    ever aligned with bars whose base bars all closed at or before them. ``update`` with a frame
+    that continues the series re-aggregates only the still open bin and what follows it; other
+    frames rebuild the view. The view keeps the bars of everything it has seen since ``origin``;
+    ``trimmed`` cuts them back to the span of a frame, e.g. a sliding ``lookback_days`` window.
+    """
+
+    timeframe: str
+    bars: pd.DataFrame
+    available: np.ndarray
+    step: int
+    # Start of the first bin not yet complete, the first base bar seen, the latest base bar that
+    # follows its predecessor by ``step`` and the last base bar (time, bar column values).
+    pending: int
+    origin: int
+    shortest: int
+    last: Tuple[int, Tuple[float, ...]]
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, timeframe: str) -> "TimeframeView":
+        stamps = _nanoseconds(_datetimes(df.index))
+        empty = resample_bars(df.iloc[:0], timeframe)
+        origin = int(stamps[0]) if len(stamps) else 0
+        view = cls(timeframe, empty, np.empty(0, dtype=np.int64), _step(stamps), 0, origin, origin, (0, ()))
+        view._extend(df, stamps)
+        return view
+
+    @property
+    def nbytes(self) -> int:
+        # Float bar columns plus the datetime index, 8 bytes per value each.
+        return 8 * len(self.bars) * (len(self.bars.columns) + 1) + self.available.nbytes
+
+    def continues(self, df: pd.DataFrame) -> bool:
+        """Whether ``df`` holds the last base bar of this view and every bar since its origin,
+        i.e. whether ``update`` can extend the view instead of rebuilding it."""
+
+        if not len(df) or not self.last[1]:
+            return False
+        index = _datetimes(df.index)
+        stamp, row = self.last
+        at = index.searchsorted(_timestamp(stamp, index))
+        first = _nanoseconds(index[:1])[0]
+        return bool(
+            at < len(index)
+            and _nanoseconds(index[at : at + 1])[0] == stamp
+            and np.array_equal(_bar_row(df, at), row, equal_nan=True)
+            # Bins before ``origin`` were never aggregated, and the open bin is re-aggregated
+            # from ``df``, so ``df`` may start anywhere from ``origin`` up to that bin.
+            and self.origin <= first <= self.pending
+        )
+
+    def update(self, df: pd.DataFrame) -> "TimeframeView":
+        """This view brought up to ``df``, or a new one when ``df`` does not continue it."""
+
+        if not len(df):
+            return self
+        return self._advance(df) if self.continues(df) else TimeframeView.build(df, self.timeframe)
+
+    def _advance(self, df: pd.DataFrame) -> "TimeframeView":
+        index = _datetimes(df.index)
+        if index.searchsorted(_timestamp(self.last[0], index)) == len(index) - 1:
+            return self
+        start = index.searchsorted(_timestamp(self.pending, index))
+        tail = df.iloc[start:]
+        stamps = _nanoseconds(_datetimes(tail.index))
+        step = _step(stamps)
+        if step and (not self.step or step < self.step):
+            # A shorter bar than any before moves the completion time of every bin.
+            return TimeframeView.build(df, self.timeframe)
+        self._extend(tail, stamps)
+        return self
+
+    def _extend(self, df: pd.DataFrame, stamps: np.ndarray) -> None:
+        if not len(stamps):
+            return
+        period = timeframe_period(self.timeframe)
+        bars = resample_bars(df, self.timeframe)
+        starts = _nanoseconds(_datetimes(bars.index))
+        available = starts + period - self.step if self.step else starts + period
+        # Every bin but the last has a bar after it; the last needs its final bar seen.
+        complete = np.ones(len(bars), dtype=bool)
+        complete[-1] = available[-1] <= stamps[-1]
+        if complete.any():
+            self.bars = pd.concat([self.bars, bars[complete]]) if len(self.bars) else bars[complete]
+            self.available = np.r_[self.available, available[complete]]
+        self.pending = int(starts[-1] + (period if complete[-1] else 0))
+        self.last = (int(stamps[-1]), _bar_row(df, len(df) - 1))
+        shortest = np.flatnonzero(np.diff(stamps) == self.step) if self.step else ()
+        if len(shortest):
+            self.shortest = max(self.shortest, int(stamps[shortest[-1] + 1]))
+
+    def trimmed(self, df: pd.DataFrame) -> "TimeframeView":
+        """The view ``build(df)`` would give, for a ``df`` this view was just updated with.
+
+        Bins before the first bar of ``df`` are dropped and the bin it starts in is aggregated
+        from ``df`` alone, so results never depend on what the view saw earlier.
+        """
+
+        index = _datetimes(df.index)
+        if not len(index):
+            return TimeframeView.build(df, self.timeframe)
+        origin = int(_nanoseconds(index[:1])[0])
+        # Completion times depend on the shortest bar; only check ``df`` when that bar has left it.
+        if origin > self.shortest - self.step and _step(_nanoseconds(index)) != self.step:
+            return TimeframeView.build(df, self.timeframe)
+        if origin == self.origin:
+            return self
+        period = timeframe_period(self.timeframe)
+        first = origin // period * period
+        skip = int(np.searchsorted(_nanoseconds(_datetimes(self.bars.index)), first))
+        bars = self.bars.iloc[skip:]
+        if len(bars) and _nanoseconds(_datetimes(bars.index[:1]))[0] == first:
+            # Re-aggregate the first bin from the rows of ``df`` it has (``resample_bars`` rules).
+            rows = df.iloc[: index.searchsorted(_timestamp(first + period, index))]
+            values = bars.to_numpy(dtype=float, copy=True)
+            for position, column in enumerate(bars.columns):
+                head = rows[column].to_numpy(dtype=float)
+                if column in _FIRST:
+                    values[0, position] = head[0]
+                elif column in _LAST:
+                    values[0, position] = head[-1]
+                elif column in _MAX:
+                    values[0, position] = np.fmax.reduce(head)
+                elif column in _MIN:
+                    values[0, position] = np.fmin.reduce(head)
+                else:
+                    values[0, position] = np.add.reduceat(np.nan_to_num(head), [0])[0]
+            bars = pd.DataFrame(values, index=bars.index, columns=bars.columns, copy=False)
+        return replace(self, bars=bars, available=self.available[skip:], origin=origin)
+
+    def runs(self, index: pd.DatetimeIndex) -> np.ndarray:
+        """How many consecutive base bars of ``index`` see nothing yet, then each completed bar."""
+
+        # Search the index in its own unit, with completion times rounded up to it.
+        scale = pd.Timedelta(1, unit=index.unit).value
+        starts = np.searchsorted(index.asi8, -(-self.available // scale), side="left")
+        return np.diff(np.r_[0, starts, len(index)])
+
+
+def _bar_row(df: pd.DataFrame, position: int) -> Tuple[float, ...]:
+    columns = df.columns
+    row = df.iloc[position].to_numpy()
+    return tuple(float(row[columns.get_loc(column)]) for column in BAR_COLUMNS if column in columns)
+
+
+def _view(df: pd.DataFrame, timeframe: str, cache: Optional[IndicatorCache]) -> TimeframeView:
+    if cache is None:
+        return TimeframeView.build(df, timeframe)
+    # One view per series: the frame picks the view whose last base bar it continues.
+    for key, view in cache.views(timeframe):
+        if view.continues(df):
+            view = view._advance(df)
+            cache.keep_view(view, key)
+            return view.trimmed(df)
+    view = TimeframeView.build(df, timeframe)
+    cache.keep_view(view)
+    return view
+
+
+def timeframe_columns(
+    df: pd.DataFrame, columns: Sequence[str], cache: Optional[IndicatorCache] = None
+) -> Dict[str, pd.Series]:
+    """``<column>@<timeframe>`` values on the bars of ``df`` without lookahead.
+
+    ``column`` is a bar column or a registered indicator computed on the higher-timeframe bars;
+    each base bar gets the value of the last higher-timeframe bar completed by then. With a
+    ``cache`` the higher-timeframe bars are kept per timeframe and series and extended as base
+    bars arrive; the values are the same as without it.
+    """
+
+    from .registry import indicator_columns, lookahead_columns
+
+    wanted: Dict[str, Dict[str, str]] = {}
+    for name in columns:
+        parsed = parse_column(name)
+        if parsed is None:
+            raise ValueError(f"Not a timeframe column: {name!r}")
+        wanted.setdefault(parsed[1], {})[name] = parsed[0]
+    values: Dict[str, pd.Series] = {}
+    for timeframe, request in wanted.items():
+        leaking = lookahead_columns(request.values())
+        if leaking:
+            raise ValueError(f"{', '.join(leaking)} use later bars and cannot be aligned from {timeframe} bars")
+        view = _view(df, timeframe, cache)
+        key: Tuple[Hashable, ...] = (timeframe, tuple(request))
+
+        def align(view: TimeframeView = view, request: Mapping[str, str] = request) -> pd.DataFrame:
+            higher = indicator_columns(view.bars, dict(request), cache)
+            # Completed bars as rows behind a NaN column for "none known yet", spread in one pass.
+            values = np.full((len(higher), len(view.bars) + 1), np.nan)
+            for row, series in zip(values, higher.values()):
+                row[1:] = series.to_numpy(dtype=float)
+            block = np.repeat(values, view.runs(_datetimes(df.index)), axis=1)
+            return pd.DataFrame(block.T, index=df.index, columns=list(higher), copy=False)
+
+        aligned = cached(cache, df, "timeframe", key, align)
+        values.update({name: aligned[name] for name in request})
+    return values
@@ -1,33 +1,51 @@
 from __future__ import annotations
 
+from typing import Optional
+
 import pandas as pd
 
+from .cache import IndicatorCache
+from .sessions import SESSIONS, Session, session_ids, session_range
+
+
+def typical_price(df: pd.DataFrame) -> pd.Series:
+    return (df["high"] + df["low"] + df["close"]) / 3
+
 
 def vwap(df: pd.DataFrame) -> pd.Series:
-    price = (df["high"] + df["low"] + df["close"]) / 3
-    cumulative_volume = df["volume"].cumsum()
-    cumulative_pv = (price * df["volume"]).cumsum()
+    return vwap_from_price(typical_price(df), df["volume"])
+
+
+def vwap_from_price(price: pd.Series, volume: pd.Series) -> pd.Series:
+    cumulative_volume = volume.cumsum()
+    cumulative_pv = (price * volume).cumsum()
     return cumulative_pv / cumulative_volume
 
 
-def asian_session_range(df: pd.DataFrame) -> pd.DataFrame:
-    session = df.between_time("00:00", "06:00")
-    if session.empty:
-        return pd.DataFrame(index=df.index, columns=["range_high", "range_low"]).fillna(method="ffill")
+def asian_session_range(df: pd.DataFrame, session: Session = SESSIONS["asia"]) -> pd.DataFrame:
+    """High/low of each whole session on its bars, carried forward until the next session."""
+
+    ranges = session_range(df["high"], df["low"], session_ids(df.index, session))
+    return pd.DataFrame({"range_high": ranges["high"], "range_low": ranges["low"]})
+
+
+def running_session_range(df: pd.DataFrame, session: Session = SESSIONS["asia"]) -> pd.DataFrame:
+    """Session range as it was known at each bar.
 
-    range_high = session["high"].resample("1D").max()
-    range_low = session["low"].resample("1D").min()
+    Inside the session the high/low only cover bars seen so far; afterwards the completed range
+    is carried forward. Each row equals the last row of ``asian_session_range`` on the prefix.
+    """
 
-    range_high = range_high.reindex(df.index, method="ffill")
-    range_low = range_low.reindex(df.index, method="ffill")
+    ranges = session_range(df["high"], df["low"], session_ids(df.index, session))
+    return pd.DataFrame({"range_high": ranges["running_high"], "range_low": ranges["running_low"]})
 
-    return pd.DataFrame({"range_high": range_high, "range_low": range_low})
 
+def compute_breakout_indicators(
+    df: pd.DataFrame,
+    cache: Optional[IndicatorCache] = None,
+    running_range: bool = False,
+) -> pd.DataFrame:
+    from .registry import BREAKOUT_COLUMNS, RUNNING_RANGE_COLUMNS, indicator_columns
 
-def compute_breakout_indicators(df: pd.DataFrame) -> pd.DataFrame:
-    data = df.copy()
-    data["vwap"] = vwap(data)
-    ranges = asian_session_range(data)
-    data = data.join(ranges)
-    data["volume_ma"] = data["volume"].rolling(window=30).mean()
-    return data
+    columns = {**BREAKOUT_COLUMNS, **RUNNING_RANGE_COLUMNS} if running_range else BREAKOUT_COLUMNS
+    return df.assign(**indicator_columns(df, columns, cache))
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+import pandas as pd
+
+from ..utils.data_loader import DataLoader
+from ..utils.market_store import TimeLike
+
+BAR_COLUMNS = ["open", "high", "low", "close", "volume"]
+# Aggressor volume from tick-built bars; passed through when present for the true delta.
+ORDERFLOW_COLUMNS = ["buy_volume", "sell_volume"]
+
+# A closed bar: its timestamp and the OHLCV values.
+Bar = Tuple[pd.Timestamp, Dict[str, float]]
+
+
+async def _iterate(frame: pd.DataFrame, speed: Optional[float]) -> AsyncIterator[Bar]:
+    previous: Optional[pd.Timestamp] = None
+    columns = BAR_COLUMNS + [c for c in ORDERFLOW_COLUMNS if c in frame.columns]
+    rows = frame[columns].itertuples(index=False, name=None)
+    for stamp, row in zip(frame.index, rows):
+        if speed and previous is not None:
+            await asyncio.sleep((stamp - previous).total_seconds() / speed)
+        else:
+            # Still yield to the event loop so other tasks run between bars.
+            await asyncio.sleep(0)
+        previous = stamp
+        yield stamp, dict(zip(columns, map(float, row)))
+
+
+class MarketDataFeed:
+    """Source of closed OHLCV bars for the live loop."""
+
+    def bars(self) -> AsyncIterator[Bar]:  # pragma: no cover - interface
+        raise NotImplementedError
+
+
+@dataclass
+class ReplayFeed(MarketDataFeed):
+    """Replays stored bars from the Parquet market store.
+
+    ``speed`` paces the replay by bar time (``60.0`` plays an hour of bars per minute); ``None``
+    replays as fast as the consumer keeps up.
+    """
+
+    loader: DataLoader
+    start: Optional[TimeLike] = None
+    end: Optional[TimeLike] = None
+    speed: Optional[float] = None
+
+    async def bars(self) -> AsyncIterator[Bar]:
+        frame = await asyncio.to_thread(self.loader.load_range, self.start, self.end)
+        async for bar in _iterate(frame, self.speed):
+            yield bar
+
+
+@dataclass
+class PollingFeed(MarketDataFeed):
+    """Polls the data source for newly closed bars via ``DataLoader.load_live_data``."""
+
+    loader: DataLoader
+    interval: float = 60.0
+
+    async def bars(self) -> AsyncIterator[Bar]:
+        while True:
+            frame = await asyncio.to_thread(self.loader.load_live_data)
+            async for bar in _iterate(frame, speed=None):
+                yield bar
+            await asyncio.sleep(self.interval)
+
+
+@dataclass
+class QueueFeed(MarketDataFeed):
+    """Bars pushed by another task, e.g. an exchange WebSocket client; ``close`` ends the feed."""
+
+    queue: "asyncio.Queue[Optional[Bar]]" = field(default_factory=asyncio.Queue)
+
+    async def put(self, stamp: pd.Timestamp, bar: Dict[str, float]) -> None:
+        await self.queue.put((stamp, bar))
+
+    async def close(self) -> None:
+        await self.queue.put(None)
+
+    async def bars(self) -> AsyncIterator[Bar]:
+        while (bar := await self.queue.get()) is not None:
+            yield bar
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional
+
+import pandas as pd
+
+from ..utils.logger import get_bar_logger
+
+bar_logger = get_bar_logger(__name__)
+
+
+@dataclass(frozen=True)
+class Order:
+    timestamp: pd.Timestamp
+    side: str
+    size: float
+    strategy: str
+    reason: str
+
+
+@dataclass(frozen=True)
+class Fill:
+    order: Order
+    timestamp: pd.Timestamp
+    price: float
+    commission: float
+
+
+@dataclass
+class PaperBroker:
+    """Simulated broker with the semantics of the backtest engines.
+
+    An order submitted on a bar's close fills at the next bar's open, commission is a percentage
+    of the traded notional, and an order is rejected when the cash left after pseudo-executing
+    it (and the bar's earlier orders) at the submit price would be negative.
+    """
+
+    cash: float = 10_000.0
+    commission: float = 0.00075
+    position: float = 0.0
+    last_price: float = float("nan")
+    pending: List[Order] = field(default_factory=list)
+    fills: List[Fill] = field(default_factory=list)
+    rejected: int = 0
+    _check_cash: float = field(default=0.0, repr=False)
+
+    def __post_init__(self) -> None:
+        self._check_cash = self.cash
+
+    def value(self, price: Optional[float] = None) -> float:
+        price = self.last_price if price is None else price
+        return self.cash + self.position * price if self.position else self.cash
+
+    def on_bar(self, stamp: pd.Timestamp, bar: Mapping[str, float]) -> List[Fill]:
+        """Fill pending orders at this bar's open and mark the account at its close."""
+
+        fills: List[Fill] = []
+        price = bar["open"]
+        for order in self.pending:
+            signed = order.size if order.side == "buy" else -order.size
+            fee = abs(signed) * price * self.commission
+            self.cash -= signed * price + fee
+            self.position += signed
+            fill = Fill(order=order, timestamp=stamp, price=price, commission=fee)
+            fills.append(fill)
+            bar_logger.info("Filled %s %s %.6f @ %.2f", order.strategy, order.side, order.size, price)
+        self.pending.clear()
+        self.fills.extend(fills)
+        self.last_price = bar["close"]
+        self._check_cash = self.cash
+        return fills
+
+    def submit(self, order: Order, price: float) -> bool:
+        signed = order.size if order.side == "buy" else -order.size
+        cost = signed * price + abs(signed) * price * self.commission
+        if self._check_cash - cost < 0.0:
+            self.rejected += 1
+            bar_logger.info("Rejected %s %s order: insufficient cash", order.strategy, order.side)
+            return False
+        self._check_cash -= cost
+        self.pending.append(order)
+        return True
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "cash": self.cash,
+            "position": self.position,
+            "equity": self.value(),
+            "fills": float(len(self.fills)),
+            "rejected": float(self.rejected),
+        }
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import time
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Deque, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..indicators.streaming import StreamingIndicatorEngine
+from ..strategies.base import Strategy, StrategyResult
+from ..utils.config import LiveConfig
+from ..utils.logger import get_bar_logger, get_logger
+from .feeds import MarketDataFeed
+from .paper_broker import Fill, Order, PaperBroker
+
+if TYPE_CHECKING:
+    from ..ml_engine.model_training import MLSignalModel
+
+logger = get_logger(__name__)
+bar_logger = get_bar_logger(__name__)
+
+
+@dataclass
+class BarEvent:
+    timestamp: pd.Timestamp
+    row: Dict[str, float]
+    signals: Dict[str, Optional[StrategyResult]]
+    prediction: Optional[Tuple[str, float]]
+    orders: List[Order]
+    fills: List[Fill]
+    latency: float
+
+
+# Slow work (sentiment, LLM) run in an executor after each bar. A returned mapping is merged into
+# the feature context of later bars, e.g. sentiment columns for the ML model.
+BackgroundTask = Callable[[BarEvent], Optional[Mapping[str, float]]]
+# Cheap callbacks run on the event loop after every bar, e.g. to hand it to the API snapshot.
+BarListener = Callable[[BarEvent], None]
+
+
+@dataclass
+class LatencyStats:
+    """Per-bar processing latency over a rolling window of recent bars."""
+
+    window: int = 1000
+    samples: Deque[float] = field(default_factory=deque)
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        self.samples = deque(self.samples, maxlen=self.window)
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.count += 1
+
+    def summary(self) -> Dict[str, float]:
+        if not self.samples:
+            return {"bars": float(self.count)}
+        values = np.fromiter(self.samples, dtype=float) * 1000.0
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        return {
+            "bars": float(self.count),
+            "last_ms": float(values[-1]),
+            "mean_ms": float(values.mean()),
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "max_ms": float(values.max()),
+        }
+
+
+@dataclass
+class LiveTradingLoop:
+    """Consumes bars from a feed and trades them on a paper broker.
+
+    Each bar updates the streaming indicators in constant time, evaluates every strategy's
+    per-bar rule, scores the ML model when a strategy fires and submits orders, which fill at
+    the next bar's open. The latency of that path is recorded per bar. Background tasks are
+    handed to an executor and never awaited by bar processing; a task still running from an
+    earlier bar is skipped rather than queued. Listeners see every bar and must not block.
+    """
+
+    feed: MarketDataFeed
+    strategies: Sequence[Strategy]
+    broker: PaperBroker = field(default_factory=PaperBroker)
+    model: Optional[MLSignalModel] = None
+    config: LiveConfig = field(default_factory=LiveConfig)
+    risk_per_trade: float = 0.01
+    background: Dict[str, BackgroundTask] = field(default_factory=dict)
+    listeners: List[BarListener] = field(default_factory=list)
+    executor: Optional[Executor] = None
+    engine: StreamingIndicatorEngine = field(default_factory=StreamingIndicatorEngine)
+    context: Dict[str, float] = field(default_factory=dict)
+    latency: LatencyStats = field(init=False)
+    bars: int = 0
+    _previous: Optional[Dict[str, float]] = field(default=None, repr=False)
+    _inflight: Dict[str, "asyncio.Future[Optional[Mapping[str, float]]]"] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        self.latency = LatencyStats(self.config.latency_window)
+        self._model_columns = self.model.feature_columns() if self.model is not None else []
+
+    async def run(self, max_bars: Optional[int] = None) -> Dict[str, object]:
+        owns_executor = self.executor is None and bool(self.background)
+        if owns_executor:
+            self.executor = ThreadPoolExecutor(max_workers=len(self.background), thread_name_prefix="live-bg")
+        try:
+            async for stamp, bar in self.feed.bars():
+                event = self.process_bar(stamp, bar)
+                self._schedule(event)
+                self._notify(event)
+                if max_bars is not None and self.bars >= max_bars:
+                    break
+            if self._inflight:
+                await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+        finally:
+            if owns_executor and self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = None
+        metrics = self.metrics()
+        logger.info("Live loop stopped after %d bars: %s", self.bars, metrics)
+        return metrics
+
+    def process_bar(self, stamp: pd.Timestamp, bar: Mapping[str, float]) -> BarEvent:
+        started = time.perf_counter()
+        fills = self.broker.on_bar(stamp, bar)
+        row = {**bar, **self.engine.update({"timestamp": stamp, **bar})}
+        self.bars += 1
+        signals: Dict[str, Optional[StrategyResult]] = {}
+        prediction: Optional[Tuple[str, float]] = None
+        orders: List[Order] = []
+        if self._previous is not None and self.bars >= self.config.warmup_bars:
+            signals = self._evaluate(row, self._previous)
+            if self.model is not None and any(signals.values()):
+                prediction = self._predict(row)
+            orders = self._submit(stamp, row, signals, prediction)
+        self._previous = row
+        latency = time.perf_counter() - started
+        self.latency.record(latency)
+        return BarEvent(stamp, row, signals, prediction, orders, fills, latency)
+
+    def _evaluate(self, row: Mapping[str, float], prev: Mapping[str, float]) -> Dict[str, Optional[StrategyResult]]:
+        signals: Dict[str, Optional[StrategyResult]] = {}
+        for strat in self.strategies:
+            try:
+                signals[strat.name] = strat.evaluate_streaming(row, prev)
+            except Exception as exc:  # pragma: no cover - runtime safety
+                logger.exception("Strategy %s failed on a live bar: %s", strat.name, exc)
+                signals[strat.name] = None
+        return signals
+
+    def _predict(self, row: Mapping[str, float]) -> Optional[Tuple[str, float]]:
+        assert self.model is not None
+        values = [row.get(column, self.context.get(column, math.nan)) for column in self._model_columns]
+        # Training drops incomplete rows, so do not score bars still in indicator warmup.
+        if any(math.isnan(value) for value in values):
+            return None
+        label, confidence = self.model.predict(pd.DataFrame([values], columns=self._model_columns))
+        return str(label), confidence
+
+    def _submit(
+        self,
+        stamp: pd.Timestamp,
+        row: Mapping[str, float],
+        signals: Mapping[str, Optional[StrategyResult]],
+        prediction: Optional[Tuple[str, float]],
+    ) -> List[Order]:
+        price = row["close"]
+        size = self.broker.value(price) * self.risk_per_trade / price
+        orders: List[Order] = []
+        for name, result in signals.items():
+            if result is None or result.signal not in ("buy", "sell"):
+                continue
+            if self.config.require_ml_confirmation and self.model is not None:
+                if prediction is None or prediction[0] != result.signal:
+                    bar_logger.info("Skipped %s %s signal without ML confirmation", name, result.signal)
+                    continue
+            order = Order(timestamp=stamp, side=result.signal, size=size, strategy=name, reason=result.reason)
+            if self.broker.submit(order, price):
+                orders.append(order)
+                bar_logger.info("Submitted %s %s order: %s", name, result.signal, result.reason)
+        return orders
+
+    def _schedule(self, event: BarEvent) -> None:
+        if not self.background:
+            return
+        loop = asyncio.get_running_loop()
+        for name, task in self.background.items():
+            if name in self._inflight:
+                bar_logger.info("Background task %s still running; skipping bar %s", name, event.timestamp)
+                continue
+            future = loop.run_in_executor(self.executor, task, event)
+            self._inflight[name] = future
+            future.add_done_callback(lambda done, name=name: self._collect(name, done))
+
+    def _notify(self, event: BarEvent) -> None:
+        for listener in self.listeners:
+            try:
+                listener(event)
+            except Exception as exc:  # pragma: no cover - runtime safety
+                logger.exception("Bar listener failed: %s", exc)
+
+    def _collect(self, name: str, future: "asyncio.Future[Optional[Mapping[str, float]]]") -> None:
+        self._inflight.pop(name, None)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error("Background task %s failed: %s", name, error)
+            return
+        values = future.result()
+        if values:
+            self.context.update(values)
+
+    def metrics(self) -> Dict[str, object]:
+        return {"latency": self.latency.summary(), "broker": self.broker.summary()}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from ..main import TradingBot
+    from ..utils.logger import configure_logging
+    from .feeds import PollingFeed, ReplayFeed
+
+    parser = argparse.ArgumentParser(description="Run the live trading loop against a paper broker.")
+    parser.add_argument("--replay", action="store_true", help="replay stored bars instead of polling")
+    parser.add_argument("--start", help="first replayed bar")
+    parser.add_argument("--end", help="last replayed bar")
+    parser.add_argument("--speed", type=float, help="replay speed multiplier (default: as fast as possible)")
+    parser.add_argument("--max-bars", type=int, help="stop after this many bars")
+    parser.add_argument("--no-model", action="store_true", help="trade strategy signals without the ML model")
+    args = parser.parse_args(argv)
+
+    bot = TradingBot()
+    configure_logging(bot.config.logging)
+    settings = bot.config.live
+    if args.replay:
+        feed: MarketDataFeed = ReplayFeed(
+            bot.data_loader,
+            start=args.start or settings.replay_start,
+            end=args.end or settings.replay_end,
+            speed=args.speed or settings.replay_speed,
+        )
+    else:
+        feed = PollingFeed(bot.data_loader, interval=settings.poll_seconds)
+    if not args.no_model:
+        bot.load_or_train_model(bot.load_data())
+    loop = bot.live_loop(feed, use_model=not args.no_model)
+    metrics = asyncio.run(loop.run(max_bars=args.max_bars))
+    print(metrics)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,33 @@
 from __future__ import annotations
 
 from dataclasses import asdict
-from typing import Dict, List, Optional
+from functools import cached_property
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
 
+from .utils.config import DEFAULT_CONFIG, TradingBotConfig
 from .utils.dependency_check import ensure_python_version, ensure_required_packages
+from .utils.logger import configure_logging, get_logger
 
 ensure_python_version((3, 10), (3, 13))
 
-from .utils.dependency_check import ensure_required_packages
-
-ensure_required_packages([
-    "pandas",
-    "numpy",
-    "sklearn",
-    "backtrader",
-])
-
-import pandas as pd
-
-from .backtest.backtest_runner import BacktestRunner
-from .ml_engine.feature_engineering import build_feature_matrix, create_labels, select_feature_columns
-from .ml_engine.model_training import MLSignalModel
-from .sentiment.finbert_analysis import FinBERTSentimentAnalyzer
-from .sentiment.vader_analysis import VaderSentimentAnalyzer
-from .strategies.base import Strategy, StrategyResult
-from .strategies.breakout import BreakoutStrategy
-from .strategies.orderflow import OrderflowStrategy
-from .strategies.reversion import MeanReversionStrategy
-from .strategies.trend_following import TrendFollowingStrategy
-from .utils.config import DEFAULT_CONFIG, TradingBotConfig
-from .utils.data_loader import DataLoader
-from .utils.logger import get_logger
+# Heavy subsystems (pandas, scikit-learn, backtrader, transformers) are imported on first use,
+# so importing this module for the config or the API stays cheap.
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .indicators.cache import IndicatorCache
+    from .live.feeds import MarketDataFeed
+    from .live.trading_loop import BackgroundTask, BarEvent, LiveTradingLoop
+    from .ml_engine.feature_store import FeatureStore
+    from .ml_engine.model_training import MLSignalModel
+    from .sentiment.features import SentimentFeaturePipeline
+    from .sentiment.finbert_analysis import FinBERTSentimentAnalyzer
+    from .sentiment.vader_analysis import VaderSentimentAnalyzer
+    from .strategies.base import Strategy, StrategyResult
+    from .utils.data_loader import DataLoader
+
+REQUIRED_PACKAGES = ["pandas", "numpy", "sklearn", "backtrader"]
 
 logger = get_logger(__name__)
 
@@ -38,34 +35,165 @@ logger = get_logger(__name__)
 class TradingBot:
     def __init__(self, config: TradingBotConfig = DEFAULT_CONFIG):
         self.config = config
-        self.data_loader = DataLoader(config.data)
-        self.strategies: List[Strategy] = [
+        self.sentiment_finbert: Optional[FinBERTSentimentAnalyzer] = None
+        self.sentiment_vader: Optional[VaderSentimentAnalyzer] = None
+
+    @cached_property
+    def data_loader(self) -> DataLoader:
+        from .utils.data_loader import DataLoader
+
+        return DataLoader(self.config.data)
+
+    @cached_property
+    def strategies(self) -> List[Strategy]:
+        from .strategies.breakout import BreakoutStrategy
+        from .strategies.orderflow import OrderflowStrategy
+        from .strategies.reversion import MeanReversionStrategy
+        from .strategies.trend_following import TrendFollowingStrategy
+
+        return [
             TrendFollowingStrategy(),
             BreakoutStrategy(),
             MeanReversionStrategy(),
             OrderflowStrategy(),
         ]
-        self.ml_model = MLSignalModel(params=config.model.params)
-        self.sentiment_finbert: Optional[FinBERTSentimentAnalyzer] = None
-        self.sentiment_vader: Optional[VaderSentimentAnalyzer] = None
+
+    @cached_property
+    def ml_model(self) -> MLSignalModel:
+        from .ml_engine.model_training import MLSignalModel
+
+        return MLSignalModel(params=self.config.model.params)
+
+    @cached_property
+    def indicator_cache(self) -> IndicatorCache:
+        from .indicators.cache import IndicatorCache
+
+        return IndicatorCache(max_bytes=self.config.indicator_cache_bytes)
+
+    @cached_property
+    def feature_store(self) -> FeatureStore:
+        from .ml_engine.feature_store import FeatureStore
+
+        return FeatureStore(self.config.data.cache_dir / "features")
 
     def load_data(self) -> pd.DataFrame:
         return self.data_loader.load_historical_data()
 
+    @cached_property
+    def sentiment_pipeline(self) -> SentimentFeaturePipeline:
+        from .sentiment.features import SentimentFeaturePipeline
+
+        settings = self.config.sentiment
+        return SentimentFeaturePipeline(
+            cache_dir=self.config.data.cache_dir / "sentiment",
+            scorer=settings.feature_scorer,
+            window=settings.feature_window,
+            halflife=settings.feature_halflife,
+        )
+
+    def sentiment_features(self, data: pd.DataFrame) -> Optional[pd.DataFrame]:
+        settings = self.config.sentiment
+        if not settings.include_features:
+            return None
+        from .sentiment.features import load_headlines
+
+        return self.sentiment_pipeline.features(data.index, load_headlines(settings.headline_paths))
+
+    def sentiment_context(self, event: BarEvent) -> Optional[Dict[str, float]]:
+        """Sentiment columns at a live bar; a background task of ``live_loop``."""
+
+        import pandas as pd
+
+        features = self.sentiment_features(pd.DataFrame(index=pd.DatetimeIndex([event.timestamp])))
+        return None if features is None else {column: float(value) for column, value in features.iloc[-1].items()}
+
+    def feature_matrix(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Model features of ``data`` (``dropna=False``), from the feature store when enabled and
+        ``data`` is a stretch of the stored series, bar for bar.
+
+        Stored features are computed over the whole stored history, so cumulative columns (OBV,
+        delta volume, VWAP) carry the levels of that history rather than starting at ``data``.
+        Any other frame (another symbol, a subset with gaps, revised bars) is computed from scratch.
+        """
+
+        import numpy as np
+
+        from .ml_engine.feature_engineering import build_feature_matrix, feature_columns
+
+        if self.config.model.feature_store and not data.empty:
+            try:
+                stored = self.feature_store.load(self.data_loader, cache=self.indicator_cache)
+            except FileNotFoundError as exc:
+                logger.info("Computing features without the feature store: %s", exc)
+            else:
+                window = stored.loc[data.index[0] : data.index[-1]]
+                bar_columns = [column for column in data.columns if column in window.columns]
+                if (
+                    bar_columns
+                    and window.index.equals(data.index)
+                    and np.array_equal(
+                        window[bar_columns].to_numpy(dtype=float),
+                        data[bar_columns].to_numpy(dtype=float),
+                        equal_nan=True,
+                    )
+                ):
+                    return window[feature_columns()]
+                logger.info("Computing features without the feature store: data is not the stored series")
+        return build_feature_matrix(data, cache=self.indicator_cache, dropna=False, columns=feature_columns())
+
     def train_model(self, data: pd.DataFrame) -> None:
-        features = build_feature_matrix(data)
-        labels = create_labels(features)
-        X = select_feature_columns(features)
+        from .ml_engine.feature_engineering import SENTIMENT_COLUMNS, feature_columns, select_feature_columns
+        from .ml_engine.labeling import make_labels
+
+        features = self.feature_matrix(data)
+        sentiment = self.sentiment_features(data)
+        if sentiment is not None:
+            features = features.assign(**{column: sentiment[column] for column in SENTIMENT_COLUMNS})
+        features = features.dropna()
+        # Label on the full history so horizons are not cut short by rows dropped for features.
+        labels = make_labels(data, self.config.model).reindex(features.index)
+        features = features[labels.notna()]
+        X = select_feature_columns(features, feature_columns(self.config.sentiment.include_features))
         y = labels.loc[X.index]
         logger.info("Training ML model with %d samples", len(X))
         self.ml_model.fit(X, y)
 
+    def model_path(self) -> Path:
+        name = f"{self.config.model.model_name}_{self.config.data.symbol}_{self.config.data.interval}"
+        return self.config.model.model_dir / name
+
+    def load_or_train_model(self, data: pd.DataFrame) -> None:
+        """Reuse the persisted model when its feature schema matches, otherwise train and save one."""
+
+        from .ml_engine.feature_engineering import feature_columns
+        from .ml_engine.model_training import MLSignalModel
+
+        try:
+            self.ml_model = MLSignalModel.load(
+                self.model_path(), expected_columns=feature_columns(self.config.sentiment.include_features)
+            )
+            logger.info("Loaded ML model from %s", self.model_path())
+        except (FileNotFoundError, ValueError) as exc:
+            logger.info("Training a new ML model: %s", exc)
+            self.train_model(data)
+            self.ml_model.save(self.model_path())
+        if self.config.model.compiled_inference:
+            self.ml_model.compile()
+
     def sentiment_filter(self, text: str) -> Dict[str, float]:
         scores: Dict[str, float] = {}
         if self.config.sentiment.enable_finbert:
-            self.sentiment_finbert = self.sentiment_finbert or FinBERTSentimentAnalyzer()
+            from .sentiment.finbert_analysis import FinBERTSentimentAnalyzer
+
+            self.sentiment_finbert = self.sentiment_finbert or FinBERTSentimentAnalyzer(
+                batch_size=self.config.sentiment.finbert_batch_size,
+                quantize=self.config.sentiment.finbert_quantize,
+                cache_size=self.config.sentiment.cache_size,
+            )
             scores.update(self.sentiment_finbert.analyze(text))
         if self.config.sentiment.enable_vader:
+            from .sentiment.vader_analysis import VaderSentimentAnalyzer
+
             self.sentiment_vader = self.sentiment_vader or VaderSentimentAnalyzer()
             scores.update(self.sentiment_vader.analyze(text))
         return scores
@@ -74,30 +202,94 @@ class TradingBot:
         results: Dict[str, Optional[StrategyResult]] = {}
         for strat in self.strategies:
             try:
-                result = strat.generate_signal(data)
+                result = strat.generate_signal(data, cache=self.indicator_cache)
             except Exception as exc:  # pragma: no cover - runtime safety
                 logger.exception("Strategy %s failed during evaluation: %s", strat.name, exc)
                 result = None
             results[strat.name] = result
         return results
 
+    def scan(self, symbols: Optional[List[str]] = None) -> pd.DataFrame:
+        """Ranked current signals of the strategies across ``symbols`` (``config.scanner.symbols``
+        by default), loaded with this bot's data settings."""
+
+        from .strategies.scanner import scan
+
+        settings = self.config.scanner
+        return scan(
+            symbols or settings.symbols or [self.config.data.symbol],
+            self.config.data,
+            strategies=self.strategies,
+            workers=settings.workers,
+            chunk_size=settings.chunk_size,
+        )
+
     def backtest(self, data: pd.DataFrame) -> Dict[str, float]:
+        from .backtest.backtest_runner import BacktestRunner
+
         runner = BacktestRunner(
             cash=self.config.backtest.initial_cash,
             commission=self.config.backtest.commission,
             risk_per_trade=self.config.backtest.risk_per_trade,
             strategies=self.strategies,
+            engine=self.config.backtest.engine,
         )
         return runner.run(data)
 
+    def live_loop(self, feed: MarketDataFeed, use_model: bool = True, llm: Optional[object] = None) -> LiveTradingLoop:
+        """Live loop on a paper broker. Sentiment features (when enabled) and trade explanations
+        from ``llm`` (when ``enable_llm`` is set) run as background tasks off the bar path."""
+
+        from .live.paper_broker import PaperBroker
+        from .live.trading_loop import LiveTradingLoop
+
+        background: Dict[str, BackgroundTask] = {}
+        if self.config.sentiment.include_features:
+            background["sentiment"] = self.sentiment_context
+        if self.config.enable_llm:
+            if llm is None:
+                logger.warning("enable_llm is set but no LLM was given; live trades are not explained")
+            else:
+                background["llm"] = self._trade_explainer(llm)
+        return LiveTradingLoop(
+            feed=feed,
+            strategies=self.strategies,
+            broker=PaperBroker(cash=self.config.backtest.initial_cash, commission=self.config.backtest.commission),
+            model=self.ml_model if use_model and self.ml_model.model is not None else None,
+            config=self.config.live,
+            risk_per_trade=self.config.backtest.risk_per_trade,
+            background=background,
+        )
+
+    def _trade_explainer(self, llm: object) -> BackgroundTask:
+        from .llm_module.explain_trades import TradeExplainer
+
+        explainer = TradeExplainer(llm=llm)
+
+        def explain(event: BarEvent) -> None:
+            for order in event.orders:
+                text = explainer.explain(
+                    {
+                        "strategy": order.strategy,
+                        "signal": order.side,
+                        "reason": order.reason,
+                        "metrics": f"close={event.row['close']:.2f}, prediction={event.prediction}",
+                    }
+                )
+                logger.info("Trade explanation for %s %s at %s: %s", order.strategy, order.side, event.timestamp, text)
+
+        return explain
+
     def to_dict(self) -> Dict[str, object]:
         return asdict(self.config)
 
 
 def main() -> None:
+    ensure_required_packages(REQUIRED_PACKAGES)
     bot = TradingBot()
+    configure_logging(bot.config.logging)
     data = bot.load_data()
-    bot.train_model(data)
+    bot.load_or_train_model(data)
     sentiment_scores = bot.sentiment_filter("Bitcoin surges as institutional demand grows.")
     logger.info("Sentiment scores: %s", sentiment_scores)
     strategy_results = bot.evaluate_strategies(data)
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.utils.fixes import parse_version
+
+_TREE_LEAF = -1
+# From 1.4 classifier trees store class fractions and predict_proba returns them as is.
+_VALUES_ARE_FRACTIONS = parse_version(sklearn.__version__) >= parse_version("1.4")
+
+
+@dataclass
+class CompiledForest:
+    """A fitted ``RandomForestClassifier`` flattened into NumPy node arrays.
+
+    Node arrays of all trees are concatenated with global child indices; leaves point at
+    themselves so every row/tree pair can be stepped ``max_depth`` times in lockstep.
+    Probabilities are bit-identical to ``predict_proba`` of a forest evaluated sequentially
+    (``n_jobs=None``): inputs are cast to float32 as sklearn does, leaf values are normalised
+    with the same operations, and per-tree results are accumulated in estimator order.
+    """
+
+    feature: np.ndarray
+    threshold: np.ndarray
+    left: np.ndarray
+    right: np.ndarray
+    missing_left: np.ndarray
+    leaf_proba: np.ndarray
+    roots: np.ndarray
+    max_depth: int
+    classes: np.ndarray
+    n_features: int
+
+    @classmethod
+    def from_sklearn(cls, forest: RandomForestClassifier) -> "CompiledForest":
+        if getattr(forest, "n_outputs_", 1) != 1:
+            raise ValueError("Only single-output forests can be compiled.")
+        features, thresholds, lefts, rights, missing, probas, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            count = tree.node_count
+            node_ids = np.arange(offset, offset + count)
+            is_leaf = tree.children_left == _TREE_LEAF
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.intp))
+            thresholds.append(tree.threshold.astype(np.float64))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+            rights.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+            if hasattr(tree, "missing_go_to_left"):
+                missing.append(tree.missing_go_to_left.astype(bool))
+            else:  # pragma: no cover - scikit-learn < 1.3
+                missing.append(np.zeros(count, dtype=bool))
+            # Same operations as DecisionTreeClassifier.predict_proba, applied once per node.
+            proba = tree.value[:, 0, : estimator.n_classes_].astype(np.float64)
+            if not _VALUES_ARE_FRACTIONS:
+                normalizer = proba.sum(axis=1)[:, np.newaxis]
+                normalizer[normalizer == 0.0] = 1.0
+                proba /= normalizer
+            probas.append(proba)
+            roots.append(offset)
+            offset += count
+            max_depth = max(max_depth, tree.max_depth)
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            missing_left=np.concatenate(missing),
+            leaf_proba=np.concatenate(probas),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=int(max_depth),
+            classes=np.asarray(forest.classes_),
+            n_features=int(forest.n_features_in_),
+        )
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """Leaf index (global) reached by every row in every tree, shape ``(rows, trees)``."""
+
+        rows = np.arange(X.shape[0])[:, np.newaxis]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], len(self.roots)))
+        for _ in range(self.max_depth):
+            values = X[rows, self.feature[nodes]]
+            go_left = (values <= self.threshold[nodes]) | (np.isnan(values) & self.missing_left[nodes])
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, X) -> np.ndarray:
+        values = np.asarray(X, dtype=np.float32)
+        if values.ndim == 1:
+            values = values[np.newaxis, :]
+        if values.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {values.shape[1]}")
+        per_tree = self.leaf_proba[self.apply(values)]
+        # cumsum adds strictly left to right, matching sklearn's sequential accumulation.
+        total = np.cumsum(per_tree, axis=1)[:, -1, :]
+        return total / len(self.roots)
+
+
+def benchmark_latency(
+    forest: RandomForestClassifier,
+    X: pd.DataFrame,
+    batch_sizes: Sequence[int] = (1, 8, 64),
+    repeats: int = 200,
+    compiled: Optional[CompiledForest] = None,
+) -> pd.DataFrame:
+    """Per-row latency in microseconds of sklearn ``predict_proba`` vs the compiled forest."""
+
+    compiled = compiled or CompiledForest.from_sklearn(forest)
+    rows = []
+    for size in batch_sizes:
+        batch = X.iloc[:size]
+        values = batch.to_numpy()
+        timings: Dict[str, float] = {}
+        for label, fn in (("sklearn", lambda: forest.predict_proba(batch)), ("compiled", lambda: compiled.predict_proba(values))):
+            fn()
+            start = time.perf_counter()
+            for _ in range(repeats):
+                fn()
+            timings[label] = (time.perf_counter() - start) / repeats / size * 1e6
+        identical = np.array_equal(forest.predict_proba(batch), compiled.predict_proba(values))
+        rows.append(
+            {
+                "batch_size": size,
+                "sklearn_us_per_row": timings["sklearn"],
+                "compiled_us_per_row": timings["compiled"],
+                "speedup": timings["sklearn"] / timings["compiled"],
+                "bit_identical": identical,
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark compiled RandomForest inference against sklearn.")
+    parser.add_argument("--samples", type=int, default=5_000)
+    parser.add_argument("--features", type=int, default=13)
+    parser.add_argument("--n-estimators", type=int, default=200)
+    parser.add_argument("--max-depth", type=int, default=6)
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(42)
+    X = pd.DataFrame(rng.normal(size=(args.samples, args.features)))
+    y = np.where(X[0] > 0.5, "buy", np.where(X[0] < -0.5, "sell", "hold"))
+    forest = RandomForestClassifier(n_estimators=args.n_estimators, max_depth=args.max_depth, random_state=42)
+    forest.fit(X, y)
+    print(benchmark_latency(forest, X, repeats=args.repeats).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 
-from ..indicators.bollinger_rsi import compute_reversion_indicators
-from ..indicators.ema_rsi_volume import compute_trend_indicators
-from ..indicators.orderflow_liquidity import compute_orderflow_indicators
-from ..indicators.vwap_range import compute_breakout_indicators
+from ..indicators.cache import IndicatorCache
+from ..indicators.registry import indicator_columns, registered
 
 
+# Bump when an indicator behind the feature matrix changes; it keys the persisted feature store.
+FEATURE_VERSION = 2
+
 FEATURE_COLUMNS = [
     "close",
     "volume",
@@ -26,32 +28,72 @@ FEATURE_COLUMNS = [
     "fair_value_gap",
 ]
 
+# Indicator columns of the full matrix (``build_feature_matrix`` without ``columns``), after the bar columns.
+MATRIX_INDICATORS = [
+    "ema_20",
+    "ema_50",
+    "rsi_14",
+    "obv",
+    "volume_ma",
+    "vwap",
+    "range_high",
+    "range_low",
+    "bb_upper",
+    "bb_lower",
+    "delta_volume",
+    "fair_value_gap",
+]
+
+# Appended to FEATURE_COLUMNS when headline sentiment is enabled.
+SENTIMENT_COLUMNS = ["sentiment_mean", "sentiment_count", "sentiment_decay"]
+
+
+def feature_columns(include_sentiment: bool = False) -> List[str]:
+    return FEATURE_COLUMNS + SENTIMENT_COLUMNS if include_sentiment else list(FEATURE_COLUMNS)
 
-def build_feature_matrix(df: pd.DataFrame) -> pd.DataFrame:
-    trend = compute_trend_indicators(df)
-    breakout = compute_breakout_indicators(df)
-    reversion = compute_reversion_indicators(df)
-    orderflow = compute_orderflow_indicators(df)
 
-    combined = trend.join(
-        [
-            breakout[["vwap", "range_high", "range_low"]],
-            reversion[["bb_upper", "bb_lower"]],
-            orderflow[["delta_volume", "fair_value_gap"]],
-        ]
-    )
-    combined = combined.dropna().copy()
-    return combined
+def build_feature_matrix(
+    df: pd.DataFrame,
+    cache: Optional[IndicatorCache] = None,
+    sentiment: Optional[pd.DataFrame] = None,
+    dropna: bool = True,
+    columns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """Indicator features for every complete row (every row with ``dropna=False``);
+    ``sentiment`` columns (bar-aligned) are added when given.
+
+    Without ``columns`` the matrix holds the bar columns plus ``MATRIX_INDICATORS``; with it, only
+    those columns are returned and only the indicators they depend on are computed.
+    """
+
+    if columns is None:
+        combined = df.assign(**indicator_columns(df, MATRIX_INDICATORS, cache))
+    else:
+        wanted = [column for column in columns if column not in SENTIMENT_COLUMNS]
+        combined = pd.DataFrame(indicator_columns(df, wanted, cache), index=df.index)
+    if sentiment is not None:
+        combined = combined.assign(**{column: sentiment[column] for column in SENTIMENT_COLUMNS})
+    return combined.dropna() if dropna else combined
 
 
 def create_labels(df: pd.DataFrame, horizon: int = 3, threshold: float = 0.002) -> pd.Series:
-    future_return = df["close"].pct_change(periods=horizon).shift(-horizon)
-    labels = future_return.apply(
-        lambda r: "buy" if r > threshold else ("sell" if r < -threshold else "hold")
-    )
-    return labels
+    """Fixed-horizon labels; the last ``horizon`` rows, whose return is unknown, are ``hold``.
+
+    See ``labeling`` for multi-horizon and triple-barrier labels that leave those rows unlabelled.
+    """
+
+    future_return = df["close"].pct_change(periods=horizon).shift(-horizon).to_numpy()
+    labels = np.select([future_return > threshold, future_return < -threshold], ["buy", "sell"], "hold")
+    return pd.Series(labels.astype(object), index=df.index)
+
 
+def select_feature_columns(
+    data: pd.DataFrame, columns: List[str] = FEATURE_COLUMNS, cache: Optional[IndicatorCache] = None
+) -> pd.DataFrame:
+    """``columns`` of ``data``; registered indicators it lacks are computed from its bars."""
 
-def select_feature_columns(data: pd.DataFrame, columns: List[str] = FEATURE_COLUMNS) -> pd.DataFrame:
+    missing = [c for c in columns if c not in data.columns and registered(c)]
+    if missing:
+        data = data.assign(**indicator_columns(data, missing, cache))
     available = [c for c in columns if c in data.columns]
     return data[available]
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..indicators.cache import IndicatorCache
+from ..utils.columnar_cache import ColumnarCache
+from ..utils.data_loader import DataLoader
+from ..utils.logger import get_logger
+from ..utils.market_store import PartitionMeta, _to_utc
+from .feature_engineering import FEATURE_VERSION, build_feature_matrix
+
+logger = get_logger(__name__)
+
+_STATE_FILE = "_features.json"
+# Columns that carry state from the first bar on; the tail continues them from the last kept row.
+_CUMULATIVE = ("obv", "delta_volume")
+_EMA_SPANS = {"ema_20": 20, "ema_50": 50}
+# VWAP is kept as running sums next to the features so it can continue as well.
+_VWAP_SUMS = ("_vwap_pv", "_vwap_volume")
+
+
+def _partition_key(meta: PartitionMeta) -> List[object]:
+    return [meta.rows, meta.first.isoformat(), meta.last.isoformat(), meta.written_at.isoformat()]
+
+
+def _vwap_sums(raw: pd.DataFrame) -> pd.DataFrame:
+    price = (raw["high"] + raw["low"] + raw["close"]) / 3
+    return pd.DataFrame(
+        {_VWAP_SUMS[0]: (price * raw["volume"]).cumsum(), _VWAP_SUMS[1]: raw["volume"].cumsum()},
+        index=raw.index,
+    )
+
+
+@dataclass
+class FeatureStore:
+    """Memory-mapped feature matrices (``build_feature_matrix(..., dropna=False)``) of stored series.
+
+    Entries live under ``v<FEATURE_VERSION>/origin=<hash of the first bar>/symbol=.../interval=...``.
+    A fingerprint of the market store's partition metadata says whether the data changed, so an
+    unchanged series loads without touching the raw bars. When bars were appended, only the tail is
+    recomputed: from the start of the last stored day (the completed session range of that day can
+    still move) over a ``warmup`` window of earlier bars for the rolling indicators, with EMAs,
+    OBV, delta volume and VWAP continued from the last kept row. The recomputed window must
+    reproduce the stored row before the tail; if it does not, or history was rewritten, the whole
+    matrix is rebuilt.
+    """
+
+    root: Path
+    warmup: int = 300
+    tolerance: float = 1e-9
+    hits: int = 0
+    updates: int = 0
+    rebuilds: int = 0
+
+    def _columnar(self, origin: str) -> ColumnarCache:
+        return ColumnarCache(self.root / f"v{FEATURE_VERSION}" / f"origin={origin}")
+
+    def load(self, loader: DataLoader, cache: Optional[IndicatorCache] = None) -> pd.DataFrame:
+        """Feature matrix of the loader's whole stored series, brought up to date."""
+
+        symbol, interval = loader.config.symbol, loader.config.interval
+        partitions = loader.store.partitions(symbol, interval)
+        if not partitions:
+            raise FileNotFoundError(f"No stored data for {symbol} {interval}; load historical data first")
+        fingerprint = {meta.month: _partition_key(meta) for meta in partitions}
+        origin = hashlib.sha1(partitions[0].first.isoformat().encode()).hexdigest()[:12]
+        columnar = self._columnar(origin)
+        state = self._state(columnar, symbol, interval)
+
+        if state is not None and state["fingerprint"] == fingerprint:
+            self.hits += 1
+            return self._frame(columnar, symbol, interval, state)
+        if state is not None:
+            try:
+                frame = self._update(loader, columnar, state, fingerprint, cache)
+            except ValueError as exc:
+                logger.info("Rebuilding features for %s %s: %s", symbol, interval, exc)
+            else:
+                self.updates += 1
+                return frame
+        self.rebuilds += 1
+        return self._rebuild(loader, columnar, fingerprint, cache)
+
+    def _state(self, columnar: ColumnarCache, symbol: str, interval: str) -> Optional[Dict[str, object]]:
+        path = columnar._series_dir(symbol, interval) / _STATE_FILE
+        if not path.exists() or columnar.metadata(symbol, interval) is None:
+            return None
+        return json.loads(path.read_text())
+
+    def _save_state(self, columnar: ColumnarCache, symbol: str, interval: str, state: Dict[str, object]) -> None:
+        (columnar._series_dir(symbol, interval) / _STATE_FILE).write_text(json.dumps(state))
+
+    def _frame(self, columnar: ColumnarCache, symbol: str, interval: str, state: Dict[str, object]) -> pd.DataFrame:
+        return columnar.frame(symbol, interval, columns=state["columns"])  # type: ignore[arg-type]
+
+    def _rebuild(
+        self,
+        loader: DataLoader,
+        columnar: ColumnarCache,
+        fingerprint: Dict[str, List[object]],
+        cache: Optional[IndicatorCache],
+    ) -> pd.DataFrame:
+        symbol, interval = loader.config.symbol, loader.config.interval
+        raw = loader.store.read(symbol, interval)
+        features = build_feature_matrix(raw, cache=cache, dropna=False)
+        logger.info("Computed %d feature rows for %s %s", len(features), symbol, interval)
+        columnar.write(symbol, interval, pd.concat([features, _vwap_sums(raw)], axis=1))
+        state = {"columns": list(features.columns), "fingerprint": fingerprint}
+        self._save_state(columnar, symbol, interval, state)
+        return self._frame(columnar, symbol, interval, state)
+
+    def _update(
+        self,
+        loader: DataLoader,
+        columnar: ColumnarCache,
+        state: Dict[str, object],
+        fingerprint: Dict[str, List[object]],
+        cache: Optional[IndicatorCache],
+    ) -> pd.DataFrame:
+        symbol, interval = loader.config.symbol, loader.config.interval
+        stored = columnar.frame(symbol, interval)
+        index = stored.index
+        # Rows of the last stored day may be revised; everything before it is kept.
+        revise_from = int(index.searchsorted(index[-1].normalize()))
+        previous_day = int(index.searchsorted(index[-1].normalize() - pd.Timedelta(days=1)))
+        window_start = min(max(revise_from - self.warmup, 0), previous_day)
+        if revise_from == 0 or window_start >= revise_from:
+            raise ValueError("not enough stored history before the last day")
+        # Partitions are monthly, so whole months before the window are checked by their metadata
+        # and the bars from the start of the window's month against the stored raw columns.
+        month = _to_utc(index[window_start]).strftime("%Y-%m")
+        previous = state["fingerprint"]
+        if any(previous.get(key) != value for key, value in fingerprint.items() if key < month):  # type: ignore[union-attr]
+            raise ValueError("stored history changed before the update window")
+        month_start = pd.Timestamp(f"{month}-01", tz="UTC")
+        # Naive series are stored as UTC, like ``MarketDataStore.write`` does.
+        check_from = int(index.searchsorted(month_start.tz_convert(index.tz) if index.tz is not None else month_start.tz_localize(None)))
+        # Bars of the last stored day are recomputed anyway, so only the kept ones must match.
+        raw = loader.store.read(symbol, interval, start=index[check_from])
+        kept = revise_from - check_from
+        raw_columns = [column for column in raw.columns if column in stored.columns]
+        if len(raw) < kept or not raw.index[:kept].equals(index[check_from:revise_from]):
+            raise ValueError("stored bars were rewritten")
+        if not np.array_equal(
+            raw[raw_columns].iloc[:kept].to_numpy(dtype=float),
+            stored[raw_columns].iloc[check_from:revise_from].to_numpy(dtype=float),
+            equal_nan=True,
+        ):
+            raise ValueError("stored bars were rewritten")
+        raw = raw.iloc[window_start - check_from :]
+
+        window = build_feature_matrix(raw, cache=cache, dropna=False)
+        window = pd.concat([window, _vwap_sums(raw)], axis=1)
+        anchor = revise_from - 1 - window_start
+        local = [column for column in state["columns"] if column not in _CUMULATIVE and column not in _EMA_SPANS and column != "vwap"]  # type: ignore[union-attr]
+        if not np.allclose(
+            window[local].iloc[anchor].to_numpy(dtype=float),
+            stored[local].iloc[revise_from - 1].to_numpy(dtype=float),
+            rtol=self.tolerance,
+            atol=self.tolerance,
+            equal_nan=True,
+        ):
+            raise ValueError("warmup window does not reproduce the stored features")
+
+        tail = window.iloc[anchor + 1 :].copy()
+        kept_row = stored.iloc[revise_from - 1]
+        for column in (*_CUMULATIVE, *_VWAP_SUMS):
+            tail[column] = kept_row[column] + (window[column].iloc[anchor + 1 :] - window[column].iloc[anchor])
+        for column, span in _EMA_SPANS.items():
+            seeded = pd.concat([pd.Series([kept_row[column]]), raw["close"].iloc[anchor + 1 :].reset_index(drop=True)])
+            tail[column] = seeded.ewm(span=span, adjust=False).mean().iloc[1:].to_numpy()
+        tail["vwap"] = tail[_VWAP_SUMS[0]] / tail[_VWAP_SUMS[1]]
+
+        columnar.write_tail(symbol, interval, tail[list(stored.columns)], start=revise_from)
+        state = {"columns": state["columns"], "fingerprint": fingerprint}
+        self._save_state(columnar, symbol, interval, state)
+        logger.info("Appended %d feature rows for %s %s", len(tail) - (len(index) - revise_from), symbol, interval)
+        return self._frame(columnar, symbol, interval, state)
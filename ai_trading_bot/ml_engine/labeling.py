@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..utils.config import ModelConfig
+
+LABEL_METHODS = ("fixed", "triple_barrier")
+LABEL_NAMES = np.array(["sell", "hold", "buy"], dtype=object)
+
+# Rows per block in ``triple_barrier_labels``; bounds the (rows, horizon) windows in memory.
+_BLOCK_ROWS = 1 << 16
+
+
+def _names(codes: np.ndarray, known: np.ndarray, index: pd.Index) -> pd.Series:
+    names = LABEL_NAMES[codes + 1]
+    names[~known] = None
+    # Object dtype keeps ``None``; inferred string dtype would turn it into NaN.
+    return pd.Series(names, index=index, dtype=object)
+
+
+def forward_returns(close: pd.Series, horizons: Sequence[int]) -> pd.DataFrame:
+    """Return from each bar's close to the close ``h`` bars later, one ``return_{h}`` column per horizon."""
+
+    values = close.to_numpy(dtype=float)
+    columns = {}
+    for horizon in horizons:
+        future = np.full(len(values), np.nan)
+        if horizon < len(values):
+            future[: len(values) - horizon] = values[horizon:] / values[: len(values) - horizon] - 1
+        columns[f"return_{horizon}"] = future
+    return pd.DataFrame(columns, index=close.index)
+
+
+def horizon_labels(close: pd.Series, horizons: Sequence[int] = (3,), threshold: float = 0.002) -> pd.DataFrame:
+    """``buy``/``sell``/``hold`` per horizon (``label_{h}`` columns) from fixed-threshold forward returns.
+
+    Rows whose horizon runs past the data are ``None`` rather than ``hold``.
+    """
+
+    returns = forward_returns(close, horizons)
+    labels = {}
+    for horizon in horizons:
+        future = returns[f"return_{horizon}"].to_numpy()
+        codes = (future > threshold).astype(np.int8) - (future < -threshold).astype(np.int8)
+        labels[f"label_{horizon}"] = _names(codes, ~np.isnan(future), close.index)
+    return pd.DataFrame(labels, index=close.index)
+
+
+def barrier_volatility(close: pd.Series, span: int = 100) -> pd.Series:
+    """EWM standard deviation of bar returns, the usual scale for triple-barrier widths."""
+
+    return close.pct_change().ewm(span=span).std()
+
+
+def triple_barrier_labels(
+    close: pd.Series,
+    horizon: int = 24,
+    profit_take: float = 0.01,
+    stop_loss: float = 0.01,
+    scale: Optional[pd.Series] = None,
+    timeout: str = "hold",
+) -> pd.DataFrame:
+    """Label each bar by the first barrier its forward close path touches.
+
+    The upper barrier sits at ``profit_take`` and the lower at ``-stop_loss`` return from the bar's
+    close, both multiplied by ``scale`` (e.g. ``barrier_volatility``) when given; the vertical
+    barrier is ``horizon`` bars ahead. Touching the upper barrier first is ``buy``, the lower one
+    ``sell``; at the vertical barrier the label is ``hold``, or the sign of the return there with
+    ``timeout="sign"``. Paths are compared in blocks of sliding windows, so there is no per-row
+    loop. Rows whose path runs past the data without a touch, or without a scale, are ``None``.
+
+    Returns ``label``, ``touch`` (bars until the deciding barrier) and ``return`` at that bar.
+    """
+
+    if timeout not in ("hold", "sign"):
+        raise ValueError(f"Unsupported timeout rule: {timeout}")
+    values = close.to_numpy(dtype=float)
+    length = len(values)
+    width = np.ones(length) if scale is None else scale.reindex(close.index).to_numpy(dtype=float)
+    upper = profit_take * width
+    lower = -stop_loss * width
+    # NaN padding lets the last rows see a shorter path; NaN never touches a barrier.
+    windows = np.lib.stride_tricks.sliding_window_view(np.r_[values, np.full(horizon, np.nan)], horizon + 1)
+
+    codes = np.zeros(length, dtype=np.int8)
+    touch = np.full(length, horizon, dtype=np.int64)
+    returns = np.full(length, np.nan)
+    known = np.zeros(length, dtype=bool)
+    for start in range(0, length, _BLOCK_ROWS):
+        rows = slice(start, min(start + _BLOCK_ROWS, length))
+        block = windows[rows]
+        path = block[:, 1:] / block[:, :1] - 1
+        hit_up = path >= upper[rows, None]
+        hit_down = path <= lower[rows, None]
+        first_up = np.where(hit_up.any(axis=1), hit_up.argmax(axis=1), horizon)
+        first_down = np.where(hit_down.any(axis=1), hit_down.argmax(axis=1), horizon)
+        first = np.minimum(first_up, first_down)
+        touched = first < horizon
+        final = path[:, -1]
+        step = np.where(touched, first, horizon - 1)
+        codes[rows] = np.where(
+            touched,
+            np.where(first_up < first_down, 1, -1),
+            np.sign(np.nan_to_num(final)).astype(np.int8) if timeout == "sign" else 0,
+        )
+        touch[rows] = step + 1
+        returns[rows] = path[np.arange(len(step)), step]
+        known[rows] = (touched | ~np.isnan(final)) & ~np.isnan(width[rows])
+    returns[~known] = np.nan
+    return pd.DataFrame(
+        {"label": _names(codes, known, close.index), "touch": touch, "return": returns},
+        index=close.index,
+    )
+
+
+def make_labels(df: pd.DataFrame, config: ModelConfig) -> pd.Series:
+    """Training labels for ``df`` as configured by ``ModelConfig.label_*``; ``None`` where unknown."""
+
+    if config.label_method == "fixed":
+        return horizon_labels(df["close"], (config.label_horizon,), config.label_threshold)[
+            f"label_{config.label_horizon}"
+        ]
+    if config.label_method == "triple_barrier":
+        scale = None
+        if config.barrier_volatility_span is not None:
+            scale = barrier_volatility(df["close"], config.barrier_volatility_span)
+        return triple_barrier_labels(
+            df["close"],
+            horizon=config.label_horizon,
+            profit_take=config.barrier_profit_take,
+            stop_loss=config.barrier_stop_loss,
+            scale=scale,
+            timeout=config.barrier_timeout,
+        )["label"]
+    raise ValueError(f"Unsupported label method: {config.label_method}")
@@ -1,38 +1,165 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import pickle
 from dataclasses import dataclass
-from typing import Dict, Optional, Tuple
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
+import sklearn
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import classification_report
 from sklearn.model_selection import train_test_split
 
 from ..utils.logger import get_logger
+from .compiled_forest import CompiledForest
+from .feature_engineering import FEATURE_COLUMNS
 
 logger = get_logger(__name__)
 
+# Bump when the meaning of the persisted artefact changes in a way the column list cannot capture.
+MODEL_SCHEMA_VERSION = 1
+
+_MODEL_FILE = "model.pkl"
+_BUFFER_FILE = "model.buffers"
+_META_FILE = "meta.json"
+_ALIGNMENT = 64
+
+
+def feature_schema_hash(columns: Sequence[str]) -> str:
+    payload = json.dumps({"version": MODEL_SCHEMA_VERSION, "columns": list(columns)})
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
 
 @dataclass
 class MLSignalModel:
     params: Dict[str, object]
     model: Optional[RandomForestClassifier] = None
+    compiled: Optional[CompiledForest] = None
+
+    def build_estimator(self) -> RandomForestClassifier:
+        return RandomForestClassifier(**self.params)
 
     def fit(self, X: pd.DataFrame, y: pd.Series) -> None:
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=0.2, random_state=42, stratify=y
         )
-        self.model = RandomForestClassifier(**self.params)
+        self.model = self.build_estimator()
         self.model.fit(X_train, y_train)
+        self.compiled = None
         predictions = self.model.predict(X_test)
         report = classification_report(y_test, predictions, output_dict=False)
         logger.info("RandomForest performance:\n%s", report)
 
+    def compile(self) -> CompiledForest:
+        """Flatten the fitted forest for low-latency ``predict``/``predict_batch`` calls.
+
+        The compiled path returns exactly the probabilities of ``predict_proba``; it skips
+        sklearn's input validation, so ``features`` must carry the training columns in order.
+        """
+
+        if self.model is None:
+            raise RuntimeError("Model must be trained before calling compile().")
+        self.compiled = CompiledForest.from_sklearn(self.model)
+        return self.compiled
+
+    def _predict_proba(self, features: pd.DataFrame) -> np.ndarray:
+        assert self.model is not None
+        if self.compiled is not None:
+            return self.compiled.predict_proba(features)
+        return self.model.predict_proba(features)
+
     def predict(self, features: pd.DataFrame) -> Tuple[str, float]:
         if self.model is None:
             raise RuntimeError("Model must be trained before calling predict().")
-        proba = self.model.predict_proba(features)[0]
+        proba = self._predict_proba(features)[0]
         classes = self.model.classes_
         idx = int(np.argmax(proba))
         return classes[idx], float(proba[idx])
+
+    def predict_batch(self, features: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """Labels and winning-class probabilities for every row in one ``predict_proba`` call."""
+
+        if self.model is None:
+            raise RuntimeError("Model must be trained before calling predict_batch().")
+        proba = self._predict_proba(features)
+        idx = np.argmax(proba, axis=1)
+        return self.model.classes_[idx], proba[np.arange(len(idx)), idx]
+
+    def feature_columns(self) -> List[str]:
+        if self.model is None:
+            raise RuntimeError("Model must be trained before reading its feature columns.")
+        return list(getattr(self.model, "feature_names_in_", []))
+
+    def save(self, path: Path) -> None:
+        """Persist the fitted forest as a pickle stream plus one file of raw array buffers.
+
+        The arrays travel out-of-band (pickle protocol 5), so ``load`` can hand the unpickler
+        slices of a memory map instead of parsing ~1 MB of pickled node data.
+        """
+
+        if self.model is None:
+            raise RuntimeError("Model must be trained before calling save().")
+        path.mkdir(parents=True, exist_ok=True)
+        columns = self.feature_columns()
+        buffers: List[pickle.PickleBuffer] = []
+        stream = pickle.dumps(self.model, protocol=5, buffer_callback=buffers.append)
+        offsets = []
+        with open(path / _BUFFER_FILE, "wb") as handle:
+            for buffer in buffers:
+                raw = buffer.raw()
+                start = handle.tell()
+                offsets.append([start, raw.nbytes])
+                handle.write(raw)
+                handle.write(b"\0" * (-(start + raw.nbytes) % _ALIGNMENT))
+        (path / _MODEL_FILE).write_bytes(stream)
+        meta = {
+            "schema_version": MODEL_SCHEMA_VERSION,
+            "feature_columns": columns,
+            "feature_hash": feature_schema_hash(columns),
+            "classes": [str(c) for c in self.model.classes_],
+            "params": self.params,
+            "sklearn_version": sklearn.__version__,
+            "buffers": offsets,
+        }
+        (path / _META_FILE).write_text(json.dumps(meta, indent=2, default=str))
+        logger.info("Saved RandomForest model to %s", path)
+
+    @classmethod
+    def load(
+        cls,
+        path: Path,
+        expected_columns: Optional[Sequence[str]] = FEATURE_COLUMNS,
+        mmap: bool = True,
+    ) -> "MLSignalModel":
+        """Load a saved model, rejecting artefacts whose feature schema does not match."""
+
+        meta_path = path / _META_FILE
+        if not meta_path.exists():
+            raise FileNotFoundError(f"No saved model under {path}")
+        meta = json.loads(meta_path.read_text())
+        if meta["schema_version"] != MODEL_SCHEMA_VERSION:
+            raise ValueError(
+                f"Model schema version {meta['schema_version']} does not match {MODEL_SCHEMA_VERSION}"
+            )
+        if expected_columns is not None and meta["feature_hash"] != feature_schema_hash(expected_columns):
+            raise ValueError("Saved model was trained on a different feature schema")
+        if meta["sklearn_version"] != sklearn.__version__:
+            logger.warning(
+                "Model was saved with scikit-learn %s, running %s",
+                meta["sklearn_version"],
+                sklearn.__version__,
+            )
+        if meta["buffers"]:
+            if mmap:
+                raw = np.memmap(path / _BUFFER_FILE, dtype=np.uint8, mode="r")
+            else:
+                raw = np.fromfile(path / _BUFFER_FILE, dtype=np.uint8)
+            buffers = [memoryview(raw[start : start + size]) for start, size in meta["buffers"]]
+        else:
+            buffers = []
+        model = pickle.loads((path / _MODEL_FILE).read_bytes(), buffers=buffers)
+        return cls(params=meta["params"], model=model)
@@ -1,40 +1,157 @@
 from __future__ import annotations
 
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Tuple
+from typing import Callable, Dict, Optional, Tuple
 
+import numpy as np
 import optuna
 import pandas as pd
-from sklearn.model_selection import cross_val_score
+from sklearn.metrics import f1_score
+from sklearn.model_selection import StratifiedKFold
 
+from ..utils.logger import get_logger
 from .model_training import MLSignalModel
 
+logger = get_logger(__name__)
+
+_FINISHED_STATES = (optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED)
+
+
+def _make_storage(storage: Optional[str]) -> Optional[optuna.storages.BaseStorage]:
+    """``None`` keeps the study in memory; ``*.log``/``*.journal`` paths use a journal file, anything
+    else is handed to Optuna as an RDB URL such as ``sqlite:///optuna.db``."""
+
+    if storage is None:
+        return None
+    if storage.endswith((".log", ".journal")):
+        try:
+            from optuna.storages.journal import JournalFileBackend
+        except ImportError:  # pragma: no cover - optuna < 4
+            from optuna.storages import JournalFileStorage as JournalFileBackend
+        return optuna.storages.JournalStorage(JournalFileBackend(storage))
+    return optuna.storages.RDBStorage(storage)
+
+
+def _make_pruner() -> optuna.pruners.BasePruner:
+    # Steps are folds, so trials can be pruned from the first reported fold on.
+    return optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=0)
+
+
+def _make_objective(
+    X: pd.DataFrame, y: pd.Series, cv: int, n_jobs: int
+) -> Callable[[optuna.Trial], float]:
+    folds = list(StratifiedKFold(n_splits=cv).split(X, y))
+
+    def objective(trial: optuna.Trial) -> float:
+        params = {
+            "n_estimators": trial.suggest_int("n_estimators", 100, 500, step=50),
+            "max_depth": trial.suggest_int("max_depth", 4, 12),
+            "min_samples_split": trial.suggest_int("min_samples_split", 2, 10),
+            "min_samples_leaf": trial.suggest_int("min_samples_leaf", 1, 5),
+            "random_state": 42,
+            "n_jobs": n_jobs,
+        }
+        scores = []
+        for step, (train_idx, test_idx) in enumerate(folds):
+            estimator = MLSignalModel(params=params).build_estimator()
+            estimator.fit(X.iloc[train_idx], y.iloc[train_idx])
+            predictions = estimator.predict(X.iloc[test_idx])
+            scores.append(f1_score(y.iloc[test_idx], predictions, average="macro"))
+            # Report the running mean so the pruner compares trials after the same number of folds.
+            trial.report(float(np.mean(scores)), step)
+            if trial.should_prune():
+                raise optuna.TrialPruned()
+        return float(np.mean(scores))
+
+    return objective
+
+
+def _run_worker(
+    study_name: str,
+    storage: str,
+    X: pd.DataFrame,
+    y: pd.Series,
+    cv: int,
+    n_jobs: int,
+    n_trials: int,
+    share: int,
+) -> None:
+    # Samplers are not persisted; an unseeded TPE per worker keeps suggestions from colliding.
+    study = optuna.load_study(
+        study_name=study_name,
+        storage=_make_storage(storage),
+        sampler=optuna.samplers.TPESampler(),
+        pruner=_make_pruner(),
+    )
+    # ``share`` makes the workers add up to the total; the callback, checked after each trial,
+    # also stops them early when other processes optimise the same study.
+    study.optimize(
+        _make_objective(X, y, cv, n_jobs),
+        n_trials=share,
+        callbacks=[optuna.study.MaxTrialsCallback(n_trials, states=_FINISHED_STATES)],
+    )
+
 
 @dataclass
 class HyperparameterOptimizer:
+    """RandomForest search with median pruning across CV folds.
+
+    With ``storage`` set the study is persisted and resumed by ``study_name``: ``n_trials``
+    counts finished trials across restarts. ``n_workers`` > 1 requires a storage and runs
+    trials in that many processes; each forest then gets ``cpu_count // n_workers`` threads
+    unless ``n_jobs`` is given.
+    """
+
     n_trials: int = 20
+    study_name: str = "random_forest_signal"
+    storage: Optional[str] = None
+    n_workers: int = 1
+    n_jobs: Optional[int] = None
+    cv: int = 3
+    seed: int = 42
 
-    def optimize(self, X: pd.DataFrame, y: pd.Series) -> Tuple[Dict[str, object], float]:
-        def objective(trial: optuna.Trial) -> float:
-            params = {
-                "n_estimators": trial.suggest_int("n_estimators", 100, 500, step=50),
-                "max_depth": trial.suggest_int("max_depth", 4, 12),
-                "min_samples_split": trial.suggest_int("min_samples_split", 2, 10),
-                "min_samples_leaf": trial.suggest_int("min_samples_leaf", 1, 5),
-                "random_state": 42,
-            }
-            model = MLSignalModel(params=params)
-            estimator = model.model or model.fit_model_instance()
-            return float(cross_val_score(estimator, X, y, cv=3, scoring="f1_macro").mean())
-
-        study = optuna.create_study(direction="maximize")
-        study.optimize(objective, n_trials=self.n_trials)
-        return study.best_params, float(study.best_value)
+    def _create_study(self) -> optuna.Study:
+        return optuna.create_study(
+            study_name=self.study_name,
+            storage=_make_storage(self.storage),
+            load_if_exists=True,
+            direction="maximize",
+            sampler=optuna.samplers.TPESampler(seed=self.seed),
+            pruner=_make_pruner(),
+        )
 
+    def optimize(self, X: pd.DataFrame, y: pd.Series) -> Tuple[Dict[str, object], float]:
+        if self.n_workers > 1 and self.storage is None:
+            raise ValueError("Parallel optimisation needs a storage shared by the worker processes.")
+        study = self._create_study()
+        n_jobs = self.n_jobs or max((os.cpu_count() or 1) // self.n_workers, 1)
+        finished = len(study.get_trials(deepcopy=False, states=_FINISHED_STATES))
+        logger.info(
+            "Optimising study %s: %d/%d trials finished, %d worker(s)",
+            self.study_name,
+            finished,
+            self.n_trials,
+            self.n_workers,
+        )
 
-# Monkey patch helper for optuna to obtain estimator without fitting - keeps interface simple
-setattr(
-    MLSignalModel,
-    "fit_model_instance",
-    lambda self: __import__("sklearn").ensemble.RandomForestClassifier(**self.params),
-)
+        remaining = self.n_trials - finished
+        if remaining > 0 and self.n_workers > 1:
+            assert self.storage is not None
+            shares = [remaining // self.n_workers + (i < remaining % self.n_workers) for i in range(self.n_workers)]
+            with ProcessPoolExecutor(max_workers=self.n_workers) as pool:
+                futures = [
+                    pool.submit(_run_worker, self.study_name, self.storage, X, y, self.cv, n_jobs, self.n_trials, share)
+                    for share in shares
+                    if share > 0
+                ]
+                for future in futures:
+                    future.result()
+            study = self._create_study()
+        elif remaining > 0:
+            study.optimize(_make_objective(X, y, self.cv, n_jobs), n_trials=remaining)
+        if not study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,)):
+            # ``best_params`` raises when every trial was pruned or failed.
+            raise ValueError(f"No trial of study {self.study_name} completed; raise n_trials or relax pruning.")
+        return study.best_params, float(study.best_value)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from ..ml_engine.feature_engineering import SENTIMENT_COLUMNS
+from ..utils.logger import get_logger
+from .finbert_analysis import FinBERTSentimentAnalyzer, text_key
+from .vader_analysis import VaderSentimentAnalyzer
+
+logger = get_logger(__name__)
+
+SCORERS = ("vader", "finbert")
+
+_TEXT_COLUMNS = ("text", "headline", "title")
+# exp() overflows past ~709; rebasing every 500 decay units keeps the prefix sums finite.
+_MAX_EXPONENT = 500.0
+
+
+def load_headlines(paths: Iterable[Union[str, Path]]) -> pd.DataFrame:
+    """Read ``timestamp``/``text`` rows from CSV, JSON lines or Parquet files, sorted in UTC."""
+
+    frames = []
+    for path in map(Path, paths):
+        if path.suffix == ".parquet":
+            frame = pd.read_parquet(path)
+        elif path.suffix in (".jsonl", ".json"):
+            frame = pd.read_json(path, lines=True)
+        else:
+            frame = pd.read_csv(path)
+        text_column = next((c for c in _TEXT_COLUMNS if c in frame.columns), None)
+        if "timestamp" not in frame.columns or text_column is None:
+            raise ValueError(f"{path} needs a timestamp column and one of {_TEXT_COLUMNS}")
+        frames.append(frame[["timestamp", text_column]].rename(columns={text_column: "text"}))
+    if not frames:
+        return pd.DataFrame({"text": pd.Series(dtype=object)}, index=pd.DatetimeIndex([], tz="UTC", name="timestamp"))
+    headlines = pd.concat(frames, ignore_index=True).dropna()
+    headlines["timestamp"] = pd.to_datetime(headlines["timestamp"], utc=True)
+    return headlines.set_index("timestamp").sort_index(kind="stable")
+
+
+def _utc_nanos(index: pd.DatetimeIndex) -> np.ndarray:
+    utc = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+    return utc.as_unit("ns").asi8
+
+
+def _decayed_sums(times: np.ndarray, values: np.ndarray, rate: float) -> np.ndarray:
+    """``sum(values[j] * exp(-rate * (times[i] - times[j])) for j <= i)`` for every ``i``."""
+
+    result = np.empty(len(values), dtype=np.float64)
+    carry, start = 0.0, 0
+    while start < len(values):
+        base = times[start]
+        offsets = (times[start:] - base) * rate
+        stop = start + int(np.searchsorted(offsets, _MAX_EXPONENT, side="right"))
+        scale = offsets[: stop - start]
+        prefix = np.cumsum(values[start:stop] * np.exp(scale))
+        result[start:stop] = (prefix + carry) * np.exp(-scale)
+        if stop < len(values):
+            # Carry the running sum, decayed to the next segment's base time.
+            carry = result[stop - 1] * np.exp(-(times[stop] - times[stop - 1]) * rate)
+        start = stop
+    return result
+
+
+@dataclass
+class SentimentFeaturePipeline:
+    """Scores headlines once and aggregates them into per-bar sentiment features.
+
+    Scores are cached in a Parquet file keyed by the normalised-text hash, so repeated
+    headlines and reruns only score text that has not been seen. A bar at time ``t`` sees
+    headlines published at or before ``t``:
+
+    * ``sentiment_mean``: mean score over the trailing ``window``
+    * ``sentiment_count``: number of headlines in that window
+    * ``sentiment_decay``: sum of all earlier scores, each halved every ``halflife``
+
+    Bars without headlines get neutral values (0.0) so ``dropna`` keeps them.
+    """
+
+    cache_dir: Path
+    scorer: str = "vader"
+    window: str = "24h"
+    halflife: str = "6h"
+    vader: VaderSentimentAnalyzer = field(default_factory=VaderSentimentAnalyzer)
+    finbert: Optional[FinBERTSentimentAnalyzer] = None
+
+    def __post_init__(self) -> None:
+        if self.scorer not in SCORERS:
+            raise ValueError(f"Unknown sentiment scorer: {self.scorer}")
+
+    @property
+    def cache_path(self) -> Path:
+        return self.cache_dir / f"headline_scores_{self.scorer}.parquet"
+
+    def _score_texts(self, texts: List[str]) -> List[float]:
+        if self.scorer == "finbert":
+            self.finbert = self.finbert or FinBERTSentimentAnalyzer()
+            return [s.get("positive", 0.0) - s.get("negative", 0.0) for s in self.finbert.analyze_batch(texts)]
+        return [s["compound"] for s in self.vader.analyze_many(texts)]
+
+    def score(self, headlines: pd.DataFrame) -> pd.Series:
+        """Score per headline (aligned to ``headlines``), scoring only uncached texts."""
+
+        keys = headlines["text"].map(text_key)
+        cached = pd.read_parquet(self.cache_path)["score"] if self.cache_path.exists() else pd.Series(dtype=float)
+        new = ~keys.isin(cached.index) & ~keys.duplicated()
+        if new.any():
+            texts = headlines.loc[new.to_numpy(), "text"].tolist()
+            logger.info("Scoring %d new headlines with %s", len(texts), self.scorer)
+            fresh = pd.Series(self._score_texts(texts), index=keys[new].to_numpy(), dtype=float)
+            cached = pd.concat([cached, fresh])
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            cached.rename_axis("key").to_frame("score").to_parquet(tmp_path)
+            os.replace(tmp_path, self.cache_path)
+        return pd.Series(cached.reindex(keys.to_numpy()).to_numpy(), index=headlines.index, name="score")
+
+    def features(self, index: pd.DatetimeIndex, headlines: pd.DataFrame) -> pd.DataFrame:
+        """``SENTIMENT_COLUMNS`` aligned to the bar ``index`` with an as-of (backward) join."""
+
+        bars = _utc_nanos(pd.DatetimeIndex(index))
+        if headlines.empty:
+            return pd.DataFrame(0.0, index=index, columns=SENTIMENT_COLUMNS)
+        scores = self.score(headlines).to_numpy()
+        times = _utc_nanos(pd.DatetimeIndex(headlines.index))
+
+        # Trailing-window mean and count from prefix sums at the as-of positions.
+        prefix = np.concatenate(([0.0], np.cumsum(scores)))
+        upper = np.searchsorted(times, bars, side="right")
+        lower = np.searchsorted(times, bars - pd.Timedelta(self.window).value, side="right")
+        count = upper - lower
+        total = prefix[upper] - prefix[lower]
+        mean = np.divide(total, count, out=np.zeros(len(bars)), where=count > 0)
+
+        # Decayed sum at the last headline, decayed further to the bar time.
+        rate = np.log(2.0) / pd.Timedelta(self.halflife).value
+        decayed = _decayed_sums(times, scores, rate)
+        last = np.maximum(upper - 1, 0)
+        fade = np.exp(-(bars - times[last]) * rate)
+        decay = np.where(upper > 0, decayed[last] * fade, 0.0)
+
+        return pd.DataFrame(
+            {"sentiment_mean": mean, "sentiment_count": count.astype(np.float64), "sentiment_decay": decay},
+            index=index,
+        )
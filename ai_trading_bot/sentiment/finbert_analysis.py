@@ -1,50 +1,85 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, Optional
-
-try:
-    from transformers import AutoModelForSequenceClassification, AutoTokenizer
-    import torch
-except ImportError:  # pragma: no cover - optional dependency
-    AutoModelForSequenceClassification = None
-    AutoTokenizer = None
-    torch = None
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
 
+from ..utils.dependency_check import is_installed
 from ..utils.logger import get_logger
 
+# transformers and torch take seconds to import, so they are loaded with the model.
+if TYPE_CHECKING:
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
 logger = get_logger(__name__)
 
+_NEUTRAL = {"positive": 0.0, "neutral": 1.0, "negative": 0.0}
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace and case so re-published headlines share one cache entry."""
+
+    return " ".join(text.split()).casefold()
+
+
+def text_key(text: str) -> str:
+    return hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=16).hexdigest()
+
 
 @dataclass
 class FinBERTSentimentAnalyzer:
+    """FinBERT scores with length-bucketed batches and an LRU cache of recent headlines.
+
+    ``model_name`` may be a Hub id or a local directory. With ``quantize`` the linear layers
+    are converted to dynamic int8 when running on CPU.
+    """
+
     model_name: str = "ProsusAI/finbert"
     device: Optional[str] = None
+    batch_size: int = 32
+    max_length: int = 128
+    quantize: bool = False
+    cache_size: int = 10_000
     _model: Optional[AutoModelForSequenceClassification] = None
     _tokenizer: Optional[AutoTokenizer] = None
+    _labels: List[str] = field(default_factory=list, repr=False)
+    _cache: "OrderedDict[str, Dict[str, float]]" = field(default_factory=OrderedDict, repr=False)
     _warned_unavailable: bool = False
+    hits: int = 0
+    misses: int = 0
 
     def is_available(self) -> bool:
-        return AutoModelForSequenceClassification is not None and torch is not None
+        return is_installed("transformers") and is_installed("torch")
 
     def _load(self) -> None:
         if not self.is_available():
-
-
-
-    def _load(self) -> None:
-        if AutoModelForSequenceClassification is None:
             raise ImportError(
                 "transformers and torch are required for FinBERT sentiment analysis."
             )
         if self._model is None or self._tokenizer is None:
+            import torch
+            from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
             logger.info("Loading FinBERT model %s", self.model_name)
             self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-            self._model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
-            if self.device:
-                self._model.to(self.device)
+            model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+            model.eval()
+            if self.quantize and self.device in (None, "cpu"):
+                model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            elif self.device:
+                model.to(self.device)
+            self._model = model
+            # ProsusAI/finbert orders its logits positive, negative, neutral; trust the config.
+            id2label = model.config.id2label
+            self._labels = [str(id2label[i]).lower() for i in range(len(id2label))]
 
     def analyze(self, text: str) -> Dict[str, float]:
+        return self.analyze_batch([text])[0]
+
+    def analyze_batch(self, texts: Sequence[str]) -> List[Dict[str, float]]:
+        """Scores for ``texts`` in input order; cached and repeated texts are scored once."""
+
         if not self.is_available():  # pragma: no cover - optional dependency path
             if not self._warned_unavailable:
                 logger.warning(
@@ -52,16 +87,58 @@ class FinBERTSentimentAnalyzer:
                     "ML extras via `pip install -r requirements-ml.txt` to enable FinBERT."
                 )
                 self._warned_unavailable = True
-            return {"positive": 0.0, "neutral": 1.0, "negative": 0.0}
+            return [dict(_NEUTRAL) for _ in texts]
 
+        keys = [text_key(text) for text in texts]
+        scores: Dict[str, Dict[str, float]] = {}
+        pending: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key in scores or key in pending:
+                continue
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                scores[key] = self._cache[key]
+                self.hits += 1
+            else:
+                pending[key] = text
+                self.misses += 1
+        if pending:
+            fresh = self._score(list(pending.values()))
+            for key, result in zip(pending, fresh):
+                scores[key] = result
+                self._store(key, result)
+        return [dict(scores[key]) for key in keys]
 
+    def _score(self, texts: List[str]) -> List[Dict[str, float]]:
+        import torch
 
- 
         self._load()
         assert self._model is not None and self._tokenizer is not None
-        inputs = self._tokenizer(text, return_tensors="pt", truncation=True, padding=True)
-        if self.device:
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-        outputs = self._model(**inputs)
-        probs = outputs.logits.softmax(dim=-1).detach().cpu().numpy()[0]
-        return {"positive": float(probs[0]), "neutral": float(probs[1]), "negative": float(probs[2])}
+        encoded = self._tokenizer(texts, truncation=True, max_length=self.max_length)
+        names = list(encoded.keys())
+        # Sorting by length keeps the padding inside each batch to a few tokens.
+        order = sorted(range(len(texts)), key=lambda i: len(encoded["input_ids"][i]))
+        results: List[Dict[str, float]] = [{} for _ in texts]
+        with torch.inference_mode():
+            for start in range(0, len(order), self.batch_size):
+                chunk = order[start : start + self.batch_size]
+                batch = self._tokenizer.pad(
+                    [{name: encoded[name][i] for name in names} for i in chunk],
+                    return_tensors="pt",
+                )
+                if self.device:
+                    batch = {name: tensor.to(self.device) for name, tensor in batch.items()}
+                probs = self._model(**batch).logits.float().softmax(dim=-1).cpu().numpy()
+                for i, row in zip(chunk, probs):
+                    results[i] = {label: float(p) for label, p in zip(self._labels, row)}
+        return results
+
+    def _store(self, key: str, scores: Dict[str, float]) -> None:
+        self._cache[key] = scores
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
@@ -1,7 +1,15 @@
 from __future__ import annotations
 
+import argparse
+import itertools
+import json
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict
+from functools import lru_cache
+from pathlib import Path
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Union
 
 try:
     from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
@@ -12,14 +20,113 @@ from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+_NEUTRAL = {"positive": 0.0, "negative": 0.0, "neutral": 1.0, "compound": 0.0}
+
+
+@lru_cache(maxsize=1)
+def _shared_analyzer() -> "SentimentIntensityAnalyzer":
+    # Building the analyzer parses the lexicon files, so each process does it once.
+    if SentimentIntensityAnalyzer is None:
+        raise ImportError(
+            "vaderSentiment is required for VADER analysis. Install with `pip install vaderSentiment`."
+        )
+    return SentimentIntensityAnalyzer()
+
+
+def _score(analyzer: "SentimentIntensityAnalyzer", text: str) -> Dict[str, float]:
+    if not text.strip():
+        # VADER scores empty text as all zeros; report it as plainly neutral instead.
+        return dict(_NEUTRAL)
+    scores = analyzer.polarity_scores(text)
+    return {"positive": scores["pos"], "negative": scores["neg"], "neutral": scores["neu"], "compound": scores["compound"]}
+
+
+def _init_worker() -> None:
+    _shared_analyzer()
+
+
+def _score_chunk(texts: List[str]) -> List[Dict[str, float]]:
+    analyzer = _shared_analyzer()
+    return [_score(analyzer, text) for text in texts]
+
+
+def _chunks(texts: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(texts)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def read_lines(path: Union[str, Path]) -> Iterator[str]:
+    """Lazily yield one text per line of ``path``.
+
+    Blank lines are kept (and score neutral) so output line ``i`` always belongs to input line ``i``.
+    """
+
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            yield line.rstrip("\r\n")
+
 
 @dataclass
 class VaderSentimentAnalyzer:
+    chunk_size: int = 2_000
+    max_workers: Optional[int] = None
+
     def analyze(self, text: str) -> Dict[str, float]:
-        if SentimentIntensityAnalyzer is None:
-            raise ImportError(
-                "vaderSentiment is required for VADER analysis. Install with `pip install vaderSentiment`."
+        return _score(_shared_analyzer(), text)
+
+    def analyze_many(self, texts: Iterable[str]) -> Iterator[Dict[str, float]]:
+        """Score ``texts`` in input order, streaming results chunk by chunk.
+
+        Chunks are spread over a process pool whose workers load the lexicon once; only a
+        bounded window of chunks is in flight, so arbitrarily long iterables are fine.
+        ``max_workers=1``, or input that fits in one chunk, scores in-process: starting a pool
+        costs more than scoring a few thousand texts.
+        """
+
+        _shared_analyzer()  # fail fast when vaderSentiment is missing
+        chunks = _chunks(texts, self.chunk_size)
+        head = list(itertools.islice(chunks, 2))
+        chunks = itertools.chain(head, chunks)
+        workers = self.max_workers or os.cpu_count() or 1
+        if workers == 1 or len(head) < 2:
+            for chunk in chunks:
+                yield from _score_chunk(chunk)
+            return
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            pending: Deque[Future] = deque(
+                pool.submit(_score_chunk, chunk) for chunk in itertools.islice(chunks, workers * 2)
             )
-        analyzer = SentimentIntensityAnalyzer()
-        scores = analyzer.polarity_scores(text)
-        return {"positive": scores["pos"], "negative": scores["neg"], "neutral": scores["neu"], "compound": scores["compound"]}
+            while pending:
+                results = pending.popleft().result()
+                following = next(chunks, None)
+                if following is not None:
+                    pending.append(pool.submit(_score_chunk, following))
+                yield from results
+
+    def analyze_file(self, path: Union[str, Path]) -> Iterator[Dict[str, float]]:
+        return self.analyze_many(read_lines(path))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Score a file of texts (one per line) with VADER.")
+    parser.add_argument("input", help="Text file with one headline per line")
+    parser.add_argument("output", help="JSON lines file receiving one score dict per input line")
+    parser.add_argument("--chunk-size", type=int, default=2_000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    analyzer = VaderSentimentAnalyzer(chunk_size=args.chunk_size, max_workers=args.workers)
+    count = 0
+    with open(args.output, "w", encoding="utf-8") as handle:
+        for scores in analyzer.analyze_file(args.input):
+            handle.write(json.dumps(scores) + "\n")
+            count += 1
+    logger.info("Scored %d texts from %s", count, args.input)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, ClassVar, Dict, Iterator, Mapping, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from ..indicators.cache import IndicatorCache
+from ..indicators.registry import indicator_columns
+
+
+SIGNAL_COLUMNS = ["signal", "confidence", "reason"]
+
 
 @dataclass
 class StrategyResult:
@@ -13,8 +20,143 @@ class StrategyResult:
     reason: str
 
 
+def latest_rows(data: pd.DataFrame, columns: Dict[str, pd.Series], rows: int = 2) -> pd.DataFrame:
+    """The last ``rows`` bars of ``data`` joined with indicator ``columns``, without copying the history."""
+
+    return data.iloc[-rows:].assign(**{name: column.iloc[-rows:] for name, column in columns.items()})
+
+
+def with_columns(data: pd.DataFrame, columns: Dict[str, pd.Series]) -> Dict[str, pd.Series]:
+    """Column lookup over ``data`` plus indicator ``columns`` for vectorized rules."""
+
+    return {**dict(data.items()), **columns}
+
+
+@dataclass(frozen=True)
+class Lagged(Mapping[str, pd.Series]):
+    """``columns`` as of ``periods`` bars earlier, shifted only when a rule reads them."""
+
+    columns: Mapping[str, pd.Series]
+    periods: int = 1
+
+    def __getitem__(self, name: str) -> pd.Series:
+        return self.columns[name].shift(self.periods)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.columns)
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+
+def signal_frame(
+    index: pd.Index,
+    buy: pd.Series,
+    sell: pd.Series,
+    confidence: float,
+    buy_reason: str,
+    sell_reason: str,
+) -> pd.DataFrame:
+    """Assemble per-bar signals from boolean masks; buy wins when both fire, as in ``generate_signal``."""
+
+    buy_mask = np.asarray(buy, dtype=bool)
+    sell_mask = np.asarray(sell, dtype=bool) & ~buy_mask
+    signal = np.full(len(index), None, dtype=object)
+    reason = np.full(len(index), None, dtype=object)
+    signal[buy_mask] = "buy"
+    signal[sell_mask] = "sell"
+    reason[buy_mask] = buy_reason
+    reason[sell_mask] = sell_reason
+    conf = np.where(buy_mask | sell_mask, confidence, 0.0)
+    return _build_signal_frame(index, signal, conf, reason)
+
+
+def _build_signal_frame(
+    index: pd.Index, signal: np.ndarray, confidence: np.ndarray, reason: np.ndarray
+) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "signal": pd.Series(signal, index=index, dtype=object),
+            "confidence": pd.Series(confidence, index=index, dtype=float),
+            "reason": pd.Series(reason, index=index, dtype=object),
+        },
+        index=index,
+    )
+
+
 class Strategy:
     name: str = "base"
+    # Column the rule reads -> indicator registry column. ``StreamingIndicatorEngine`` keys use the
+    # registry names, so the same mapping renames streaming output. Higher-timeframe columns
+    # (``ema_50@4h``) work in the batch paths; the streaming engine does not produce them.
+    indicators: ClassVar[Dict[str, str]] = {}
+    # What ``conditions`` signals carry.
+    confidence: ClassVar[float] = 0.0
+    buy_reason: ClassVar[str] = ""
+    sell_reason: ClassVar[str] = ""
+
+    def indicator_map(self, running: bool = False) -> Dict[str, str]:
+        """``indicators`` for this instance; strategies with indicator parameters override it.
+
+        ``running`` asks for columns as known at each bar (e.g. a session range still forming)
+        where the rule would otherwise read a completed value.
+        """
+
+        return dict(self.indicators)
+
+    def generate_signal(
+        self, data: pd.DataFrame, cache: Optional[IndicatorCache] = None
+    ) -> Optional[StrategyResult]:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def evaluate(
+        self, latest: Mapping[str, float], prev: Mapping[str, float]
+    ) -> Optional[StrategyResult]:  # pragma: no cover - interface
+        """The per-bar rule on the enriched latest and previous rows (bar plus indicator columns)."""
 
-    def generate_signal(self, data: pd.DataFrame) -> Optional[StrategyResult]:  # pragma: no cover - interface
         raise NotImplementedError
+
+    def conditions(self, latest: Mapping[str, Any], prev: Mapping[str, Any]) -> Tuple[Any, Any]:
+        """Buy and sell masks of the rule on aligned columns: the bars of one symbol in
+        ``generate_signals``, or one bar per symbol in the ``scanner``."""
+
+        raise NotImplementedError
+
+    def evaluate_streaming(
+        self, latest: Mapping[str, float], prev: Mapping[str, float]
+    ) -> Optional[StrategyResult]:
+        """``evaluate`` on bars merged with ``StreamingIndicatorEngine`` output."""
+
+        renamed = {column: key for column, key in self.indicator_map(running=True).items() if column != key}
+        if renamed:
+            latest = {**latest, **{column: latest[key] for column, key in renamed.items()}}
+            prev = {**prev, **{column: prev[key] for column, key in renamed.items()}}
+        return self.evaluate(latest, prev)
+
+    def generate_signals(self, data: pd.DataFrame, cache: Optional[IndicatorCache] = None) -> pd.DataFrame:
+        """Return ``signal``/``confidence``/``reason`` for every bar of ``data``.
+
+        Row ``i`` equals ``generate_signal(data.iloc[: i + 1])``. Strategies that implement
+        ``conditions`` get a single vectorized pass over the running indicator columns; the
+        fallback replays the expanding window and is O(N^2) and does not use ``cache`` since every
+        prefix is a different frame.
+        """
+
+        if type(self).conditions is not Strategy.conditions:
+            enriched = with_columns(data, indicator_columns(data, self.indicator_map(running=True), cache))
+            buy, sell = self.conditions(enriched, Lagged(enriched))
+            return signal_frame(data.index, buy, sell, self.confidence, self.buy_reason, self.sell_reason)
+        signal = np.full(len(data), None, dtype=object)
+        reason = np.full(len(data), None, dtype=object)
+        confidence = np.zeros(len(data))
+        for i in range(len(data)):
+            try:
+                result = self.generate_signal(data.iloc[: i + 1])
+            except (IndexError, KeyError):
+                continue
+            if result is None:
+                continue
+            signal[i] = result.signal
+            confidence[i] = result.confidence
+            reason[i] = result.reason
+        return _build_signal_frame(data.index, signal, confidence, reason)
@@ -1,32 +1,63 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, ClassVar, Dict, Mapping, Optional, Tuple
 
 import pandas as pd
 
-from ..indicators.vwap_range import compute_breakout_indicators
-from .base import Strategy, StrategyResult
+from ..indicators.cache import IndicatorCache
+from ..indicators.registry import indicator_columns
+from .base import Strategy, StrategyResult, latest_rows
 
 
 @dataclass
 class BreakoutStrategy(Strategy):
     name: str = "breakout"
     volume_multiplier: float = 1.3
-
-    def generate_signal(self, data: pd.DataFrame) -> Optional[StrategyResult]:
-        enriched = compute_breakout_indicators(data)
-        latest = enriched.iloc[-1]
-        prev = enriched.iloc[-2]
-
+    # Any session of ``indicators.sessions.SESSIONS`` (or one added with ``register_session``).
+    session: str = "asia"
+    indicators: ClassVar[Dict[str, str]] = {
+        "vwap": "vwap",
+        "range_high": "range_high",
+        "range_low": "range_low",
+        "volume_ma": "volume_ma_30",
+    }
+    confidence: ClassVar[float] = 0.7
+    buy_reason: ClassVar[str] = "Price breaks above range high and VWAP with volume confirmation"
+    sell_reason: ClassVar[str] = "Price breaks below range low and VWAP with volume confirmation"
+
+    def indicator_map(self, running: bool = False) -> Dict[str, str]:
+        levels = "running_" if running else ""
+        return {
+            **self.indicators,
+            "range_high": f"{self.session}_{levels}high",
+            "range_low": f"{self.session}_{levels}low",
+        }
+
+    def generate_signal(
+        self, data: pd.DataFrame, cache: Optional[IndicatorCache] = None
+    ) -> Optional[StrategyResult]:
+        enriched = latest_rows(data, indicator_columns(data, self.indicator_map(), cache))
+        return self.evaluate(enriched.iloc[-1], enriched.iloc[-2])
+
+    def evaluate(
+        self, latest: Mapping[str, float], prev: Mapping[str, float]
+    ) -> Optional[StrategyResult]:
         breakout_up = latest["close"] > latest["range_high"] and latest["close"] > latest["vwap"]
         breakout_down = latest["close"] < latest["range_low"] and latest["close"] < latest["vwap"]
         volume_spike = latest["volume"] > self.volume_multiplier * latest["volume_ma"]
 
         if breakout_up and volume_spike:
-            reason = "Price breaks above range high and VWAP with volume confirmation"
-            return StrategyResult("buy", 0.7, reason)
+            return StrategyResult("buy", self.confidence, self.buy_reason)
         if breakout_down and volume_spike:
-            reason = "Price breaks below range low and VWAP with volume confirmation"
-            return StrategyResult("sell", 0.7, reason)
+            return StrategyResult("sell", self.confidence, self.sell_reason)
         return None
+
+    def conditions(self, latest: Mapping[str, Any], prev: Mapping[str, Any]) -> Tuple[Any, Any]:
+        # ``generate_signals`` reads the running session range, known up to each bar, so the
+        # vectorized pass stays equal to the per-bar evaluation.
+        breakout_up = (latest["close"] > latest["range_high"]) & (latest["close"] > latest["vwap"])
+        breakout_down = (latest["close"] < latest["range_low"]) & (latest["close"] < latest["vwap"])
+        volume_spike = latest["volume"] > self.volume_multiplier * latest["volume_ma"]
+
+        return breakout_up & volume_spike, breakout_down & volume_spike
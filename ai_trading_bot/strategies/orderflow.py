@@ -1,24 +1,33 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, ClassVar, Dict, Mapping, Optional, Tuple
 
 import pandas as pd
 
-from ..indicators.orderflow_liquidity import compute_orderflow_indicators
-from .base import Strategy, StrategyResult
+from ..indicators.cache import IndicatorCache
+from ..indicators.registry import indicator_columns
+from .base import Strategy, StrategyResult, latest_rows
 
 
 @dataclass
 class OrderflowStrategy(Strategy):
     name: str = "orderflow"
     delta_threshold: float = 0.0
-
-    def generate_signal(self, data: pd.DataFrame) -> Optional[StrategyResult]:
-        enriched = compute_orderflow_indicators(data)
-        latest = enriched.iloc[-1]
-        prev = enriched.iloc[-2]
-
+    indicators: ClassVar[Dict[str, str]] = {"delta_volume": "delta_volume"}
+    confidence: ClassVar[float] = 0.72
+    buy_reason: ClassVar[str] = "Liquidity sweep with delta volume absorption on the bid"
+    sell_reason: ClassVar[str] = "Liquidity sweep with delta volume absorption on the ask"
+
+    def generate_signal(
+        self, data: pd.DataFrame, cache: Optional[IndicatorCache] = None
+    ) -> Optional[StrategyResult]:
+        enriched = latest_rows(data, indicator_columns(data, self.indicator_map(), cache))
+        return self.evaluate(enriched.iloc[-1], enriched.iloc[-2])
+
+    def evaluate(
+        self, latest: Mapping[str, float], prev: Mapping[str, float]
+    ) -> Optional[StrategyResult]:
         absorption_buy = (
             latest["low"] < prev["low"]
             and latest["close"] > prev["close"]
@@ -31,9 +40,24 @@ class OrderflowStrategy(Strategy):
         )
 
         if absorption_buy:
-            reason = "Liquidity sweep with delta volume absorption on the bid"
-            return StrategyResult("buy", 0.72, reason)
+            return StrategyResult("buy", self.confidence, self.buy_reason)
         if absorption_sell:
-            reason = "Liquidity sweep with delta volume absorption on the ask"
-            return StrategyResult("sell", 0.72, reason)
+            return StrategyResult("sell", self.confidence, self.sell_reason)
         return None
+
+    def conditions(self, latest: Mapping[str, Any], prev: Mapping[str, Any]) -> Tuple[Any, Any]:
+        delta = latest["delta_volume"]
+        prev_delta = prev["delta_volume"]
+        tolerance = abs(prev_delta) * 0.05
+
+        absorption_buy = (
+            (latest["low"] < prev["low"])
+            & (latest["close"] > prev["close"])
+            & (delta > prev_delta + tolerance)
+        )
+        absorption_sell = (
+            (latest["high"] > prev["high"])
+            & (latest["close"] < prev["close"])
+            & (delta < prev_delta - tolerance)
+        )
+        return absorption_buy, absorption_sell
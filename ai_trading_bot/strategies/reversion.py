@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, ClassVar, Dict, Mapping, Optional, Tuple
 
 import pandas as pd
 
-from ..indicators.bollinger_rsi import compute_reversion_indicators
-from .base import Strategy, StrategyResult
+from ..indicators.cache import IndicatorCache
+from ..indicators.registry import indicator_columns
+from .base import Strategy, StrategyResult, latest_rows
 
 
 @dataclass
@@ -14,15 +15,30 @@ class MeanReversionStrategy(Strategy):
     name: str = "mean_reversion"
     rsi_lower: float = 30
     rsi_upper: float = 70
+    indicators: ClassVar[Dict[str, str]] = {name: name for name in ("rsi_14", "bb_upper", "bb_lower")}
+    confidence: ClassVar[float] = 0.65
+    buy_reason: ClassVar[str] = "RSI oversold with price below lower Bollinger Band"
+    sell_reason: ClassVar[str] = "RSI overbought with price above upper Bollinger Band"
 
-    def generate_signal(self, data: pd.DataFrame) -> Optional[StrategyResult]:
-        enriched = compute_reversion_indicators(data)
+    def generate_signal(
+        self, data: pd.DataFrame, cache: Optional[IndicatorCache] = None
+    ) -> Optional[StrategyResult]:
+        enriched = latest_rows(data, indicator_columns(data, self.indicator_map(), cache))
         latest = enriched.iloc[-1]
+        # The rule only reads the latest bar.
+        return self.evaluate(latest, latest)
 
+    def evaluate(
+        self, latest: Mapping[str, float], prev: Mapping[str, float]
+    ) -> Optional[StrategyResult]:
         if latest["rsi_14"] < self.rsi_lower and latest["close"] < latest["bb_lower"]:
-            reason = "RSI oversold with price below lower Bollinger Band"
-            return StrategyResult("buy", 0.65, reason)
+            return StrategyResult("buy", self.confidence, self.buy_reason)
         if latest["rsi_14"] > self.rsi_upper and latest["close"] > latest["bb_upper"]:
-            reason = "RSI overbought with price above upper Bollinger Band"
-            return StrategyResult("sell", 0.65, reason)
+            return StrategyResult("sell", self.confidence, self.sell_reason)
         return None
+
+    def conditions(self, latest: Mapping[str, Any], prev: Mapping[str, Any]) -> Tuple[Any, Any]:
+        return (
+            (latest["rsi_14"] < self.rsi_lower) & (latest["close"] < latest["bb_lower"]),
+            (latest["rsi_14"] > self.rsi_upper) & (latest["close"] > latest["bb_upper"]),
+        )
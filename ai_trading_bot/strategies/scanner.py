@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ..indicators.cache import IndicatorCache
+from ..indicators.registry import indicator_columns
+from ..utils.config import DataSourceConfig, ScannerConfig
+from ..utils.logger import get_logger
+from .base import Strategy, signal_frame
+
+logger = get_logger(__name__)
+
+PANEL_COLUMNS = ["open", "high", "low", "close", "volume"]
+# Aggressor volumes only stay in the panel when every symbol has them; ``delta_volume`` falls back
+# to the candle-direction approximation otherwise, the same for all symbols.
+ORDERFLOW_COLUMNS = ["buy_volume", "sell_volume"]
+SCAN_COLUMNS = ["symbol", "strategy", "signal", "confidence", "score", "reason", "timestamp", "close"]
+
+
+def default_strategies() -> List[Strategy]:
+    from .breakout import BreakoutStrategy
+    from .orderflow import OrderflowStrategy
+    from .reversion import MeanReversionStrategy
+    from .trend_following import TrendFollowingStrategy
+
+    return [TrendFollowingStrategy(), BreakoutStrategy(), MeanReversionStrategy(), OrderflowStrategy()]
+
+
+def build_panel(frames: Mapping[str, pd.DataFrame]) -> pd.DataFrame:
+    """Stack per-symbol bars into one frame with (bar column, symbol) columns.
+
+    Rows are the union of all bar times; a symbol has NaN rows where it has no bar (before its
+    listing, or a gap in its history).
+    """
+
+    columns = PANEL_COLUMNS + [
+        column for column in ORDERFLOW_COLUMNS if frames and all(column in frame.columns for frame in frames.values())
+    ]
+    symbols = list(frames)
+    index: Optional[pd.DatetimeIndex] = None
+    for frame in frames.values():
+        times = pd.DatetimeIndex(frame.index)
+        index = times if index is None or index.equals(times) else index.union(times)
+    if index is None:
+        index = pd.DatetimeIndex([])
+    # One float block for the whole panel: per-symbol frames concatenated side by side would
+    # leave a block per symbol and every wide operation would loop over them. pandas keeps a
+    # block as (columns, rows), so fill it in that layout and hand over its transpose.
+    block = np.full((len(columns), len(symbols), len(index)), np.nan)
+    for position, frame in enumerate(frames.values()):
+        rows = slice(None) if index.equals(frame.index) else index.get_indexer(frame.index)
+        block[:, position, rows] = frame[columns].to_numpy(dtype=float).T
+    labels = pd.MultiIndex.from_product([columns, symbols])
+    return pd.DataFrame(block.reshape(len(labels), len(index)).T, index=index, columns=labels, copy=False)
+
+
+def load_panel(symbols: Sequence[str], config: DataSourceConfig) -> pd.DataFrame:
+    """``build_panel`` of the ``lookback_days`` window of every symbol; symbols that fail to load
+    are logged and left out."""
+
+    from ..utils.data_loader import DataLoader
+
+    frames: Dict[str, pd.DataFrame] = {}
+    for symbol in symbols:
+        try:
+            frame = DataLoader(replace(config, symbol=symbol)).load_historical_data()
+        except Exception as exc:  # pragma: no cover - runtime safety
+            logger.warning("Skipping %s in the scan: %s", symbol, exc)
+            continue
+        if not frame.empty:
+            frames[symbol] = frame
+    return build_panel(frames)
+
+
+def _aligned_groups(panel: pd.DataFrame) -> List[Tuple[Union[slice, np.ndarray], pd.Index]]:
+    """Panel rows and symbols to scan together so that no symbol sees a missing bar as a NaN bar.
+
+    Symbols whose bars are one unbroken run of panel rows share the panel: NaN rows before or
+    after a symbol's bars do not change its indicators. A symbol missing bars inside its history
+    is scanned on the rows it has, together with the symbols that have exactly those rows.
+    """
+
+    symbols = panel["close"].columns
+    present = np.zeros((len(panel), len(symbols)), dtype=bool)
+    for name in panel.columns.unique(level=0):
+        present |= panel[name][symbols].notna().to_numpy()
+    counts = present.sum(axis=0)
+    first = present.argmax(axis=0)
+    last = len(present) - 1 - present[::-1].argmax(axis=0)
+    gapped = (counts > 0) & (last - first + 1 != counts)
+    groups: List[Tuple[Union[slice, np.ndarray], pd.Index]] = []
+    if not gapped.all():
+        groups.append((slice(None), symbols[~gapped]))
+    by_rows: Dict[bytes, List[int]] = {}
+    for position in np.flatnonzero(gapped):
+        by_rows.setdefault(present[:, position].tobytes(), []).append(position)
+    groups.extend((present[:, positions[0]], symbols[positions]) for positions in by_rows.values())
+    return groups
+
+
+def _last_rows(valid: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Per symbol column, the last row with a bar and the one before it (-1 when missing)."""
+
+    rows = np.arange(len(valid))[:, None]
+    marked = np.where(valid, rows, -1)
+    last = marked.max(axis=0, initial=-1)
+    prev = np.where(rows < last, marked, -1).max(axis=0, initial=-1)
+    return last, prev
+
+
+def _pick(values: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    picked = values[np.maximum(rows, 0), np.arange(values.shape[1])]
+    return np.where(rows >= 0, picked, np.nan)
+
+
+def scan_panel(
+    panel: pd.DataFrame, strategies: Sequence[Strategy], cache: Optional[IndicatorCache] = None
+) -> pd.DataFrame:
+    """Current signals of every symbol of ``panel``, one row per (symbol, strategy) that fires.
+
+    Indicators of all strategies are computed in one pass over the whole panel; each symbol is
+    then judged on its own last bar and the one before it, as ``generate_signal`` would on that
+    symbol's bars. Symbols with gaps in their history are computed on their own rows (see
+    ``_aligned_groups``). ``score`` sums the confidence of the symbol's signals in the same
+    direction.
+    """
+
+    if panel.empty:
+        return _ranked(pd.DataFrame(columns=SCAN_COLUMNS))
+    groups = _aligned_groups(panel)
+    if len(groups) == 1 and isinstance(groups[0][0], slice):
+        return _ranked(_panel_signals(panel, strategies, cache))
+    level = panel.columns.get_level_values(1)
+    tables = [
+        _panel_signals(panel.iloc[rows, level.isin(symbols)], strategies, cache) for rows, symbols in groups
+    ]
+    return _ranked(pd.concat([table for table in tables if len(table)] or tables, ignore_index=True))
+
+
+def _panel_signals(
+    panel: pd.DataFrame, strategies: Sequence[Strategy], cache: Optional[IndicatorCache]
+) -> pd.DataFrame:
+    close = panel["close"]
+    symbols = close.columns
+    last, prev = _last_rows(close.notna().to_numpy())
+    # Symbols without any bar (all NaN) have nothing to judge.
+    listed = last >= 0
+    symbols, last, prev = symbols[listed], last[listed], prev[listed]
+    maps = [strategy.indicator_map(running=True) for strategy in strategies]
+    computed = indicator_columns(panel, list(dict.fromkeys(key for mapping in maps for key in mapping.values())), cache)
+
+    rows: Dict[str, Tuple[pd.Series, pd.Series]] = {}
+
+    def at_bars(name: str, wide: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+        if name not in rows:
+            values = wide[symbols].to_numpy(dtype=float)
+            rows[name] = (pd.Series(_pick(values, last), index=symbols), pd.Series(_pick(values, prev), index=symbols))
+        return rows[name]
+
+    bars = {name: at_bars(name, panel[name]) for name in panel.columns.unique(level=0)}
+    timestamps = panel.index[last]
+    signals = []
+    for strategy, mapping in zip(strategies, maps):
+        columns = {**bars, **{column: at_bars(key, computed[key]) for column, key in mapping.items()}}
+        latest = {column: pair[0] for column, pair in columns.items()}
+        previous = {column: pair[1] for column, pair in columns.items()}
+        buy, sell = strategy.conditions(latest, previous)
+        frame = signal_frame(symbols, buy, sell, strategy.confidence, strategy.buy_reason, strategy.sell_reason)
+        frame = frame.assign(symbol=symbols, strategy=strategy.name, timestamp=timestamps, close=latest["close"])
+        signals.append(frame[frame["signal"].notna()])
+    table = pd.concat(signals, ignore_index=True)
+    table["score"] = table.groupby(["symbol", "signal"])["confidence"].transform("sum")
+    return table[SCAN_COLUMNS]
+
+
+def _ranked(table: pd.DataFrame) -> pd.DataFrame:
+    table = table.sort_values(["score", "confidence", "symbol", "strategy"], ascending=[False, False, True, True])
+    table.index = pd.RangeIndex(1, len(table) + 1, name="rank")
+    return table
+
+
+# Per-process state populated once by ``_init_worker``.
+_WORKER: Dict[str, object] = {}
+
+
+def _init_worker(config: DataSourceConfig, strategies: Sequence[Strategy]) -> None:
+    _WORKER.update(config=config, strategies=list(strategies))
+
+
+def _scan_chunk(symbols: Sequence[str]) -> pd.DataFrame:
+    panel = load_panel(symbols, _WORKER["config"])  # type: ignore[arg-type]
+    return scan_panel(panel, _WORKER["strategies"])  # type: ignore[arg-type]
+
+
+def scan(
+    symbols: Sequence[str],
+    config: DataSourceConfig,
+    strategies: Optional[Sequence[Strategy]] = None,
+    workers: int = 0,
+    chunk_size: int = 100,
+) -> pd.DataFrame:
+    """Ranked current signals of ``symbols`` (see ``scan_panel``).
+
+    Symbols are scanned ``chunk_size`` at a time, which bounds the panel held in memory; with
+    ``workers`` > 1 the chunks are loaded and scanned in that many processes.
+    """
+
+    strategies = list(strategies) if strategies is not None else default_strategies()
+    symbols = list(dict.fromkeys(symbols))
+    chunks = [symbols[start : start + max(chunk_size, 1)] for start in range(0, len(symbols), max(chunk_size, 1))]
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)), initializer=_init_worker, initargs=(config, strategies)
+        ) as pool:
+            tables = list(pool.map(_scan_chunk, chunks))
+    else:
+        tables = [scan_panel(load_panel(chunk, config), strategies) for chunk in chunks]
+    # Scores are per symbol, so chunks merge without recomputing them.
+    tables = [table for table in tables if len(table)]
+    if not tables:
+        return _ranked(pd.DataFrame(columns=SCAN_COLUMNS))
+    return _ranked(pd.concat(tables, ignore_index=True))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Scan many symbols for current strategy signals.")
+    parser.add_argument("symbols", nargs="*", help="Symbols to scan (default: ScannerConfig.symbols)")
+    parser.add_argument("--interval", default=DataSourceConfig.interval)
+    parser.add_argument("--lookback-days", type=int, default=DataSourceConfig.lookback_days)
+    parser.add_argument("--workers", type=int, default=ScannerConfig.workers)
+    parser.add_argument("--chunk-size", type=int, default=ScannerConfig.chunk_size)
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    symbols = args.symbols or ScannerConfig().symbols
+    if not symbols:
+        parser.error("no symbols given")
+    config = replace(DataSourceConfig(), interval=args.interval, lookback_days=args.lookback_days)
+    table = scan(symbols, config, workers=args.workers, chunk_size=args.chunk_size)
+    print(table.head(args.top).to_string())
+
+
+if __name__ == "__main__":
+    main()
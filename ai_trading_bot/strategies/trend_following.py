@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, ClassVar, Dict, Mapping, Optional, Tuple
 
 import pandas as pd
 
-from ..indicators.ema_rsi_volume import compute_trend_indicators
-from .base import Strategy, StrategyResult
+from ..indicators.cache import IndicatorCache
+from ..indicators.registry import indicator_columns
+from .base import Strategy, StrategyResult, latest_rows
 
 
 @dataclass
@@ -15,12 +16,20 @@ class TrendFollowingStrategy(Strategy):
     volume_threshold: float = 1.2
     rsi_upper: float = 70
     rsi_lower: float = 30
-
-    def generate_signal(self, data: pd.DataFrame) -> Optional[StrategyResult]:
-        enriched = compute_trend_indicators(data)
-        latest = enriched.iloc[-1]
-        prev = enriched.iloc[-2]
-
+    indicators: ClassVar[Dict[str, str]] = {name: name for name in ("ema_20", "ema_50", "rsi_14", "volume_ma")}
+    confidence: ClassVar[float] = 0.75
+    buy_reason: ClassVar[str] = "EMA bullish crossover with RSI rebound and volume confirmation"
+    sell_reason: ClassVar[str] = "EMA bearish crossover with RSI pullback and volume confirmation"
+
+    def generate_signal(
+        self, data: pd.DataFrame, cache: Optional[IndicatorCache] = None
+    ) -> Optional[StrategyResult]:
+        enriched = latest_rows(data, indicator_columns(data, self.indicator_map(), cache))
+        return self.evaluate(enriched.iloc[-1], enriched.iloc[-2])
+
+    def evaluate(
+        self, latest: Mapping[str, float], prev: Mapping[str, float]
+    ) -> Optional[StrategyResult]:
         ema_bullish = latest["ema_20"] > latest["ema_50"]
         ema_bearish = latest["ema_20"] < latest["ema_50"]
         rsi_rebound_up = prev["rsi_14"] < self.rsi_lower and latest["rsi_14"] > self.rsi_lower
@@ -29,9 +38,17 @@ class TrendFollowingStrategy(Strategy):
         volume_increase = latest["volume"] > self.volume_threshold * latest["volume_ma"]
 
         if ema_bullish and rsi_rebound_up and volume_increase:
-            reason = "EMA bullish crossover with RSI rebound and volume confirmation"
-            return StrategyResult("buy", 0.75, reason)
+            return StrategyResult("buy", self.confidence, self.buy_reason)
         if ema_bearish and rsi_rebound_down and volume_increase:
-            reason = "EMA bearish crossover with RSI pullback and volume confirmation"
-            return StrategyResult("sell", 0.75, reason)
+            return StrategyResult("sell", self.confidence, self.sell_reason)
         return None
+
+    def conditions(self, latest: Mapping[str, Any], prev: Mapping[str, Any]) -> Tuple[Any, Any]:
+        ema_bullish = latest["ema_20"] > latest["ema_50"]
+        ema_bearish = latest["ema_20"] < latest["ema_50"]
+        rsi_rebound_up = (prev["rsi_14"] < self.rsi_lower) & (latest["rsi_14"] > self.rsi_lower)
+        rsi_rebound_down = (prev["rsi_14"] > self.rsi_upper) & (latest["rsi_14"] < self.rsi_upper)
+
+        volume_increase = latest["volume"] > self.volume_threshold * latest["volume_ma"]
+
+        return ema_bullish & rsi_rebound_up & volume_increase, ema_bearish & rsi_rebound_down & volume_increase
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+_META_FILE = "_meta.json"
+_TIMESTAMP = "timestamp"
+_DTYPES = {"float64": np.float64, "float32": np.float32}
+_MAP_ATTEMPTS = 3
+
+
+@dataclass
+class ColumnarCache:
+    """Per-column ``.npy`` files that processes open with ``mmap_mode="r"``.
+
+    Timestamps are stored as int64 nanoseconds since the epoch (UTC) and prices/volumes as
+    float64 or, opt-in, float32. Every reader maps the same files, so concurrent backtest
+    workers, the API server and training jobs share one copy through the OS page cache.
+
+    Each ``write`` fills a new generation directory and then switches ``_meta.json`` to it in one
+    atomic replace, so a reader maps either the old or the new set of columns, never a mix. The
+    previous generation is kept for readers that read the metadata just before the switch.
+    """
+
+    root: Path
+
+    def _series_dir(self, symbol: str, interval: str) -> Path:
+        return self.root / f"symbol={symbol}" / f"interval={interval}" / "columns"
+
+    def metadata(self, symbol: str, interval: str) -> Optional[Dict[str, object]]:
+        meta_path = self._series_dir(symbol, interval) / _META_FILE
+        if not meta_path.exists():
+            return None
+        return json.loads(meta_path.read_text())
+
+    @staticmethod
+    def _generation_dir(series: Path, meta: Mapping[str, object]) -> Path:
+        # Caches written before generations keep their files next to the metadata.
+        generation = meta.get("generation")
+        return series / f"g{int(generation):06d}" if generation is not None else series  # type: ignore[call-overload]
+
+    def write(self, symbol: str, interval: str, df: pd.DataFrame, dtype: str = "float64") -> None:
+        if dtype not in _DTYPES:
+            raise ValueError(f"Unsupported columnar dtype: {dtype}")
+        series = self._series_dir(symbol, interval)
+        current = self.metadata(symbol, interval)
+        generation = int(current.get("generation", 0)) + 1 if current is not None else 1  # type: ignore[call-overload]
+        meta: Dict[str, object] = {"generation": generation}
+        directory = self._generation_dir(series, meta)
+        shutil.rmtree(directory, ignore_errors=True)
+        directory.mkdir(parents=True)
+        index = pd.DatetimeIndex(df.index)
+        tz = str(index.tz) if index.tz is not None else None
+        utc = index.tz_localize("UTC") if tz is None else index.tz_convert("UTC")
+
+        columns: List[str] = list(df.columns)
+        np.save(directory / f"{_TIMESTAMP}.npy", utc.as_unit("ns").asi8)
+        for column in columns:
+            np.save(directory / f"{column}.npy", df[column].to_numpy(dtype=_DTYPES[dtype]))
+        meta.update(
+            rows=len(df),
+            columns=columns,
+            dtype=dtype,
+            tz=tz,
+            index_name=df.index.name,
+            last=utc[-1].isoformat() if len(utc) else None,
+        )
+        self._switch(series, meta)
+
+    def _switch(self, series: Path, meta: Mapping[str, object]) -> None:
+        """Publish ``meta`` atomically and drop generations older than the previous one."""
+
+        tmp_path = series / f".{_META_FILE}.tmp"
+        tmp_path.write_text(json.dumps(meta))
+        os.replace(tmp_path, series / _META_FILE)
+        keep = int(meta["generation"]) - 1  # type: ignore[call-overload]
+        for path in series.glob("g*"):
+            if path.is_dir() and path.name[1:].isdigit() and int(path.name[1:]) < keep:
+                # Open maps of these files stay valid; only new readers no longer find them.
+                shutil.rmtree(path, ignore_errors=True)
+
+    def write_tail(self, symbol: str, interval: str, df: pd.DataFrame, start: int) -> None:
+        """Store ``df`` as the rows from ``start`` on, writing only what changed.
+
+        Stored rows that ``df`` repeats unchanged are left alone and the rows past the stored length
+        are appended to the current files; readers never map beyond the metadata row count, so
+        their views do not change. When ``df`` revises stored rows, the kept rows and ``df`` go to
+        a new generation instead. ``df`` must start at or before the stored length (no gap) and
+        reach at least as far.
+        """
+
+        meta = self.metadata(symbol, interval)
+        if meta is None or list(df.columns) != meta["columns"] or "generation" not in meta:
+            raise ValueError("write_tail needs an existing cache with the same columns")
+        stored = int(meta["rows"])  # type: ignore[call-overload]
+        if start < 1 or start + len(df) < stored:
+            raise ValueError(f"write_tail from row {start} would drop stored rows")
+        if start > stored:
+            raise ValueError(f"write_tail from row {start} would leave a gap after {stored} stored rows")
+        series = self._series_dir(symbol, interval)
+        directory = self._generation_dir(series, meta)
+        dtype = _DTYPES[str(meta["dtype"])]
+        index = pd.DatetimeIndex(df.index)
+        utc = index.tz_localize("UTC") if meta["tz"] is None else index.tz_convert("UTC")
+        values = {_TIMESTAMP: utc.as_unit("ns").asi8, **{column: df[column].to_numpy(dtype=dtype) for column in df.columns}}
+        rows = start + len(df)
+        overlap = stored - start
+        revised = any(
+            not np.array_equal(np.load(directory / f"{name}.npy", mmap_mode="r")[start:stored], column[:overlap], equal_nan=True)
+            for name, column in values.items()
+        )
+        if revised:
+            generation = int(meta["generation"]) + 1  # type: ignore[call-overload]
+            target = self._generation_dir(series, {"generation": generation})
+            shutil.rmtree(target, ignore_errors=True)
+            target.mkdir(parents=True)
+            for name, column in values.items():
+                kept = np.load(directory / f"{name}.npy", mmap_mode="r")
+                out = np.lib.format.open_memmap(target / f"{name}.npy", mode="w+", dtype=column.dtype, shape=(rows,))
+                out[:start] = kept[:start]
+                out[start:] = column
+                out.flush()
+                del out
+            meta["generation"] = generation
+        else:
+            for name, column in values.items():
+                self._append_rows(directory / f"{name}.npy", column[overlap:], stored, rows)
+        meta.update(rows=rows, last=utc[-1].isoformat() if len(utc) else meta["last"])
+        self._switch(series, meta)
+
+    @staticmethod
+    def _append_rows(path: Path, values: np.ndarray, stored: int, rows: int) -> None:
+        """Write ``values`` after the first ``stored`` rows, then grow the header's row count.
+
+        The data lands before the header claims it, so a reader opening the file meanwhile maps
+        either the old or the new length of valid rows.
+        """
+
+        with open(path, "r+b") as handle:
+            version = np.lib.format.read_magic(handle)
+            if version == (1, 0):
+                np.lib.format.read_array_header_1_0(handle)
+            else:
+                np.lib.format.read_array_header_2_0(handle)
+            offset = handle.tell()
+            header = io.BytesIO()
+            fields = {"descr": np.lib.format.dtype_to_descr(values.dtype), "fortran_order": False, "shape": (rows,)}
+            if version == (1, 0):
+                np.lib.format.write_array_header_1_0(header, fields)
+            else:
+                np.lib.format.write_array_header_2_0(header, fields)
+            if header.tell() != offset:
+                raise ValueError(f"Header of {path} cannot grow in place")
+            handle.seek(offset + stored * values.dtype.itemsize)
+            handle.write(np.ascontiguousarray(values).tobytes())
+            handle.truncate()
+            handle.flush()
+            handle.seek(0)
+            handle.write(header.getvalue())
+
+    def arrays(self, symbol: str, interval: str, columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Read-only memory-mapped arrays, including ``timestamp`` as int64 epoch nanoseconds."""
+
+        return self._mapped(symbol, interval, columns)[1]
+
+    def _mapped(
+        self, symbol: str, interval: str, columns: Optional[Sequence[str]]
+    ) -> Tuple[Dict[str, object], Dict[str, np.ndarray]]:
+        for _ in range(_MAP_ATTEMPTS - 1):
+            meta = self._require(symbol, interval)
+            try:
+                return meta, self._arrays(symbol, interval, meta, columns)
+            except FileNotFoundError:
+                # Writers moved two generations on since the metadata read; read it again.
+                continue
+        meta = self._require(symbol, interval)
+        return meta, self._arrays(symbol, interval, meta, columns)
+
+    def _require(self, symbol: str, interval: str) -> Dict[str, object]:
+        meta = self.metadata(symbol, interval)
+        if meta is None:
+            raise FileNotFoundError(f"No columnar cache for {symbol} {interval} under {self.root}")
+        return meta
+
+    def _arrays(
+        self, symbol: str, interval: str, meta: Mapping[str, object], columns: Optional[Sequence[str]]
+    ) -> Dict[str, np.ndarray]:
+        # Every file comes from the generation of this one metadata read.
+        directory = self._generation_dir(self._series_dir(symbol, interval), meta)
+        names = [_TIMESTAMP, *(columns or meta["columns"])]  # type: ignore[misc]
+        # The metadata row count is written last, so it bounds a tail update still in progress.
+        rows = int(meta["rows"])  # type: ignore[call-overload]
+        return {name: np.load(directory / f"{name}.npy", mmap_mode="r")[:rows] for name in names}
+
+    def frame(self, symbol: str, interval: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """DataFrame whose columns are views on the mapped files (no copy of the data)."""
+
+        meta, arrays = self._mapped(symbol, interval, columns)
+        timestamps = arrays.pop(_TIMESTAMP)
+        index = pd.DatetimeIndex(np.asarray(timestamps).view("datetime64[ns]"), name=meta["index_name"])  # type: ignore[index]
+        tz = meta["tz"]  # type: ignore[index]
+        index = index.tz_localize("UTC").tz_convert(tz) if tz is not None else index
+        return pd.DataFrame(arrays, index=index, copy=False)
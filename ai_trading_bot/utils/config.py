@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 
 @dataclass
@@ -11,11 +11,28 @@ class DataSourceConfig:
     interval: str = "1h"
     lookback_days: int = 365
     cache_dir: Path = Path("ai_trading_bot/data/cache")
+    columnar_cache: bool = False
+    columnar_dtype: str = "float64"
 
 
 @dataclass
 class ModelConfig:
     model_name: str = "random_forest"
+    model_dir: Path = Path("ai_trading_bot/data/models")
+    compiled_inference: bool = False
+    # Reuse persisted feature matrices (``<cache_dir>/features``) and compute only new bars. Their
+    # cumulative columns (OBV, delta volume, VWAP) start at the first stored bar, not at the data.
+    feature_store: bool = False
+    # "fixed": return over ``label_horizon`` bars against ``label_threshold``; "triple_barrier":
+    # first touch of profit-take/stop-loss barriers within ``label_horizon`` bars. Barrier widths
+    # are multiples of the EWM return volatility, or plain returns when the span is ``None``.
+    label_method: str = "fixed"
+    label_horizon: int = 3
+    label_threshold: float = 0.002
+    barrier_profit_take: float = 2.0
+    barrier_stop_loss: float = 2.0
+    barrier_volatility_span: Optional[int] = 100
+    barrier_timeout: str = "hold"
     params: Dict[str, object] = field(default_factory=lambda: {
         "n_estimators": 200,
         "max_depth": 6,
@@ -28,6 +45,15 @@ class SentimentConfig:
     enable_finbert: bool = True
     enable_vader: bool = True
     min_confidence: float = 0.55
+    finbert_batch_size: int = 32
+    finbert_quantize: bool = False
+    cache_size: int = 10_000
+    # Per-bar headline features for the ML model (files with timestamp/text columns).
+    include_features: bool = False
+    headline_paths: List[Path] = field(default_factory=list)
+    feature_scorer: str = "vader"
+    feature_window: str = "24h"
+    feature_halflife: str = "6h"
 
 
 @dataclass
@@ -35,6 +61,20 @@ class BacktestConfig:
     initial_cash: float = 10_000.0
     commission: float = 0.00075
     risk_per_trade: float = 0.01
+    engine: str = "backtrader"
+
+
+@dataclass
+class LoggingConfig:
+    level: str = "INFO"
+    log_dir: Optional[Path] = Path("ai_trading_bot/data/logs")
+    console: bool = True
+    max_bytes: int = 2_000_000
+    backup_count: int = 3
+    # Per-bar messages (``get_bar_logger``): records per second per message, burst, 1-in-N sampling.
+    bar_rate: Optional[float] = 20.0
+    bar_burst: int = 50
+    bar_sample_every: int = 1
 
 
 @dataclass
@@ -43,6 +83,33 @@ class APIConfig:
     exchange: str = "binance"
     api_key: Optional[str] = None
     api_secret: Optional[str] = None
+    # Worker processes for ``POST /backtests``; further jobs wait in the pool's queue.
+    backtest_workers: int = 2
+
+
+@dataclass
+class LiveConfig:
+    # Replay speed multiplier for the Parquet replay feed; ``None`` replays as fast as possible.
+    replay_speed: Optional[float] = None
+    replay_start: Optional[str] = None
+    replay_end: Optional[str] = None
+    poll_seconds: float = 60.0
+    # Bars before strategies are evaluated, as in the backtest ``warmup``.
+    warmup_bars: int = 50
+    # Only act on strategy signals the ML model agrees with (when a model is loaded).
+    require_ml_confirmation: bool = False
+    # Rolling window of per-bar latencies kept for the metrics summary.
+    latency_window: int = 1000
+
+
+@dataclass
+class ScannerConfig:
+    # Symbols of the multi-symbol scan; ``TradingBot.scan`` falls back to ``data.symbol``.
+    symbols: List[str] = field(default_factory=list)
+    # Processes for chunks of symbols; 0 or 1 scans in this process.
+    workers: int = 0
+    # Symbols per panel, which bounds the memory one scan pass holds.
+    chunk_size: int = 100
 
 
 @dataclass
@@ -52,7 +119,11 @@ class TradingBotConfig:
     sentiment: SentimentConfig = field(default_factory=SentimentConfig)
     backtest: BacktestConfig = field(default_factory=BacktestConfig)
     api: APIConfig = field(default_factory=APIConfig)
+    logging: LoggingConfig = field(default_factory=LoggingConfig)
+    live: LiveConfig = field(default_factory=LiveConfig)
+    scanner: ScannerConfig = field(default_factory=ScannerConfig)
     enable_llm: bool = False
+    indicator_cache_bytes: int = 256_000_000
 
 
 DEFAULT_CONFIG = TradingBotConfig()
@@ -1,26 +1,66 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 
-try:
-    import yfinance as yf
-except ImportError:  # pragma: no cover - optional dependency
-    yf = None
-
+from .columnar_cache import ColumnarCache
 from .config import DataSourceConfig
 from .logger import get_logger
+from .market_store import MarketDataStore, TimeLike, _to_utc
 
 logger = get_logger(__name__)
 
+# (symbol, provider interval, start, end) -> OHLCV frame with lower-case columns
+Fetcher = Callable[[str, str, datetime, datetime], pd.DataFrame]
+
+_INTERVALS = {
+    "1m": "1m",
+    "5m": "5m",
+    "15m": "15m",
+    "30m": "30m",
+    "1h": "60m",
+    "4h": "4h",
+    "1d": "1d",
+}
+
+
+def yfinance_fetcher(symbol: str, interval: str, start: datetime, end: datetime) -> pd.DataFrame:
+    try:
+        import yfinance as yf
+    except ImportError:  # pragma: no cover - optional dependency
+        raise ImportError(
+            "yfinance is required to download data. Please install it via `pip install yfinance`."
+        ) from None
+    ticker = yf.Ticker(symbol)
+    df = ticker.history(start=start, end=end, interval=interval)
+    return df.rename(
+        columns={
+            "Open": "open",
+            "High": "high",
+            "Low": "low",
+            "Close": "close",
+            "Volume": "volume",
+        }
+    )
+
 
 @dataclass
 class DataLoader:
     config: DataSourceConfig
+    fetcher: Fetcher = field(default=yfinance_fetcher, repr=False)
+
+    @property
+    def store(self) -> MarketDataStore:
+        return MarketDataStore(self.config.cache_dir / "store")
+
+    @property
+    def columnar(self) -> ColumnarCache:
+        return ColumnarCache(self.config.cache_dir / "columnar")
 
     def _get_cache_path(self) -> Path:
         cache_dir = self.config.cache_dir
@@ -28,58 +68,139 @@ class DataLoader:
         filename = f"{self.config.symbol}_{self.config.interval}.parquet"
         return cache_dir / filename
 
-    def load_historical_data(self, force_refresh: bool = False) -> pd.DataFrame:
+    def _download(self, start: datetime, end: datetime) -> pd.DataFrame:
+        logger.info(
+            "Downloading historical data for %s from %s to %s",
+            self.config.symbol,
+            start,
+            end,
+        )
+        df = self.fetcher(self.config.symbol, self._map_interval(), start, end)
+        df.index.name = "timestamp"
+        return df
+
+    def _import_legacy_cache(self) -> None:
         cache_path = self._get_cache_path()
-        if cache_path.exists() and not force_refresh:
-            logger.info("Loading cached data from %s", cache_path)
-            return pd.read_parquet(cache_path)
+        if cache_path.exists() and self.store.last_timestamp(self.config.symbol, self.config.interval) is None:
+            logger.info("Importing cached data from %s into the partitioned store", cache_path)
+            self.store.write(self.config.symbol, self.config.interval, pd.read_parquet(cache_path))
 
-        if yf is None:
-            raise ImportError(
-                "yfinance is required to download data. Please install it via `pip install yfinance`."
-            )
+    def load_historical_data(self, force_refresh: bool = False, update: bool = False) -> pd.DataFrame:
+        """Return the ``lookback_days`` window from the store.
 
+        The store is filled on first use; ``update`` appends bars after the last stored one and
+        ``force_refresh`` downloads the whole window again.
+        """
+
+        symbol, interval = self.config.symbol, self.config.interval
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=self.config.lookback_days)
-        logger.info(
-            "Downloading historical data for %s from %s to %s",
-            self.config.symbol,
-            start_date,
-            end_date,
-        )
-        ticker = yf.Ticker(self.config.symbol)
-        df = ticker.history(start=start_date, end=end_date, interval=self._map_interval())
+
+        self._import_legacy_cache()
+        if force_refresh or self.store.last_timestamp(symbol, interval) is None:
+            df = self._download(start_date, end_date)
+            if df.empty:
+                raise ValueError("No data returned from yfinance. Check symbol and interval.")
+            self.store.write(symbol, interval, df)
+        elif update:
+            self.update_historical_data()
+        else:
+            logger.info("Loading cached data for %s %s from %s", symbol, interval, self.store.root)
+
+        last = self.store.last_timestamp(symbol, interval)
+        assert last is not None
+        start = last - pd.Timedelta(days=self.config.lookback_days)
+        if self.config.columnar_cache:
+            frame = self.load_columnar()
+            # Positional slicing keeps the columns as views on the memory maps.
+            start = start.tz_convert(frame.index.tz) if frame.index.tz is not None else start.tz_convert(None)
+            return frame.iloc[frame.index.searchsorted(start) :]
+        return self.store.read(symbol, interval, start=start)
+
+    def update_historical_data(self, now: Optional[datetime] = None) -> int:
+        """Fetch and append only the bars after the last stored timestamp; returns the rows added."""
+
+        symbol, interval = self.config.symbol, self.config.interval
+        last = self.store.last_timestamp(symbol, interval)
+        end_date = now or datetime.utcnow()
+        if last is None:
+            start_date = end_date - timedelta(days=self.config.lookback_days)
+        else:
+            start_date = last.tz_convert("UTC").tz_localize(None).to_pydatetime()
+        df = self._download(start_date, end_date)
+        if last is not None and not df.empty:
+            index = pd.DatetimeIndex(df.index)
+            stored_last = last.tz_convert(index.tz) if index.tz is not None else last.tz_convert(None)
+            df = df[index > stored_last]
         if df.empty:
-            raise ValueError("No data returned from yfinance. Check symbol and interval.")
-
-        df = df.rename(
-            columns={
-                "Open": "open",
-                "High": "high",
-                "Low": "low",
-                "Close": "close",
-                "Volume": "volume",
-            }
+            return 0
+        added = self.store.write(symbol, interval, df)
+        logger.info("Appended %d new bars for %s %s", added, symbol, interval)
+        return added
+
+    def load_range(
+        self,
+        start: Optional[TimeLike] = None,
+        end: Optional[TimeLike] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        self._import_legacy_cache()
+        return self.store.read(self.config.symbol, self.config.interval, start=start, end=end, columns=columns)
+
+    def sync_columnar(self) -> None:
+        """Rewrite the memory-mapped columns when the Parquet store has moved past them."""
+
+        symbol, interval = self.config.symbol, self.config.interval
+        self._import_legacy_cache()
+        last = self.store.last_timestamp(symbol, interval)
+        if last is None:
+            raise FileNotFoundError(f"No stored data for {symbol} {interval}; load historical data first")
+        meta = self.columnar.metadata(symbol, interval)
+        if (
+            meta is not None
+            and meta["last"] == last.isoformat()
+            and meta["dtype"] == self.config.columnar_dtype
+        ):
+            return
+        logger.info("Writing %s columnar cache for %s %s", self.config.columnar_dtype, symbol, interval)
+        self.columnar.write(symbol, interval, self.store.read(symbol, interval), dtype=self.config.columnar_dtype)
+
+    def load_columnar(self, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """DataFrame backed by read-only memory maps that all processes share."""
+
+        self.sync_columnar()
+        return self.columnar.frame(self.config.symbol, self.config.interval, columns)
+
+    def load_columnar_arrays(self, columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Zero-copy NumPy views, including ``timestamp`` as int64 epoch nanoseconds."""
+
+        self.sync_columnar()
+        return self.columnar.arrays(self.config.symbol, self.config.interval, columns)
+
+    def is_stale(self, now: Optional[TimeLike] = None) -> bool:
+        """True when the newest stored bar is more than one interval old (metadata only)."""
+
+        return self.store.is_stale(
+            self.config.symbol,
+            self.config.interval,
+            max_age=pd.Timedelta(self.config.interval.replace("m", "min")),
+            now=now,
         )
-        df.index.name = "timestamp"
-        df.to_parquet(cache_path)
-        return df
 
     def _map_interval(self) -> str:
-        mapping = {
-            "1m": "1m",
-            "5m": "5m",
-            "15m": "15m",
-            "30m": "30m",
-            "1h": "60m",
-            "4h": "4h",
-            "1d": "1d",
-        }
-        interval = mapping.get(self.config.interval)
+        interval = _INTERVALS.get(self.config.interval)
         if interval is None:
             raise ValueError(f"Unsupported interval: {self.config.interval}")
         return interval
 
     def load_live_data(self) -> pd.DataFrame:
-        logger.warning("Live data loading is not implemented in the offline prototype.")
-        return pd.DataFrame()
+        """Append the bars closed since the last stored one and return only those bars."""
+
+        symbol, interval = self.config.symbol, self.config.interval
+        last = self.store.last_timestamp(symbol, interval)
+        if not self.update_historical_data():
+            return pd.DataFrame(columns=["open", "high", "low", "close", "volume"])
+        frame = self.store.read(symbol, interval, start=last)
+        if last is not None and len(frame) and _to_utc(frame.index[0]) == last:
+            frame = frame.iloc[1:]
+        return frame
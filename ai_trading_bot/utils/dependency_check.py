@@ -11,19 +11,6 @@ _HELP_MESSAGE = (
     "Activate your virtual environment and run `python -m pip install -r requirements.txt`.\n"
     "If you previously installed optional ML libraries, ensure you are on Python 3.10-3.12 "
     "or install them via `python -m pip install -r requirements-ml.txt`."
-
-"""Runtime dependency checks for core modules."""
-
-from __future__ import annotations
-
-from importlib import util as importlib_util
-from typing import Iterable
-
-_HELP_MESSAGE = (
-    "Missing required packages: {missing}.\n"
-    "Activate your virtual environment and run `pip install -r requirements.txt`.\n"
-    "If you previously installed optional ML libraries, ensure you are on Python 3.10-3.12 "
-    "or install them via `pip install -r requirements-ml.txt`."
 )
 
 _PYTHON_HELP = (
@@ -47,7 +34,6 @@ def ensure_python_version(
         raise SystemExit(_PYTHON_HELP.format(min_ver=min_str, max_ver=max_str))
 
 
-
 def ensure_required_packages(packages: Iterable[str]) -> None:
     """Exit early with a helpful message when core dependencies are absent."""
 
@@ -55,3 +41,9 @@ def ensure_required_packages(packages: Iterable[str]) -> None:
     if missing:
         formatted = ", ".join(sorted(set(missing)))
         raise SystemExit(_HELP_MESSAGE.format(missing=formatted))
+
+
+def is_installed(package: str) -> bool:
+    """Whether ``package`` can be imported, without importing it."""
+
+    return importlib_util.find_spec(package) is not None
@@ -0,0 +1,144 @@
+"""Startup import-time benchmark built on ``python -X importtime``.
+
+Run ``python -m ai_trading_bot.utils.import_benchmark`` in CI: it exits non-zero when importing a
+module takes longer than its budget or pulls in one of the heavy packages that must stay lazy.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Budgets are generous multiples of the measured cost, so only real regressions trip them.
+DEFAULT_BUDGETS_MS = {
+    "ai_trading_bot.main": 150.0,
+    "ai_trading_bot.utils.config": 100.0,
+    # The API needs FastAPI and pandas; the budget catches backtrader or the ML stack coming back.
+    "ai_trading_bot.api.server": 2500.0,
+}
+
+# Packages that take hundreds of milliseconds or more and must only load on first use.
+HEAVY_PACKAGES = (
+    "backtrader",
+    "fastapi",
+    "langchain",
+    "numpy",
+    "optuna",
+    "pandas",
+    "scipy",
+    "sklearn",
+    "torch",
+    "transformers",
+    "yfinance",
+)
+
+# Heavy packages a module needs by design; any other heavy import still fails its check.
+ALLOWED_HEAVY = {
+    "ai_trading_bot.api.server": ("fastapi", "numpy", "pandas"),
+}
+
+_PREFIX = "import time:"
+
+
+@dataclass
+class ImportProfile:
+    module: str
+    total_ms: float
+    # Top-level package -> cumulative milliseconds, and module -> self milliseconds.
+    packages: Dict[str, float]
+    self_ms: Dict[str, float]
+
+    def heavy_imports(self, heavy: Sequence[str] = HEAVY_PACKAGES) -> List[str]:
+        return sorted(name for name in self.packages if name in heavy)
+
+    def slowest(self, count: int = 10) -> List[Tuple[str, float]]:
+        return sorted(self.self_ms.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def _parse(module: str, stderr: str) -> ImportProfile:
+    packages: Dict[str, float] = {}
+    self_ms: Dict[str, float] = {}
+    total_ms = 0.0
+    for line in stderr.splitlines():
+        if not line.startswith(_PREFIX) or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len(_PREFIX) :].split("|", 2)
+        depth = len(name) - len(name.lstrip())
+        name = name.strip()
+        self_ms[name] = int(self_us) / 1000.0
+        top = name.split(".")[0]
+        if depth == 1:
+            packages[top] = packages.get(top, 0.0) + int(cumulative_us) / 1000.0
+        else:
+            packages.setdefault(top, 0.0)
+        if name == module:
+            total_ms = int(cumulative_us) / 1000.0
+    return ImportProfile(module=module, total_ms=total_ms, packages=packages, self_ms=self_ms)
+
+
+def profile_import(module: str, runs: int = 5, python: str = sys.executable) -> ImportProfile:
+    """Import ``module`` in ``runs`` fresh interpreters and keep the fastest profile.
+
+    The fastest run is the least disturbed by disk and scheduler noise, which keeps the budget
+    check stable on shared CI machines.
+    """
+
+    root = Path(__file__).resolve().parents[2]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(root), os.environ.get("PYTHONPATH")])))
+    best: Optional[ImportProfile] = None
+    for _ in range(runs):
+        completed = subprocess.run(
+            [python, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=root,
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+        profile = _parse(module, completed.stderr)
+        if best is None or profile.total_ms < best.total_ms:
+            best = profile
+    assert best is not None
+    return best
+
+
+def check(budgets: Dict[str, float], runs: int = 5, top: int = 10) -> bool:
+    ok = True
+    for module, budget in budgets.items():
+        profile = profile_import(module, runs=runs)
+        heavy = [name for name in profile.heavy_imports() if name not in ALLOWED_HEAVY.get(module, ())]
+        status = "ok" if profile.total_ms <= budget and not heavy else "FAIL"
+        print(f"{module}: {profile.total_ms:.1f} ms (budget {budget:.0f} ms) {status}")
+        if heavy:
+            print(f"  eagerly imports: {', '.join(heavy)}")
+        if status == "FAIL":
+            ok = False
+            for name, millis in profile.slowest(top):
+                print(f"  {millis:8.1f} ms  {name}")
+    return ok
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Fail when module import time exceeds its budget.")
+    parser.add_argument("--module", action="append", default=None, help="module to profile (repeatable)")
+    parser.add_argument("--budget-ms", type=float, default=None, help="budget for every --module")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="slowest modules listed on failure")
+    args = parser.parse_args(argv)
+
+    if args.module:
+        budgets = {module: args.budget_ms or DEFAULT_BUDGETS_MS.get(module, 150.0) for module in args.module}
+    else:
+        budgets = dict(DEFAULT_BUDGETS_MS)
+    if not check(budgets, runs=args.runs, top=args.top):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
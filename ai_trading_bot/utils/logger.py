@@ -1,38 +1,207 @@
 from __future__ import annotations
 
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
-from pathlib import Path
-from typing import Optional
+import os
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Callable, Dict, List, Optional, Tuple
 
+from .config import LoggingConfig
 
-_LOGGER: Optional[logging.Logger] = None
+PACKAGE = "ai_trading_bot"
+_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
 
+_LISTENER: Optional[QueueListener] = None
+_HANDLER: Optional[QueueHandler] = None
+_CONFIG = LoggingConfig()
+_LOCK = threading.Lock()
 
-def get_logger(name: str = "ai_trading_bot", log_level: int = logging.INFO) -> logging.Logger:
-    global _LOGGER
 
-    if _LOGGER is not None:
-        return _LOGGER
+class RateLimitFilter(logging.Filter):
+    """Token bucket plus 1-in-N sampling per logger and message template.
 
-    logger = logging.getLogger(name)
-    logger.setLevel(log_level)
+    ``rate`` records per second may pass on average with bursts of up to ``burst``; ``None``
+    disables the bucket. The next record that passes reports how many similar ones were dropped.
+    """
 
-    log_dir = Path("ai_trading_bot/data/logs")
-    log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / "trading_bot.log"
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: int = 50,
+        sample_every: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__()
+        self.clock = clock
+        self._state: Dict[Tuple[str, object], List[float]] = {}
+        self._lock = threading.Lock()
+        self.configure(rate, burst, sample_every)
 
-    formatter = logging.Formatter(
-        "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
-    )
+    def configure(self, rate: Optional[float], burst: int, sample_every: int) -> None:
+        with self._lock:
+            self.rate = rate
+            self.burst = max(burst, 1)
+            self.sample_every = max(sample_every, 1)
+            self._state.clear()
 
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.name, record.msg)
+        now = self.clock()
+        with self._lock:
+            # tokens, last refill, records seen, records suppressed
+            state = self._state.setdefault(key, [float(self.burst), now, 0.0, 0.0])
+            state[2] += 1
+            allowed = (state[2] - 1) % self.sample_every == 0
+            if allowed and self.rate is not None:
+                state[0] = min(float(self.burst), state[0] + (now - state[1]) * self.rate)
+                state[1] = now
+                allowed = state[0] >= 1.0
+                if allowed:
+                    state[0] -= 1.0
+            if not allowed:
+                state[3] += 1
+                return False
+            suppressed, state[3] = int(state[3]), 0.0
+        if suppressed:
+            # Render the message now: appending to the template would break on a literal ``%``
+            # in an already formatted message, and ``args`` may be a mapping.
+            record.msg = f"{record.getMessage()} ({suppressed} similar suppressed)"
+            record.args = ()
+        return True
 
-    file_handler = RotatingFileHandler(log_file, maxBytes=2_000_000, backupCount=3)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
 
-    _LOGGER = logger
+_BAR_FILTER = RateLimitFilter()
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Enqueue records as they are; the listener thread merges ``args`` and formats them.
+
+    Arguments are therefore rendered slightly later than the call; pass values rather than
+    objects that the caller keeps mutating.
+    """
+
+    def __init__(self, records: "queue.SimpleQueue[logging.LogRecord]") -> None:
+        super().__init__(records)
+        self.pid = os.getpid()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.pid != os.getpid():
+            # Forked child: the writer thread did not survive fork(), start this process's own.
+            handler = _restart_in_child(self)
+            handler.emit(record)
+            return
+        super().emit(record)
+
+
+def configure_logging(config: Optional[LoggingConfig] = None) -> None:
+    """(Re)build the package logger: callers enqueue, a background thread writes.
+
+    Console and rotating-file output run on a ``QueueListener`` thread, so a log call on a hot
+    path costs a record allocation and a queue put.
+    """
+
+    global _LISTENER, _HANDLER, _CONFIG
+    with _LOCK:
+        _CONFIG = config or _CONFIG
+        package_logger = logging.getLogger(PACKAGE)
+        if _LISTENER is not None:
+            _LISTENER.stop()
+            for handler in _LISTENER.handlers:
+                handler.close()
+        if _HANDLER is not None:
+            package_logger.removeHandler(_HANDLER)
+
+        formatter = logging.Formatter(_FORMAT)
+        handlers: List[logging.Handler] = []
+        if _CONFIG.console:
+            handlers.append(logging.StreamHandler(sys.stderr))
+        if _CONFIG.log_dir is not None:
+            _CONFIG.log_dir.mkdir(parents=True, exist_ok=True)
+            handlers.append(
+                RotatingFileHandler(
+                    _CONFIG.log_dir / "trading_bot.log",
+                    maxBytes=_CONFIG.max_bytes,
+                    backupCount=_CONFIG.backup_count,
+                )
+            )
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        _HANDLER = _DeferredQueueHandler(records)
+        package_logger.addHandler(_HANDLER)
+        package_logger.setLevel(_CONFIG.level)
+        _LISTENER = QueueListener(records, *handlers, respect_handler_level=True)
+        _LISTENER.start()
+        _BAR_FILTER.configure(_CONFIG.bar_rate, _CONFIG.bar_burst, _CONFIG.bar_sample_every)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records, stop the writer thread and close its handlers."""
+
+    global _LISTENER
+    with _LOCK:
+        if _LISTENER is not None:
+            _LISTENER.stop()
+            for handler in _LISTENER.handlers:
+                handler.close()
+            _LISTENER = None
+
+
+def _restart_in_child(stale: QueueHandler) -> QueueHandler:
+    global _LISTENER
+    with _LOCK:
+        if _HANDLER is not stale and _HANDLER is not None:
+            return _HANDLER
+        _LISTENER = None
+    configure_logging()
+    # Forked workers leave through os._exit(), which skips atexit but runs these finalizers.
+    from multiprocessing import util
+
+    util.Finalize(None, shutdown_logging, exitpriority=10)
+    assert _HANDLER is not None
+    return _HANDLER
+
+
+def _reset_locks_after_fork() -> None:
+    # Another thread may have held a lock at fork time; the child gets fresh ones.
+    global _LOCK
+    _LOCK = threading.Lock()
+    _BAR_FILTER._lock = threading.Lock()
+
+
+atexit.register(shutdown_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_locks_after_fork)
+
+
+def _qualified(name: str) -> str:
+    if name == PACKAGE or name.startswith(f"{PACKAGE}."):
+        return name
+    # ``__main__`` and other outside names still go through the package handlers.
+    return f"{PACKAGE}.{name}"
+
+
+def get_logger(name: str = PACKAGE, log_level: Optional[int] = None) -> logging.Logger:
+    if _LISTENER is None:
+        configure_logging()
+    logger = logging.getLogger(_qualified(name))
+    if log_level is not None:
+        logger.setLevel(log_level)
+    return logger
+
+
+def get_bar_logger(name: str) -> logging.Logger:
+    """Child logger for per-bar messages, sampled and rate limited per ``LoggingConfig``."""
+
+    logger = get_logger(f"{_qualified(name)}.bars")
+    if _BAR_FILTER not in logger.filters:
+        logger.addFilter(_BAR_FILTER)
     return logger
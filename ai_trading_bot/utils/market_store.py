@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import pandas as pd
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+TimeLike = Union[str, datetime, pd.Timestamp]
+
+_DATA_FILE = "data.parquet"
+_META_FILE = "_meta.json"
+
+
+def _to_utc(value: TimeLike) -> pd.Timestamp:
+    stamp = pd.Timestamp(value)
+    return stamp.tz_localize("UTC") if stamp.tzinfo is None else stamp.tz_convert("UTC")
+
+
+@dataclass(frozen=True)
+class PartitionMeta:
+    month: str
+    rows: int
+    first: pd.Timestamp
+    last: pd.Timestamp
+    columns: List[str]
+    tz: Optional[str]
+    written_at: pd.Timestamp
+
+    def to_json(self) -> Dict[str, object]:
+        return {
+            "month": self.month,
+            "rows": self.rows,
+            "first": self.first.isoformat(),
+            "last": self.last.isoformat(),
+            "columns": self.columns,
+            "tz": self.tz,
+            "written_at": self.written_at.isoformat(),
+        }
+
+    @classmethod
+    def from_json(cls, payload: Dict[str, object]) -> "PartitionMeta":
+        return cls(
+            month=str(payload["month"]),
+            rows=int(payload["rows"]),  # type: ignore[arg-type]
+            first=pd.Timestamp(payload["first"]),
+            last=pd.Timestamp(payload["last"]),
+            columns=list(payload["columns"]),  # type: ignore[arg-type]
+            tz=payload.get("tz"),  # type: ignore[arg-type]
+            written_at=pd.Timestamp(payload["written_at"]),
+        )
+
+
+@dataclass
+class MarketDataStore:
+    """Parquet store partitioned as ``symbol=<s>/interval=<i>/month=<YYYY-MM>``.
+
+    Timestamps are stored in UTC and converted back to the timezone of the first write on read.
+    Every partition carries a ``_meta.json`` sidecar (row count, first/last timestamp, columns),
+    so range pruning and staleness checks never open the data files.
+    """
+
+    root: Path
+
+    def _series_dir(self, symbol: str, interval: str) -> Path:
+        return self.root / f"symbol={symbol}" / f"interval={interval}"
+
+    def partitions(self, symbol: str, interval: str) -> List[PartitionMeta]:
+        base = self._series_dir(symbol, interval)
+        if not base.exists():
+            return []
+        metas = []
+        for meta_path in sorted(base.glob(f"month=*/{_META_FILE}")):
+            metas.append(PartitionMeta.from_json(json.loads(meta_path.read_text())))
+        return metas
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[pd.Timestamp]:
+        metas = self.partitions(symbol, interval)
+        return metas[-1].last if metas else None
+
+    def is_stale(self, symbol: str, interval: str, max_age: pd.Timedelta, now: Optional[TimeLike] = None) -> bool:
+        last = self.last_timestamp(symbol, interval)
+        if last is None:
+            return True
+        current = _to_utc(now) if now is not None else pd.Timestamp.now(tz="UTC")
+        return current - last > max_age
+
+    def write(self, symbol: str, interval: str, df: pd.DataFrame) -> int:
+        """Merge ``df`` into its month partitions; later rows win on duplicate timestamps."""
+
+        if df.empty:
+            return 0
+        index = pd.DatetimeIndex(df.index)
+        tz = str(index.tz) if index.tz is not None else None
+        existing = self.partitions(symbol, interval)
+        if existing and existing[0].tz != tz:
+            raise ValueError(f"Store for {symbol} {interval} holds {existing[0].tz} timestamps, got {tz}")
+
+        utc = df.copy()
+        utc.index = index.tz_localize("UTC") if tz is None else index.tz_convert("UTC")
+        utc.index.name = "timestamp"
+        months = utc.index.strftime("%Y-%m")
+        for month, chunk in utc.groupby(months, sort=True):
+            self._write_partition(symbol, interval, str(month), chunk, tz)
+        return len(utc)
+
+    def _write_partition(self, symbol: str, interval: str, month: str, chunk: pd.DataFrame, tz: Optional[str]) -> None:
+        directory = self._series_dir(symbol, interval) / f"month={month}"
+        directory.mkdir(parents=True, exist_ok=True)
+        data_path = directory / _DATA_FILE
+        if data_path.exists():
+            current = pd.read_parquet(data_path)
+            merged = pd.concat([current, chunk])
+            # Pure appends keep the order, so only overlapping writes pay for dedupe and sort.
+            if chunk.index[0] <= current.index[-1]:
+                merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+            chunk = merged
+        else:
+            chunk = chunk[~chunk.index.duplicated(keep="last")].sort_index()
+
+        tmp_path = directory / f".{_DATA_FILE}.tmp"
+        chunk.to_parquet(tmp_path)
+        os.replace(tmp_path, data_path)
+        meta = PartitionMeta(
+            month=month,
+            rows=len(chunk),
+            first=chunk.index[0],
+            last=chunk.index[-1],
+            columns=list(chunk.columns),
+            tz=tz,
+            written_at=pd.Timestamp(datetime.now(timezone.utc)),
+        )
+        (directory / _META_FILE).write_text(json.dumps(meta.to_json()))
+
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        start: Optional[TimeLike] = None,
+        end: Optional[TimeLike] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """Read ``[start, end]`` restricted to ``columns``, opening only overlapping partitions."""
+
+        lower = _to_utc(start) if start is not None else None
+        upper = _to_utc(end) if end is not None else None
+        metas = [
+            meta
+            for meta in self.partitions(symbol, interval)
+            if (lower is None or meta.last >= lower) and (upper is None or meta.first <= upper)
+        ]
+        if not metas:
+            return pd.DataFrame(columns=list(columns) if columns else None)
+
+        filters = []
+        if lower is not None:
+            filters.append(("timestamp", ">=", lower))
+        if upper is not None:
+            filters.append(("timestamp", "<=", upper))
+        base = self._series_dir(symbol, interval)
+        frames = [
+            pd.read_parquet(
+                base / f"month={meta.month}" / _DATA_FILE,
+                columns=list(columns) if columns else None,
+                filters=filters or None,
+            )
+            for meta in metas
+        ]
+        result = pd.concat(frames) if len(frames) > 1 else frames[0]
+        tz = metas[0].tz
+        result.index = result.index.tz_convert(tz) if tz is not None else result.index.tz_convert(None)
+        return result
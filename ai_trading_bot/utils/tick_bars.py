@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+BAR_KINDS = ("time", "volume", "tick")
+BAR_COLUMNS = ["open", "high", "low", "close", "volume", "buy_volume", "sell_volume", "delta", "trades"]
+FOOTPRINT_COLUMNS = ["bar", "price", "buy_volume", "sell_volume"]
+
+# Aggressor side spellings; anything else (or a missing side column) falls back to the tick rule.
+_SIDE_SIGNS = {"buy": 1, "b": 1, "sell": -1, "s": -1}
+
+
+def read_ticks(path: Path, chunk_rows: int = 5_000_000, columns: Optional[Sequence[str]] = None) -> Iterator[pd.DataFrame]:
+    """Stream a CSV or Parquet trade file in chunks of at most ``chunk_rows`` rows."""
+
+    path = Path(path)
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path)
+        for batch in parquet.iter_batches(batch_size=chunk_rows, columns=list(columns) if columns else None):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_rows, usecols=list(columns) if columns else None)
+
+
+@dataclass
+class TickBars:
+    bars: pd.DataFrame
+    footprint: Optional[pd.DataFrame] = None
+
+
+@dataclass
+class TickBarBuilder:
+    """Aggregates time-ordered trades into time, volume or tick bars, one chunk at a time.
+
+    ``size`` is a pandas frequency for time bars (epoch-aligned, labelled by bar start, empty
+    intervals skipped), the traded quantity per bar for volume bars or the trade count per bar
+    for tick bars. Volume bars close on the trade that crosses each multiple of ``size`` in
+    cumulative volume, so trades are never split and the grid does not depend on chunking.
+    Volume and tick bars are labelled with their first trade's time.
+
+    Buy and sell volume come from the aggressor side: a ``side`` column (``buy``/``sell`` or
+    +1/-1), Binance's ``is_buyer_maker`` flag, or else the tick rule. The tick rule has no
+    earlier price for the first trade of the stream, so that trade (and any zero ticks right
+    after it) counts as a buy; every trade thus lands in one side. ``delta`` is buy minus
+    sell volume per bar; ``delta_volume`` (the orderflow indicator) accumulates it. With
+    ``footprint_step`` set, buy and sell volume is also kept per bar and price level.
+    The trades of the still open bar are carried to the next chunk; ``flush`` emits it.
+    """
+
+    kind: str = "time"
+    size: Union[str, float] = "1min"
+    footprint_step: Optional[float] = None
+    time_column: str = "timestamp"
+    price_column: str = "price"
+    size_column: str = "size"
+    side_column: Optional[str] = None
+    time_unit: str = "ms"
+    _carry: Optional[Dict[str, np.ndarray]] = field(default=None, repr=False)
+    _ticks_seen: int = field(default=0, repr=False)
+    _volume_seen: float = field(default=0.0, repr=False)
+    _last_time: Optional[int] = field(default=None, repr=False)
+    _last_price: Optional[float] = field(default=None, repr=False)
+    _last_sign: int = field(default=0, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.kind not in BAR_KINDS:
+            raise ValueError(f"Unsupported bar kind: {self.kind}")
+        if self.kind == "time":
+            self._period = pd.Timedelta(self.size).value
+        elif float(self.size) <= 0:
+            raise ValueError("Bar size must be positive")
+
+    def _times(self, values: pd.Series) -> np.ndarray:
+        if pd.api.types.is_numeric_dtype(values.dtype):
+            return pd.to_datetime(values.to_numpy(), unit=self.time_unit, utc=True).as_unit("ns").asi8
+        return pd.DatetimeIndex(pd.to_datetime(values, utc=True)).as_unit("ns").asi8
+
+    def _signs(self, ticks: pd.DataFrame, price: np.ndarray) -> np.ndarray:
+        column = self.side_column or next((c for c in ("side", "is_buyer_maker") if c in ticks.columns), None)
+        if column == "is_buyer_maker":
+            # The maker bought, so the aggressor sold.
+            return np.where(ticks[column].to_numpy(dtype=bool), -1, 1).astype(np.int8)
+        if column is not None:
+            values = ticks[column]
+            if pd.api.types.is_numeric_dtype(values.dtype):
+                return np.sign(values.to_numpy()).astype(np.int8)
+            codes = values.astype("category")
+            lookup = np.array(
+                [_SIDE_SIGNS.get(str(name).lower(), 0) for name in codes.cat.categories] + [0], dtype=np.int8
+            )
+            return lookup[codes.cat.codes.to_numpy()]
+        # Tick rule: an uptick is buyer-initiated, a downtick seller-initiated, a zero tick repeats.
+        # The opening trades of the stream have nothing to repeat and are seeded as buys.
+        previous = price[0] if self._last_price is None else self._last_price
+        sign = np.sign(np.diff(price, prepend=previous))
+        sign = pd.Series(sign).replace(0.0, np.nan).ffill().fillna(self._last_sign or 1).to_numpy()
+        self._last_sign = int(sign[-1]) if len(sign) else self._last_sign
+        return sign.astype(np.int8)
+
+    def _keys(self, stamps: np.ndarray, quantity: np.ndarray) -> np.ndarray:
+        if self.kind == "time":
+            return stamps // self._period
+        if self.kind == "tick":
+            keys = (self._ticks_seen + np.arange(len(stamps), dtype=np.int64)) // int(self.size)
+            self._ticks_seen += len(stamps)
+            return keys
+        before = self._volume_seen + np.cumsum(quantity) - quantity
+        self._volume_seen = float(before[-1] + quantity[-1]) if len(quantity) else self._volume_seen
+        return np.floor(before / float(self.size)).astype(np.int64)
+
+    def add(self, ticks: pd.DataFrame) -> TickBars:
+        """Aggregate one chunk; returns the bars it completed."""
+
+        if ticks.empty:
+            return TickBars(self._empty_bars(), self._empty_footprint())
+        stamps = self._times(ticks[self.time_column])
+        if (self._last_time is not None and stamps[0] < self._last_time) or np.any(np.diff(stamps) < 0):
+            raise ValueError("Ticks must be sorted by time")
+        self._last_time = int(stamps[-1])
+        price = ticks[self.price_column].to_numpy(dtype=np.float64)
+        quantity = ticks[self.size_column].to_numpy(dtype=np.float64)
+        sign = self._signs(ticks, price)
+        self._last_price = float(price[-1])
+        chunk = {"key": self._keys(stamps, quantity), "time": stamps, "price": price, "size": quantity, "sign": sign}
+        if self._carry is not None:
+            chunk = {name: np.concatenate([self._carry[name], values]) for name, values in chunk.items()}
+        # The last bar may continue in the next chunk.
+        open_from = int(np.searchsorted(chunk["key"], chunk["key"][-1], side="left"))
+        self._carry = {name: values[open_from:] for name, values in chunk.items()}
+        return self._aggregate({name: values[:open_from] for name, values in chunk.items()})
+
+    def flush(self) -> TickBars:
+        """Emit the open bar, e.g. at the end of the input."""
+
+        carry, self._carry = self._carry, None
+        if carry is None:
+            return TickBars(self._empty_bars(), self._empty_footprint())
+        return self._aggregate(carry)
+
+    def _aggregate(self, ticks: Dict[str, np.ndarray]) -> TickBars:
+        keys = ticks["key"]
+        if len(keys) == 0:
+            return TickBars(self._empty_bars(), self._empty_footprint())
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        ends = np.r_[starts[1:], len(keys)]
+        price, quantity, sign = ticks["price"], ticks["size"], ticks["sign"]
+        buy = np.where(sign > 0, quantity, 0.0)
+        sell = np.where(sign < 0, quantity, 0.0)
+        buy_volume = np.add.reduceat(buy, starts)
+        sell_volume = np.add.reduceat(sell, starts)
+        if self.kind == "time":
+            stamps = keys[starts] * self._period
+        else:
+            stamps = ticks["time"][starts]
+        index = pd.DatetimeIndex(pd.to_datetime(stamps, utc=True), name="timestamp")
+        bars = pd.DataFrame(
+            {
+                "open": price[starts],
+                "high": np.maximum.reduceat(price, starts),
+                "low": np.minimum.reduceat(price, starts),
+                "close": price[ends - 1],
+                "volume": np.add.reduceat(quantity, starts),
+                "buy_volume": buy_volume,
+                "sell_volume": sell_volume,
+                "delta": buy_volume - sell_volume,
+                "trades": ends - starts,
+            },
+            index=index,
+        )
+        footprint = None
+        if self.footprint_step is not None:
+            footprint = self._footprint(index, np.repeat(np.arange(len(starts)), ends - starts), price, buy, sell)
+        return TickBars(bars, footprint)
+
+    def _footprint(
+        self, index: pd.DatetimeIndex, bar: np.ndarray, price: np.ndarray, buy: np.ndarray, sell: np.ndarray
+    ) -> pd.DataFrame:
+        assert self.footprint_step is not None
+        level = np.floor(price / self.footprint_step).astype(np.int64)
+        grouped = (
+            pd.DataFrame({"bar": bar, "level": level, "buy_volume": buy, "sell_volume": sell})
+            .groupby(["bar", "level"], sort=True)
+            .sum()
+        )
+        bars = grouped.index.get_level_values("bar").to_numpy()
+        levels = grouped.index.get_level_values("level").to_numpy()
+        return pd.DataFrame(
+            {
+                "bar": index[bars],
+                "price": levels * self.footprint_step,
+                "buy_volume": grouped["buy_volume"].to_numpy(),
+                "sell_volume": grouped["sell_volume"].to_numpy(),
+            }
+        )
+
+    def _empty_bars(self) -> pd.DataFrame:
+        return pd.DataFrame(columns=BAR_COLUMNS, index=pd.DatetimeIndex([], tz="UTC", name="timestamp"))
+
+    def _empty_footprint(self) -> Optional[pd.DataFrame]:
+        return None if self.footprint_step is None else pd.DataFrame(columns=FOOTPRINT_COLUMNS)
+
+    def build(self, chunks: Iterable[pd.DataFrame]) -> TickBars:
+        """Aggregate every chunk plus the final open bar."""
+
+        parts: List[TickBars] = [self.add(chunk) for chunk in chunks]
+        parts.append(self.flush())
+        bars = pd.concat([part.bars for part in parts if not part.bars.empty]) if parts else self._empty_bars()
+        footprint = None
+        if self.footprint_step is not None:
+            frames = [part.footprint for part in parts if part.footprint is not None and not part.footprint.empty]
+            footprint = pd.concat(frames, ignore_index=True) if frames else self._empty_footprint()
+        return TickBars(bars if len(bars) else self._empty_bars(), footprint)
+
+
+def build_bars(
+    paths: Sequence[Path],
+    builder: TickBarBuilder,
+    chunk_rows: int = 5_000_000,
+) -> TickBars:
+    """Aggregate trade files (read in order, each chunked) into bars."""
+
+    chunks = (chunk for path in paths for chunk in read_ticks(path, chunk_rows))
+    return builder.build(chunks)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from .config import DEFAULT_CONFIG
+    from .market_store import MarketDataStore
+
+    parser = argparse.ArgumentParser(description="Aggregate trade files into OHLCV bars with aggressor volume.")
+    parser.add_argument("paths", nargs="+", type=Path, help="CSV or Parquet trade files in time order")
+    parser.add_argument("--kind", choices=BAR_KINDS, default="time")
+    parser.add_argument("--size", default="1min", help="frequency (time bars), volume or trade count per bar")
+    parser.add_argument("--footprint-step", type=float, help="price bucket for per-level footprint volume")
+    parser.add_argument("--chunk-rows", type=int, default=5_000_000)
+    parser.add_argument("--time-unit", default="ms", help="unit of numeric timestamps")
+    parser.add_argument("--out", type=Path, help="write bars to this Parquet file")
+    parser.add_argument("--store-interval", help="also write bars to the market store under this interval")
+    args = parser.parse_args(argv)
+
+    size: Union[str, float] = args.size if args.kind == "time" else float(args.size)
+    builder = TickBarBuilder(kind=args.kind, size=size, footprint_step=args.footprint_step, time_unit=args.time_unit)
+    started = time.perf_counter()
+    result = build_bars(args.paths, builder, chunk_rows=args.chunk_rows)
+    elapsed = time.perf_counter() - started
+    ticks = int(result.bars["trades"].sum()) if len(result.bars) else 0
+    logger.info(
+        "Built %d %s bars from %d ticks in %.1fs (%.1fM ticks/min)",
+        len(result.bars),
+        args.kind,
+        ticks,
+        elapsed,
+        ticks / max(elapsed, 1e-9) * 60 / 1e6,
+    )
+    if args.out is not None:
+        result.bars.to_parquet(args.out)
+        if result.footprint is not None:
+            result.footprint.to_parquet(args.out.with_name(f"{args.out.stem}_footprint.parquet"))
+    if args.store_interval:
+        store = MarketDataStore(DEFAULT_CONFIG.data.cache_dir / "store")
+        store.write(DEFAULT_CONFIG.data.symbol, args.store_interval, result.bars)
+
+
+if __name__ == "__main__":
+    main()
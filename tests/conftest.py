@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def make_bars(
+    n: int = 2000,
+    seed: int = 0,
+    start: str = "2024-01-01",
+    freq: str = "h",
+    price: float = 100.0,
+    volatility: float = 0.01,
+) -> pd.DataFrame:
+    """Random-walk OHLCV bars on a UTC index, consistent enough for every indicator."""
+
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(np.cumsum(rng.normal(0, volatility, n)))
+    open_ = np.r_[close[0], close[:-1]] * (1 + rng.normal(0, volatility / 3, n))
+    spread = np.abs(rng.normal(0, volatility / 3, (2, n)))
+    return pd.DataFrame(
+        {
+            "open": open_,
+            "high": np.maximum(open_, close) * (1 + spread[0]),
+            "low": np.minimum(open_, close) * (1 - spread[1]),
+            "close": close,
+            "volume": rng.lognormal(3, 0.6, n),
+        },
+        index=pd.date_range(start, periods=n, freq=freq, tz="UTC", name="timestamp"),
+    )
+
+
+@pytest.fixture
+def bars() -> Callable[..., pd.DataFrame]:
+    return make_bars
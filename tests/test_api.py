@@ -0,0 +1,137 @@
+import asyncio
+import json
+import time
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("vaderSentiment")
+
+from fastapi.testclient import TestClient
+
+from ai_trading_bot.api.server import create_app
+from ai_trading_bot.api.snapshots import SnapshotService
+from ai_trading_bot.live.feeds import ReplayFeed
+from ai_trading_bot.live.trading_loop import LiveTradingLoop
+from ai_trading_bot.ml_engine.feature_engineering import FEATURE_COLUMNS, SENTIMENT_COLUMNS
+from ai_trading_bot.strategies.trend_following import TrendFollowingStrategy
+from ai_trading_bot.utils.config import DEFAULT_CONFIG, LiveConfig
+from ai_trading_bot.utils.data_loader import DataLoader
+
+
+@pytest.fixture
+def store_config(tmp_path):
+    return replace(DEFAULT_CONFIG, data=replace(DEFAULT_CONFIG.data, symbol="TEST", cache_dir=tmp_path))
+
+
+def _wait(check, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not check():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+@pytest.fixture
+def sentiment_config(tmp_path):
+    headlines = tmp_path / "headlines.csv"
+    headlines.write_text(
+        "timestamp,text\n"
+        "2024-01-05T10:30:00Z,Great news as Bitcoin rallies\n"
+        "2024-01-05T11:15:00Z,Terrible loss after exchange hack\n",
+        encoding="utf-8",
+    )
+    sentiment = replace(
+        DEFAULT_CONFIG.sentiment, include_features=True, headline_paths=[headlines], feature_scorer="vader"
+    )
+    return replace(DEFAULT_CONFIG, sentiment=sentiment, data=replace(DEFAULT_CONFIG.data, cache_dir=tmp_path))
+
+
+def test_latest_features_include_sentiment_columns(bars, sentiment_config):
+    app = create_app(sentiment_config, poll_interval=None)
+    data = bars(120)
+    assert app.state.bot.snapshots.refresh(data)
+
+    response = TestClient(app).get("/features/latest")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["bar"] == data.index[-1].isoformat()
+    assert list(body["features"]) == FEATURE_COLUMNS + SENTIMENT_COLUMNS
+    # Both headlines fall inside the 24h window ending at the last bar.
+    assert body["features"]["sentiment_count"] == 2
+
+
+def test_latest_features_without_sentiment(bars):
+    app = create_app(poll_interval=None)
+    client = TestClient(app)
+    assert client.get("/features/latest").status_code == 503
+
+    app.state.bot.snapshots.refresh(bars(120))
+    response = client.get("/features/latest")
+    assert list(response.json()["features"]) == FEATURE_COLUMNS
+    etag = response.headers["etag"]
+    assert client.get("/features/latest", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_invalid_backtest_is_rejected_at_submission():
+    client = TestClient(create_app(poll_interval=None))
+    response = client.post("/backtests", json={"strategies": {"breakout": {"nope": 1}}})
+    assert response.status_code == 422
+    assert "nope" in response.json()["detail"]
+
+
+def test_poll_fetches_new_bars_and_pushes_them(bars, store_config):
+    data = bars(300)
+    available = {"bars": 250}
+    # The provider only knows the bars "closed so far"; the store starts empty.
+    loader = DataLoader(store_config.data, fetcher=lambda *args: data.iloc[: available["bars"]].copy())
+    app = create_app(store_config, data_loader=loader, poll_interval=0.02)
+
+    with TestClient(app) as client:
+        _wait(lambda: client.get("/signals").status_code == 200)
+        assert client.get("/signals").json()["bar"] == data.index[249].isoformat()
+        with client.websocket_connect("/ws/signals") as websocket:
+            # The current document on connect, then one per new bar.
+            assert websocket.receive_json()["bar"] == data.index[249].isoformat()
+            available["bars"] = 251
+            assert websocket.receive_json()["bar"] == data.index[250].isoformat()
+        assert client.get("/signals").json()["bar"] == data.index[250].isoformat()
+
+
+def test_subscribers_only_keep_the_newest_document(bars):
+    service = SnapshotService(strategies=[TrendFollowingStrategy()])
+    data = bars(120)
+
+    async def run():
+        service.refresh(data.iloc[:-3])
+        slow, gone = service.subscribe(), service.subscribe()
+        service.unsubscribe(gone)
+        for end in (-2, -1, None):
+            service.refresh(data.iloc[:end] if end else data)
+            assert service.broadcast() == 1
+        # A client that did not read skips straight to the newest bar.
+        assert slow.qsize() == 1 and gone.qsize() == 1
+        return json.loads(await slow.get()), json.loads(gone.get_nowait())
+
+    newest, stale = asyncio.run(run())
+    assert newest["bar"] == data.index[-1].isoformat()
+    assert stale["bar"] == data.index[-4].isoformat()
+
+
+def test_live_loop_feeds_the_snapshot(bars, store_config):
+    data = bars(300)
+    loader = DataLoader(store_config.data)
+    loader.store.write("TEST", store_config.data.interval, data)
+    loop = LiveTradingLoop(ReplayFeed(loader, start=data.index[250]), strategies=[], config=LiveConfig(warmup_bars=1))
+    app = create_app(store_config, data_loader=loader, poll_interval=None, live_loop=loop)
+    snapshots = app.state.bot.snapshots
+
+    with TestClient(app) as client:
+        _wait(lambda: snapshots.snapshot is not None and snapshots.snapshot.bar == data.index[-1])
+        assert client.get("/signals").json()["bar"] == data.index[-1].isoformat()
+        assert client.get("/live/metrics").json()["bars"] == 50
+    # Stored bars before the first live bar, then the live ones.
+    assert snapshots.history.index.equals(data.index)
+    np.testing.assert_allclose(snapshots.history[["open", "close", "volume"]], data[["open", "close", "volume"]])
+    assert loop.listeners == []
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from ai_trading_bot.backtest.backtest_runner import BacktestRunner, precompute_signals
+from ai_trading_bot.main import TradingBot
+
+
+def _runner(engine: str, risk_per_trade: float = 0.05) -> BacktestRunner:
+    return BacktestRunner(strategies=TradingBot().strategies, engine=engine, risk_per_trade=risk_per_trade)
+
+
+def test_vectorized_engine_reconciles_with_backtrader(bars):
+    df = bars(3000, seed=4)
+    signals = precompute_signals(TradingBot().strategies, df)
+    assert sum(int(frame["signal"].notna().sum()) for frame in signals.values()) > 10
+
+    expected_metrics, expected = _runner("backtrader").run_with_equity(df)
+    metrics, equity = _runner("vectorized").run_with_equity(df)
+
+    assert len(equity) == len(expected)
+    np.testing.assert_allclose(equity.to_numpy(), expected.to_numpy(), rtol=1e-9)
+    assert metrics == pytest.approx(expected_metrics, rel=1e-9)
+
+
+def test_engines_agree_after_the_account_is_wiped_out(bars):
+    # A long run whose equity turns negative around bar 4800; neither engine trades after that.
+    df = bars(8000, seed=0)
+    expected_metrics, expected = _runner("backtrader", 0.01).run_with_equity(df)
+    metrics, equity = _runner("vectorized", 0.01).run_with_equity(df)
+
+    wiped = np.flatnonzero(expected.to_numpy() <= 0.0)
+    assert len(wiped) and wiped[0] < len(df) - 1000
+    np.testing.assert_allclose(equity.to_numpy(), expected.to_numpy(), rtol=1e-9)
+    assert metrics == pytest.approx(expected_metrics, rel=1e-9)
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        BacktestRunner(engine="nope")
@@ -0,0 +1,108 @@
+import time
+
+import pytest
+
+pytest.importorskip("backtrader")
+
+from ai_trading_bot.backtest.jobs import BacktestJobQueue, BacktestRequest
+from ai_trading_bot.utils.config import DataSourceConfig
+from ai_trading_bot.utils.data_loader import DataLoader
+
+
+@pytest.mark.parametrize(
+    "payload, message",
+    [
+        ({"strategies": {"nope": {}}}, "Unknown strategy"),
+        ({"strategies": {"breakout": {"nope": 1}}}, "Unknown breakout parameters: nope"),
+        ({"strategies": {"breakout": {"volume_multiplier": "high"}}}, "must be a finite number"),
+        ({"strategies": {"breakout": {"session": "tokyo"}}}, "unknown indicators"),
+        ({"strategies": {"trend_following": {"name": "x"}}}, "Unknown trend_following parameters: name"),
+        ({"strategies": {"breakout": [1]}}, "must be a mapping"),
+        ({"strategies": "breakout"}, "strategies must be"),
+        ({"config": {"engine": "zipline"}}, "Unsupported backtest engine"),
+        ({"config": {"commission": True}}, "must be a finite number"),
+        ({"config": {"leverage": 2}}, "Unknown backtest settings: leverage"),
+        ({"start": "not a date"}, None),
+        ({"end": 20240101}, "end must be a date string"),
+    ],
+)
+def test_invalid_requests_fail_at_submission(payload, message):
+    with pytest.raises(ValueError, match=message):
+        BacktestRequest.from_json(payload)
+
+
+def test_valid_request_round_trips():
+    payload = {
+        "start": "2024-01-01",
+        "strategies": {"breakout": {"session": "london", "volume_multiplier": 2}, "orderflow": {}},
+        "config": {"engine": "vectorized", "commission": 0.001},
+    }
+    request = BacktestRequest.from_json(payload)
+    assert request.parameters() == {"breakout.session": "london", "breakout.volume_multiplier": 2}
+    assert BacktestRequest.from_json(request.to_json()) == request
+
+
+def test_cache_key_changes_when_a_partition_is_rewritten(tmp_path, bars):
+    config = DataSourceConfig(symbol="TEST", cache_dir=tmp_path)
+    store = DataLoader(config).store
+    data = bars(24 * 45, start="2024-01-01")
+    store.write("TEST", "1h", data)
+    queue = BacktestJobQueue(config)
+    request = BacktestRequest.from_json({"start": "2024-01-10", "end": "2024-01-20"})
+    key = queue.cache_key(request)
+    assert queue.cache_key(BacktestRequest.from_json({"start": "2024-01-10", "end": "2024-01-20"})) == key
+
+    # Same first and last bar, different prices inside the range.
+    revised = data.loc["2024-01-12":"2024-01-14"].assign(close=lambda frame: frame["close"] * 1.01)
+    store.write("TEST", "1h", revised)
+    assert queue.cache_key(request) != key
+
+
+def _wait(queue, job, states=("done", "failed", "cancelled"), timeout=60.0):
+    seen = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        current = queue.get(job.id)
+        if not seen or seen[-1] != current.state:
+            seen.append(current.state)
+        if current.state in states:
+            return seen
+        time.sleep(0.005)
+    raise AssertionError(f"job {job.id} stuck in {seen}")
+
+
+def test_job_queue_lifecycle(tmp_path, bars):
+    config = DataSourceConfig(symbol="TEST", cache_dir=tmp_path)
+    DataLoader(config).store.write("TEST", "1h", bars(24 * 90, start="2024-01-01"))
+    queue = BacktestJobQueue(config, max_workers=1)
+    try:
+        request = BacktestRequest.from_json({"start": "2024-01-05", "end": "2024-03-20"})
+        first = queue.submit(request)
+        assert first.state == "queued" and first.progress == 0.0
+        # An identical request is shared while the first one is in flight.
+        assert queue.submit(BacktestRequest.from_json(request.to_json())) is first
+
+        # One worker: the second job sits in the pool's call queue, the fourth is still pending.
+        running = queue.submit(BacktestRequest.from_json({**request.to_json(), "config": {"commission": 0.002}}))
+        failing = queue.submit(BacktestRequest.from_json({"start": "2030-01-01"}))
+        pending = queue.submit(BacktestRequest.from_json({**request.to_json(), "config": {"commission": 0.003}}))
+
+        assert queue.cancel(pending.id).state == "cancelled"
+        assert queue.get(pending.id).stage == "cancelled" and pending.progress == 0.0
+        # Already handed to the pool: flagged, and stopped at its first progress step.
+        assert queue.cancel(running.id).state == "cancelling"
+
+        # Progress reports move the job from queued to running.
+        assert _wait(queue, first)[-2:] == ["running", "done"]
+        assert first.progress == 1.0 and first.result["bars"] > 0
+        assert _wait(queue, running)[-1] == "cancelled"
+        assert running.result is None
+        assert _wait(queue, failing)[-1] == "failed"
+        assert failing.error == "ValueError: No stored data in the requested range"
+
+        cached = queue.submit(request)
+        assert cached is not first and cached.cached
+        assert (cached.state, cached.result) == ("done", first.result)
+        assert queue.cancel(cached.id) is cached
+    finally:
+        queue.shutdown()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_trading_bot.utils.columnar_cache import ColumnarCache
+
+
+def _ns(df: pd.DataFrame) -> pd.DataFrame:
+    # Timestamps are stored as epoch nanoseconds.
+    return df.set_axis(df.index.as_unit("ns"))
+
+
+def test_round_trip(tmp_path, bars):
+    cache = ColumnarCache(tmp_path)
+    df = _ns(bars(500))
+    cache.write("TEST", "1h", df)
+    pd.testing.assert_frame_equal(cache.frame("TEST", "1h"), df, check_freq=False)
+    assert cache.metadata("TEST", "1h")["rows"] == 500
+
+
+def test_rewrite_leaves_open_views_on_their_generation(tmp_path, bars):
+    cache = ColumnarCache(tmp_path)
+    df = _ns(bars(300))
+    cache.write("TEST", "1h", df)
+    before = cache.frame("TEST", "1h")
+    cache.write("TEST", "1h", df.iloc[:200] * 2)
+    after = cache.frame("TEST", "1h")
+
+    pd.testing.assert_frame_equal(before, df, check_freq=False)
+    pd.testing.assert_frame_equal(after, df.iloc[:200] * 2, check_freq=False)
+    # Only the current and the previous generation stay on disk.
+    cache.write("TEST", "1h", df)
+    generations = sorted(path.name for path in (tmp_path / "symbol=TEST" / "interval=1h" / "columns").glob("g*"))
+    assert generations == ["g000002", "g000003"]
+
+
+def test_float32_storage(tmp_path, bars):
+    cache = ColumnarCache(tmp_path)
+    cache.write("TEST", "1h", bars(100), dtype="float32")
+    arrays = cache.arrays("TEST", "1h", ["close"])
+    assert arrays["close"].dtype == np.float32 and arrays["timestamp"].dtype == np.int64
+
+
+def test_write_tail_appends_without_touching_stored_rows(tmp_path, bars):
+    cache = ColumnarCache(tmp_path)
+    df = _ns(bars(400))
+    cache.write("TEST", "1h", df.iloc[:300])
+    before = cache.frame("TEST", "1h")
+    cache.write_tail("TEST", "1h", df.iloc[290:], start=290)
+
+    assert cache.metadata("TEST", "1h")["generation"] == 1
+    pd.testing.assert_frame_equal(cache.frame("TEST", "1h"), df, check_freq=False)
+    pd.testing.assert_frame_equal(before, df.iloc[:300], check_freq=False)
+
+
+def test_write_tail_moves_revised_rows_to_a_new_generation(tmp_path, bars):
+    cache = ColumnarCache(tmp_path)
+    df = _ns(bars(400))
+    cache.write("TEST", "1h", df.iloc[:300])
+    before = cache.frame("TEST", "1h")
+    revised = df.iloc[290:].copy()
+    revised.iloc[:5, 0] += 1.0
+    cache.write_tail("TEST", "1h", revised, start=290)
+
+    assert cache.metadata("TEST", "1h")["generation"] == 2
+    pd.testing.assert_frame_equal(cache.frame("TEST", "1h"), pd.concat([df.iloc[:290], revised]), check_freq=False)
+    # The view taken before the update still shows the old rows.
+    pd.testing.assert_frame_equal(before, df.iloc[:300], check_freq=False)
+
+
+def test_write_tail_rejects_gaps_and_truncation(tmp_path, bars):
+    cache = ColumnarCache(tmp_path)
+    df = _ns(bars(400))
+    cache.write("TEST", "1h", df.iloc[:300])
+    with pytest.raises(ValueError, match="gap"):
+        cache.write_tail("TEST", "1h", df.iloc[310:], start=310)
+    with pytest.raises(ValueError, match="drop stored rows"):
+        cache.write_tail("TEST", "1h", df.iloc[250:280], start=250)
+    # Appending right at the stored length is no gap.
+    cache.write_tail("TEST", "1h", df.iloc[300:], start=300)
+    pd.testing.assert_frame_equal(cache.frame("TEST", "1h"), df, check_freq=False)
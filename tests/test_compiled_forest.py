@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from ai_trading_bot.ml_engine.compiled_forest import CompiledForest
+
+
+def _data(seed: int, rows: int = 600, missing: float = 0.0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(rows, 5)), columns=[f"f{i}" for i in range(5)])
+    y = np.where(X["f0"] + 0.5 * X["f1"] > 0.4, "buy", np.where(X["f0"] < -0.4, "sell", "hold"))
+    if missing:
+        X = X.mask(rng.random(X.shape) < missing)
+    return X, y
+
+
+@pytest.mark.parametrize("train_missing", [0.0, 0.1])
+def test_compiled_forest_is_bit_identical_to_sklearn(train_missing):
+    X, y = _data(0, missing=train_missing)
+    forest = RandomForestClassifier(n_estimators=25, max_depth=6, random_state=7).fit(X, y)
+    compiled = CompiledForest.from_sklearn(forest)
+
+    queries, _ = _data(1, rows=300, missing=0.15)
+    assert queries.isna().any().any()
+    values = queries.to_numpy()
+
+    # Batch, one row as a 2-D frame and one row as a 1-D vector.
+    assert np.array_equal(compiled.predict_proba(values), forest.predict_proba(queries))
+    for i in (0, 5, 17):
+        expected = forest.predict_proba(queries.iloc[[i]])
+        assert np.array_equal(compiled.predict_proba(values[[i]]), expected)
+        assert np.array_equal(compiled.predict_proba(values[i]), expected)
+    assert list(compiled.classes) == list(forest.classes_)
+
+
+def test_compiled_forest_rejects_the_wrong_width():
+    X, y = _data(0, rows=100)
+    compiled = CompiledForest.from_sklearn(RandomForestClassifier(n_estimators=3, random_state=0).fit(X, y))
+    with pytest.raises(ValueError, match="Expected 5 features"):
+        compiled.predict_proba(np.zeros((2, 4)))
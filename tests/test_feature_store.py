@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_trading_bot.main import TradingBot
+from ai_trading_bot.ml_engine.feature_engineering import build_feature_matrix, feature_columns
+from ai_trading_bot.ml_engine.feature_store import FeatureStore
+from ai_trading_bot.utils.config import DEFAULT_CONFIG, DataSourceConfig
+from ai_trading_bot.utils.data_loader import DataLoader
+
+
+def _assert_same(got: pd.DataFrame, expected: pd.DataFrame) -> None:
+    # The feature store keeps nanosecond timestamps; Parquet reads may come back in microseconds.
+    assert got.index.equals(expected.index)
+    assert list(got.columns) == list(expected.columns)
+    np.testing.assert_allclose(got.to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-9)
+
+
+def _assert_rebuild(features: pd.DataFrame, loader: DataLoader) -> None:
+    _assert_same(features, build_feature_matrix(loader.store.read("TEST", "1h"), dropna=False))
+
+
+@pytest.fixture
+def series(bars):
+    # Ends on 2024-02-01, so the last 30 bars roll over from January into February.
+    return bars(24 * 31 + 10, seed=9, start="2024-01-01 04:00")
+
+
+@pytest.fixture
+def loader(tmp_path):
+    return DataLoader(DataSourceConfig(symbol="TEST", cache_dir=tmp_path / "market"))
+
+
+def test_tail_updates_match_a_full_rebuild(tmp_path, loader, series):
+    store = FeatureStore(tmp_path / "features")
+    loader.store.write("TEST", "1h", series.iloc[:-40])
+    _assert_rebuild(store.load(loader), loader)
+    assert (store.rebuilds, store.updates) == (1, 0)
+
+    # One bar, then several.
+    for end in (-39, -30):
+        loader.store.write("TEST", "1h", series.iloc[:end])
+        _assert_rebuild(store.load(loader), loader)
+
+    # The last bar revised in place.
+    revised = series.iloc[end - 1 : end].assign(close=lambda frame: frame["close"] * 1.02, volume=5.0)
+    loader.store.write("TEST", "1h", revised)
+    _assert_rebuild(store.load(loader), loader)
+
+    # Into the next month.
+    assert series.index[-1].month == 2 and series.index[-31].month == 1
+    loader.store.write("TEST", "1h", series.iloc[-30:])
+    _assert_rebuild(store.load(loader), loader)
+    assert (store.rebuilds, store.updates) == (1, 4)
+
+    # Unchanged data is served as stored.
+    _assert_rebuild(store.load(loader), loader)
+    assert store.hits == 1
+
+
+def test_rewritten_history_rebuilds(tmp_path, loader, series):
+    store = FeatureStore(tmp_path / "features")
+    loader.store.write("TEST", "1h", series.iloc[:-30])
+    store.load(loader)
+    loader.store.write("TEST", "1h", series.iloc[10:12].assign(close=lambda frame: frame["close"] * 0.9))
+    loader.store.write("TEST", "1h", series.iloc[-30:])
+    _assert_rebuild(store.load(loader), loader)
+    assert (store.rebuilds, store.updates) == (2, 0)
+
+
+def test_feature_matrix_uses_the_store_only_for_stored_bars(tmp_path, series):
+    config = replace(
+        DEFAULT_CONFIG,
+        data=replace(DEFAULT_CONFIG.data, symbol="TEST", cache_dir=tmp_path),
+        model=replace(DEFAULT_CONFIG.model, feature_store=True),
+    )
+    bot = TradingBot(config)
+    bot.data_loader.store.write("TEST", "1h", series)
+    data = bot.load_data()
+
+    def fresh(frame):
+        return build_feature_matrix(frame, dropna=False, columns=feature_columns())
+
+    stored = bot.feature_matrix(data)
+    assert bot.feature_store.rebuilds == 1
+    _assert_same(stored, fresh(data))
+    window = data.iloc[100:400]
+    expected = build_feature_matrix(data, dropna=False, columns=feature_columns()).iloc[100:400]
+    _assert_same(bot.feature_matrix(window), expected)
+
+    other = series.assign(close=series["close"] * 2)
+    gapped = data.drop(data.index[[150, 151]]).iloc[100:400]
+    revised = window.assign(close=lambda frame: frame["close"].where(frame.index != frame.index[-1], 1.0))
+    for frame in (other, gapped, revised):
+        features = bot.feature_matrix(frame)
+        assert len(features) == len(frame)
+        _assert_same(features, fresh(frame))
+    assert bot.feature_store.rebuilds == 1
+
+
+def test_feature_store_is_opt_in():
+    assert DEFAULT_CONFIG.model.feature_store is False
@@ -0,0 +1,75 @@
+import pytest
+
+transformers = pytest.importorskip("transformers")
+torch = pytest.importorskip("torch")
+
+from ai_trading_bot.sentiment.finbert_analysis import FinBERTSentimentAnalyzer
+
+LABELS = {0: "positive", 1: "negative", 2: "neutral"}
+WORDS = ["bitcoin", "rallies", "crashes", "after", "etf", "approval", "exchange", "hack", "stable", "today"]
+HEADLINES = [
+    "Bitcoin rallies after ETF approval",
+    "Exchange hack",
+    "bitcoin   RALLIES after etf approval",
+    "Bitcoin stable today",
+    "Bitcoin crashes after exchange hack today",
+    "Exchange hack",
+]
+
+
+@pytest.fixture(scope="module")
+def tiny_model(tmp_path_factory):
+    """A randomly initialised two-layer BERT with a ten-word vocabulary, saved like a Hub model."""
+
+    path = tmp_path_factory.mktemp("tiny-finbert")
+    vocab = path / "vocab.txt"
+    vocab.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *WORDS]) + "\n")
+    transformers.BertTokenizer(str(vocab)).save_pretrained(path)
+    torch.manual_seed(0)
+    config = transformers.BertConfig(
+        vocab_size=5 + len(WORDS),
+        hidden_size=16,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=32,
+        max_position_embeddings=64,
+        num_labels=3,
+        id2label=LABELS,
+        label2id={label: i for i, label in LABELS.items()},
+    )
+    transformers.BertForSequenceClassification(config).save_pretrained(path)
+    return str(path)
+
+
+def test_labels_come_from_the_model_config(tiny_model):
+    scores = FinBERTSentimentAnalyzer(model_name=tiny_model).analyze("Bitcoin rallies")
+    assert set(scores) == set(LABELS.values())
+    assert sum(scores.values()) == pytest.approx(1.0)
+
+
+def test_batched_scores_match_one_at_a_time(tiny_model):
+    batched = FinBERTSentimentAnalyzer(model_name=tiny_model, batch_size=4).analyze_batch(HEADLINES)
+    single = FinBERTSentimentAnalyzer(model_name=tiny_model, batch_size=1, cache_size=0)
+    for text, scores in zip(HEADLINES, batched):
+        expected = single.analyze(text)
+        assert scores == pytest.approx(expected, abs=1e-5)
+
+
+def test_repeated_and_normalised_headlines_are_scored_once(tiny_model):
+    analyzer = FinBERTSentimentAnalyzer(model_name=tiny_model)
+    first = analyzer.analyze_batch(HEADLINES)
+    # Case/whitespace variants and the duplicate share an entry: four distinct texts.
+    assert (analyzer.hits, analyzer.misses) == (0, 4)
+    assert first[0] == first[2] and first[1] == first[5]
+    again = analyzer.analyze_batch(HEADLINES[:2])
+    assert again == first[:2]
+    assert analyzer.hits == 2
+
+    analyzer.clear_cache()
+    assert (analyzer.hits, analyzer.misses) == (0, 0)
+
+
+def test_cache_is_bounded(tiny_model):
+    analyzer = FinBERTSentimentAnalyzer(model_name=tiny_model, cache_size=2)
+    analyzer.analyze_batch(HEADLINES)
+    assert len(analyzer._cache) == 2
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import gc
+
+import pandas as pd
+
+from ai_trading_bot.indicators.cache import IndicatorCache
+
+
+def _mean(df: pd.DataFrame, calls: list):
+    def compute():
+        calls.append(len(df))
+        return df["close"].rolling(5).mean()
+
+    return compute
+
+
+def test_hits_and_misses_follow_frame_name_and_params(bars):
+    cache = IndicatorCache()
+    df = bars(100)
+    calls: list = []
+    first = cache.get(df, "mean", (5,), _mean(df, calls))
+    assert cache.get(df, "mean", (5,), _mean(df, calls)) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.get(df, "mean", (6,), _mean(df, calls))  # other parameters
+    cache.get(df, "other", (5,), _mean(df, calls))  # other indicator
+    cache.get(df.copy(), "mean", (5,), _mean(df, calls))  # equal values, another frame
+    grown = pd.concat([df, bars(101).iloc[-1:]])
+    cache.get(grown, "mean", (5,), _mean(grown, calls))
+    assert (cache.hits, cache.misses) == (1, 5)
+    assert len(calls) == 5
+
+
+def test_in_place_mutation_with_same_shape_is_not_detected(bars):
+    cache = IndicatorCache()
+    df = bars(50)
+    calls: list = []
+    before = cache.get(df, "mean", (5,), _mean(df, calls)).copy()
+    df.iloc[-3, df.columns.get_loc("close")] *= 2  # same length and last timestamp
+    pd.testing.assert_series_equal(cache.get(df, "mean", (5,), _mean(df, calls)), before)
+    assert len(calls) == 1
+    cache.clear()
+    assert not cache.get(df, "mean", (5,), _mean(df, calls)).equals(before)
+
+
+def test_max_bytes_evicts_least_recently_used(bars):
+    df = bars(1000)
+    entry = df["close"].rolling(5).mean().memory_usage(index=False)
+    cache = IndicatorCache(max_bytes=int(entry * 2.5))
+    calls: list = []
+    for name in ("a", "b"):
+        cache.get(df, name, (), _mean(df, calls))
+    cache.get(df, "a", (), _mean(df, calls))  # "a" is now the most recent
+    cache.get(df, "c", (), _mean(df, calls))  # evicts "b"
+    assert len(cache) == 2 and cache.nbytes == 2 * entry <= cache.max_bytes
+    cache.get(df, "a", (), _mean(df, calls))
+    cache.get(df, "b", (), _mean(df, calls))
+    assert calls == [1000] * 4
+
+    # An entry larger than the whole budget is returned but not kept.
+    small = IndicatorCache(max_bytes=entry - 1)
+    small.get(df, "a", (), _mean(df, calls))
+    assert len(small) == 0 and small.nbytes == 0
+
+
+def test_entries_are_dropped_when_the_frame_is_collected(bars):
+    cache = IndicatorCache()
+    kept = bars(100)
+    cache.get(kept, "mean", (5,), _mean(kept, []))
+    df = bars(200)
+    cache.get(df, "mean", (5,), _mean(df, []))
+    cache.get(df, "other", (5,), _mean(df, []))
+    assert len(cache) == 3
+    del df
+    gc.collect()
+    assert len(cache) == 1 and cache.nbytes == kept["close"].memory_usage(index=False)
+    assert len(cache._finalizers) == 1
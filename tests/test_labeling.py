@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_trading_bot.ml_engine.labeling import barrier_volatility, horizon_labels, triple_barrier_labels
+
+
+def _reference(close, horizon, profit_take, stop_loss, scale, timeout):
+    """One row at a time: walk the path until a barrier is touched or the data ends."""
+
+    values = close.to_numpy()
+    widths = np.ones(len(values)) if scale is None else scale.to_numpy()
+    rows = []
+    for i, start in enumerate(values):
+        width = widths[i]
+        if math.isnan(width):
+            rows.append((None, None, None))
+            continue
+        row = (None, None, None)  # runs off the end untouched
+        for step in range(1, horizon + 1):
+            if i + step >= len(values):
+                break
+            change = values[i + step] / start - 1
+            if change >= profit_take * width:
+                row = ("buy", step, change)
+                break
+            if change <= -stop_loss * width:
+                row = ("sell", step, change)
+                break
+            if step == horizon:
+                label = {1.0: "buy", -1.0: "sell", 0.0: "hold"}[float(np.sign(change))] if timeout == "sign" else "hold"
+                row = (label, step, change)
+        rows.append(row)
+    return rows
+
+
+@pytest.mark.parametrize("timeout", ["hold", "sign"])
+@pytest.mark.parametrize("scaled", [False, True])
+def test_triple_barrier_matches_a_per_row_loop(bars, timeout, scaled, monkeypatch):
+    # Small blocks so the block loop itself is exercised.
+    monkeypatch.setattr("ai_trading_bot.ml_engine.labeling._BLOCK_ROWS", 64)
+    close = bars(600, seed=3, volatility=0.01)["close"]
+    if scaled:
+        scale, profit_take, stop_loss = barrier_volatility(close, 20), 2.0, 1.5
+    else:
+        scale, profit_take, stop_loss = None, 0.02, 0.015
+    labels = triple_barrier_labels(close, horizon=12, profit_take=profit_take, stop_loss=stop_loss, scale=scale, timeout=timeout)
+    expected = _reference(close, 12, profit_take, stop_loss, scale, timeout)
+
+    got = list(labels.itertuples(index=False, name=None))
+    for i, ((label, touch, change), (want_label, want_touch, want_change)) in enumerate(zip(got, expected)):
+        assert label == want_label, i
+        if want_label is None:
+            assert math.isnan(change), i
+        else:
+            assert touch == want_touch, i
+            assert change == pytest.approx(want_change, rel=1e-12, abs=1e-15), i
+
+    found = {row[0] for row in expected}
+    assert {"buy", "sell", None} <= found
+    # Paths that run off the end are unknown unless a barrier was touched before the data ended.
+    tail = [row[0] for row in expected[-12:]]
+    assert tail[-1] is None and any(label in ("buy", "sell") for label in tail)
+
+
+def test_unknown_rows_are_none_not_nan():
+    close = pd.Series(np.linspace(100.0, 101.0, 10))
+    barrier = triple_barrier_labels(close, horizon=3, profit_take=0.5, stop_loss=0.5)["label"]
+    fixed = horizon_labels(close, (3,))["label_3"]
+    for labels in (barrier, fixed):
+        assert labels.dtype == object
+        assert labels.tolist()[-3:] == [None] * 3
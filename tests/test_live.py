@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_trading_bot.backtest.vectorized_engine import signal_directions, simulate
+from ai_trading_bot.live.feeds import QueueFeed, ReplayFeed
+from ai_trading_bot.live.paper_broker import Order, PaperBroker
+from ai_trading_bot.live.trading_loop import LiveTradingLoop
+from ai_trading_bot.main import TradingBot
+from ai_trading_bot.ml_engine.feature_engineering import SENTIMENT_COLUMNS
+from ai_trading_bot.utils.config import DEFAULT_CONFIG, DataSourceConfig, LiveConfig
+from ai_trading_bot.utils.data_loader import DataLoader
+
+
+def _order(side: str, size: float) -> Order:
+    return Order(timestamp=pd.Timestamp("2024-01-01", tz="UTC"), side=side, size=size, strategy="test", reason="")
+
+
+def test_replay_matches_generate_signals_and_vectorized_engine(tmp_path, bars):
+    data = bars(1500, seed=4, volatility=0.02)
+    loader = DataLoader(DataSourceConfig(symbol="TEST", cache_dir=tmp_path))
+    loader.store.write("TEST", "1h", data)
+    strategies = TradingBot().strategies
+    loop = LiveTradingLoop(feed=ReplayFeed(loader), strategies=strategies, risk_per_trade=0.05)
+
+    async def replay():
+        events, equity = [], []
+        async for stamp, bar in loop.feed.bars():
+            events.append(loop.process_bar(stamp, bar))
+            equity.append(loop.broker.value())
+        return events, equity
+
+    events, equity = asyncio.run(replay())
+    assert [event.timestamp for event in events] == list(data.index)
+
+    signals = {strat.name: strat.generate_signals(data) for strat in strategies}
+    fired = 0
+    for name, frame in signals.items():
+        for event, (signal, confidence, reason) in zip(events, frame.itertuples(index=False, name=None)):
+            if not event.signals:
+                continue  # still in warmup
+            result = event.signals[name]
+            if result is None:
+                assert signal is None, (name, event.timestamp)
+            else:
+                assert (result.signal, result.confidence, result.reason) == (signal, confidence, reason)
+                fired += 1
+    assert fired > 10
+
+    expected = simulate(
+        data["open"].to_numpy(),
+        data["close"].to_numpy(),
+        signal_directions(signals, len(data)),
+        cash=10_000.0,
+        commission=loop.broker.commission,
+        risk_per_trade=0.05,
+        warmup=loop.config.warmup_bars,
+    )
+    np.testing.assert_allclose(equity, expected.equity, rtol=1e-12)
+    assert len(loop.broker.fills) == expected.fills
+    assert loop.broker.rejected == expected.rejected
+
+
+def test_broker_fills_at_next_open_and_rejects_without_cash():
+    broker = PaperBroker(cash=1_000.0, commission=0.001)
+    broker.on_bar(pd.Timestamp("2024-01-01 00:00", tz="UTC"), {"open": 100.0, "close": 100.0})
+    assert broker.submit(_order("buy", 6.0), price=100.0)
+    # 6 units are already committed at this bar's price, so 4 more would overdraw the account.
+    assert not broker.submit(_order("buy", 4.0), price=100.0)
+    assert broker.rejected == 1
+    assert broker.position == 0.0 and broker.cash == 1_000.0
+
+    (fill,) = broker.on_bar(pd.Timestamp("2024-01-01 01:00", tz="UTC"), {"open": 102.0, "close": 105.0})
+    assert fill.price == 102.0 and fill.commission == pytest.approx(6.0 * 102.0 * 0.001)
+    assert broker.position == 6.0
+    assert broker.cash == pytest.approx(1_000.0 - 6.0 * 102.0 * 1.001)
+    assert broker.value() == pytest.approx(broker.cash + 6.0 * 105.0)
+    # Shorts credit their proceeds, so a sell is accepted even with little cash.
+    assert broker.submit(_order("sell", 8.0), price=105.0)
+    assert broker.pending and broker.summary()["fills"] == 1.0
+
+
+def test_slow_background_task_is_skipped_not_queued(bars):
+    data = bars(20)
+    release = threading.Event()
+    calls = []
+
+    def slow(event):
+        calls.append(event.timestamp)
+        release.wait(5)
+        return {"sentiment_mean": 0.5}
+
+    feed = QueueFeed()
+    loop = LiveTradingLoop(feed=feed, strategies=[], config=LiveConfig(warmup_bars=1), background={"slow": slow})
+
+    async def run():
+        task = asyncio.create_task(loop.run())
+        for stamp, row in zip(data.index, data.to_dict("records")):
+            await feed.put(stamp, row)
+        while loop.bars < len(data):
+            await asyncio.sleep(0.01)
+        release.set()
+        await feed.close()
+        return await task
+
+    metrics = asyncio.run(run())
+    assert calls == [data.index[0]]
+    assert loop.bars == len(data) and metrics["latency"]["bars"] == len(data)
+    assert loop.context == {"sentiment_mean": 0.5}
+
+
+def test_live_loop_schedules_sentiment_features(tmp_path, bars):
+    pytest.importorskip("vaderSentiment")
+    headlines = tmp_path / "headlines.csv"
+    headlines.write_text("timestamp,text\n2024-01-01T02:30:00Z,Great news as Bitcoin rallies\n", encoding="utf-8")
+    sentiment = replace(DEFAULT_CONFIG.sentiment, include_features=True, headline_paths=[headlines])
+    bot = TradingBot(replace(DEFAULT_CONFIG, sentiment=sentiment, data=replace(DEFAULT_CONFIG.data, cache_dir=tmp_path)))
+
+    data = bars(6)
+    feed = QueueFeed()
+    loop = bot.live_loop(feed, use_model=False)
+    assert list(loop.background) == ["sentiment"]
+
+    async def run():
+        task = asyncio.create_task(loop.run())
+        await feed.put(data.index[-1], data.iloc[-1].to_dict())
+        await feed.close()
+        return await task
+
+    asyncio.run(run())
+    assert list(loop.context) == SENTIMENT_COLUMNS
+    assert loop.context["sentiment_count"] == 1.0 and loop.context["sentiment_mean"] > 0
@@ -0,0 +1,59 @@
+import logging
+
+import pytest
+
+from ai_trading_bot.utils import logger as logger_module
+from ai_trading_bot.utils.config import LoggingConfig
+from ai_trading_bot.utils.logger import RateLimitFilter
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _record(msg, args):
+    return logging.LogRecord("ai_trading_bot.test.bars", logging.INFO, __file__, 1, msg, args, None)
+
+
+@pytest.mark.parametrize(
+    "msg, args, expected",
+    [
+        ("filled %s", ("100%",), "filled 100%"),
+        ("ratio 50%% of %d", (8,), "ratio 50% of 8"),
+        ("bar %(n)d", ({"n": 3},), "bar 3"),
+    ],
+)
+def test_suppressed_count_survives_percent_signs(msg, args, expected):
+    clock = FakeClock()
+    limiter = RateLimitFilter(rate=1.0, burst=1, clock=clock)
+    assert limiter.filter(_record(msg, args))
+    assert not limiter.filter(_record(msg, args))
+    assert not limiter.filter(_record(msg, args))
+    clock.now = 1.0
+    record = _record(msg, args)
+    assert limiter.filter(record)
+    assert record.getMessage() == f"{expected} (2 similar suppressed)"
+
+
+def test_sampling_passes_one_in_n():
+    limiter = RateLimitFilter(sample_every=3)
+    passed = [limiter.filter(_record("bar %d", (i,))) for i in range(7)]
+    assert passed == [True, False, False, True, False, False, True]
+
+
+def test_shutdown_closes_the_log_file(tmp_path):
+    previous = logger_module._CONFIG
+    try:
+        logger_module.configure_logging(LoggingConfig(log_dir=tmp_path, console=False))
+        listener = logger_module._LISTENER
+        logger_module.get_logger("test").info("written before shutdown")
+        logger_module.shutdown_logging()
+        (handler,) = listener.handlers
+        assert handler.stream is None
+        assert "written before shutdown" in (tmp_path / "trading_bot.log").read_text()
+    finally:
+        logger_module.configure_logging(previous)
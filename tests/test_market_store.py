@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import List, Tuple
+
+import pandas as pd
+import pytest
+
+from ai_trading_bot.utils.config import DataSourceConfig
+from ai_trading_bot.utils.data_loader import DataLoader
+from ai_trading_bot.utils.market_store import MarketDataStore
+
+
+class FakeFetcher:
+    """Serves ``bars`` like a data provider and records every requested range."""
+
+    def __init__(self, bars: pd.DataFrame):
+        self.bars = bars
+        self.calls: List[Tuple[datetime, datetime]] = []
+
+    def __call__(self, symbol: str, interval: str, start: datetime, end: datetime) -> pd.DataFrame:
+        self.calls.append((start, end))
+        index = self.bars.index.tz_convert(None)
+        return self.bars[(index >= start) & (index < end)].copy()
+
+
+def _recent(bars: pd.DataFrame) -> pd.DataFrame:
+    end = pd.Timestamp.now(tz="UTC").floor("h")
+    n = len(bars)
+    bars.index = pd.date_range(end=end, periods=n, freq="h", tz="UTC", name="timestamp")
+    return bars
+
+
+@pytest.fixture
+def loader(tmp_path, bars):
+    bars = _recent(bars(24 * 70, seed=5))
+    history, latest = bars.iloc[:-5], bars
+    fetcher = FakeFetcher(history)
+    loader = DataLoader(DataSourceConfig(symbol="TEST", cache_dir=tmp_path, lookback_days=60), fetcher=fetcher)
+    return loader, fetcher, latest
+
+
+def test_first_load_fills_month_partitions(loader):
+    loader, fetcher, _ = loader
+    frame = loader.load_historical_data()
+    assert len(fetcher.calls) == 1
+    months = {meta.month for meta in loader.store.partitions("TEST", "1h")}
+    assert months == set(frame.index.strftime("%Y-%m"))
+    pd.testing.assert_frame_equal(frame, fetcher.bars.loc[frame.index[0] :], check_freq=False)
+
+    # A second load is served from the store.
+    pd.testing.assert_frame_equal(loader.load_historical_data(), frame)
+    assert len(fetcher.calls) == 1
+
+
+def test_update_fetches_only_new_bars(loader):
+    loader, fetcher, latest = loader
+    loader.load_historical_data()
+    fetcher.bars = latest
+    assert loader.update_historical_data() == 5
+    start, _ = fetcher.calls[-1]
+    assert pd.Timestamp(start, tz="UTC") == latest.index[-6]
+    assert loader.store.last_timestamp("TEST", "1h") == latest.index[-1]
+    assert loader.update_historical_data() == 0
+
+
+def test_load_range_prunes_rows_and_columns(loader):
+    loader, fetcher, _ = loader
+    loader.load_historical_data()
+    start, end = fetcher.bars.index[-100], fetcher.bars.index[-50]
+    frame = loader.load_range(start, end, columns=["close"])
+    assert list(frame.columns) == ["close"]
+    assert frame.index[0] == start and frame.index[-1] <= end
+    pd.testing.assert_series_equal(frame["close"], fetcher.bars.loc[start:end, "close"].loc[frame.index], check_freq=False)
+
+
+def test_is_stale_reads_metadata_only(loader):
+    loader, fetcher, _ = loader
+    loader.load_historical_data()
+    last = fetcher.bars.index[-1]
+    assert not loader.is_stale(now=last + timedelta(minutes=30))
+    assert loader.is_stale(now=last + timedelta(hours=2))
+
+
+def test_overlapping_writes_keep_the_latest_rows(tmp_path, bars):
+    store = MarketDataStore(tmp_path)
+    bars = bars(100)
+    store.write("TEST", "1h", bars)
+    revised = bars.iloc[-10:] * 2
+    store.write("TEST", "1h", revised)
+    stored = store.read("TEST", "1h")
+    assert len(stored) == len(bars)
+    pd.testing.assert_frame_equal(stored.iloc[-10:], revised, check_freq=False)
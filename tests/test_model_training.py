@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_trading_bot.ml_engine import model_training
+from ai_trading_bot.ml_engine.model_training import MLSignalModel
+
+COLUMNS = ["close", "volume", "rsi_14", "obv"]
+
+
+@pytest.fixture
+def fitted():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(400, len(COLUMNS))), columns=COLUMNS)
+    y = pd.Series(np.where(X["close"] > 0.3, "buy", np.where(X["close"] < -0.3, "sell", "hold")))
+    model = MLSignalModel(params={"n_estimators": 20, "max_depth": 5, "random_state": 0})
+    model.fit(X, y)
+    return model, X
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_load_round_trip(tmp_path, fitted, mmap):
+    model, X = fitted
+    model.save(tmp_path)
+    meta = json.loads((tmp_path / model_training._META_FILE).read_text())
+    buffers = (tmp_path / model_training._BUFFER_FILE).stat().st_size
+    # Node arrays travel out-of-band, each aligned inside the buffers file.
+    assert meta["buffers"]
+    assert all(start % model_training._ALIGNMENT == 0 and start + size <= buffers for start, size in meta["buffers"])
+    assert (tmp_path / model_training._MODEL_FILE).stat().st_size < buffers
+    assert meta["feature_columns"] == COLUMNS
+
+    loaded = MLSignalModel.load(tmp_path, expected_columns=COLUMNS, mmap=mmap)
+    assert loaded.params == model.params
+    assert loaded.feature_columns() == COLUMNS
+    assert np.array_equal(loaded.model.predict_proba(X), model.model.predict_proba(X))
+    labels, confidence = loaded.predict_batch(X)
+    expected_labels, expected_confidence = model.predict_batch(X)
+    assert np.array_equal(labels, expected_labels) and np.array_equal(confidence, expected_confidence)
+
+
+def test_load_rejects_a_different_schema(tmp_path, fitted):
+    model, _ = fitted
+    model.save(tmp_path)
+    with pytest.raises(ValueError, match="different feature schema"):
+        MLSignalModel.load(tmp_path, expected_columns=COLUMNS[::-1])
+
+    meta_path = tmp_path / model_training._META_FILE
+    meta = json.loads(meta_path.read_text())
+    meta_path.write_text(json.dumps({**meta, "feature_hash": "0" * 16}))
+    with pytest.raises(ValueError, match="different feature schema"):
+        MLSignalModel.load(tmp_path, expected_columns=COLUMNS)
+
+    meta_path.write_text(json.dumps({**meta, "schema_version": model_training.MODEL_SCHEMA_VERSION + 1}))
+    with pytest.raises(ValueError, match="schema version"):
+        MLSignalModel.load(tmp_path, expected_columns=COLUMNS)
+
+
+def test_load_without_a_saved_model(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        MLSignalModel.load(tmp_path / "missing")
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+optuna = pytest.importorskip("optuna")
+
+from ai_trading_bot.ml_engine import optimization
+from ai_trading_bot.ml_engine.optimization import HyperparameterOptimizer
+
+
+@pytest.fixture
+def dataset():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(90, 3)), columns=["a", "b", "c"])
+    y = pd.Series(np.where(X["a"] > 0.3, "buy", np.where(X["a"] < -0.3, "sell", "hold")))
+    return X, y
+
+
+def _finished(optimizer: HyperparameterOptimizer) -> int:
+    study = optuna.load_study(study_name=optimizer.study_name, storage=optimization._make_storage(optimizer.storage))
+    return len(study.get_trials(deepcopy=False, states=optimization._FINISHED_STATES))
+
+
+def test_journal_study_resumes_and_caps_parallel_workers(tmp_path, dataset):
+    X, y = dataset
+    storage = str(tmp_path / "study.journal")
+    first = HyperparameterOptimizer(n_trials=2, storage=storage, n_jobs=1, cv=2)
+    params, score = first.optimize(X, y)
+    assert _finished(first) == 2 and 0.0 <= score <= 1.0 and "max_depth" in params
+
+    # Resuming with the same total adds nothing; a larger total only runs the difference, and
+    # workers sharing the journal stop at the total rather than each running it.
+    assert first.optimize(X, y)[1] == score
+    assert _finished(first) == 2
+    parallel = HyperparameterOptimizer(n_trials=5, storage=storage, n_workers=2, n_jobs=1, cv=2)
+    _, best = parallel.optimize(X, y)
+    assert _finished(parallel) == 5 and best >= score
+
+    # A worker asked for more trials than the total still stops there.
+    optimization._run_worker(first.study_name, storage, X, y, 2, 1, n_trials=6, share=5)
+    assert _finished(first) == 6
+
+
+def test_parallel_search_needs_a_storage(dataset):
+    with pytest.raises(ValueError, match="storage"):
+        HyperparameterOptimizer(n_workers=2).optimize(*dataset)
+
+
+def test_all_pruned_study_is_an_error(monkeypatch, dataset):
+    def objective_factory(*args):
+        def objective(trial):
+            trial.suggest_int("max_depth", 4, 12)
+            raise optuna.TrialPruned()
+
+        return objective
+
+    monkeypatch.setattr(optimization, "_make_objective", objective_factory)
+    with pytest.raises(ValueError, match="No trial"):
+        HyperparameterOptimizer(n_trials=3, cv=2).optimize(*dataset)
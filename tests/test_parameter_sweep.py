@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import pytest
+
+from ai_trading_bot.backtest.backtest_runner import BacktestRunner
+from ai_trading_bot.backtest.parameter_sweep import ParameterSweep, build_strategies, grid_samples
+from ai_trading_bot.utils.config import BacktestConfig
+
+GRID = {"trend_following.rsi_upper": [60.0, 75.0], "mean_reversion.rsi_lower": [25.0, 35.0]}
+
+
+@pytest.mark.parametrize("engine", ["vectorized", "backtrader"])
+def test_parallel_sweep_matches_serial_runs(bars, engine):
+    data = bars(1500, seed=4)
+    config = BacktestConfig(engine=engine, risk_per_trade=0.05)
+    samples = grid_samples(GRID)
+    sweep = ParameterSweep(samples=samples, config=config, max_workers=2)
+    completed = []
+    table = sweep.run(data, on_result=lambda row, rank, count: completed.append(count))
+
+    assert completed == list(range(1, len(samples) + 1))
+    assert list(table.index) == list(range(1, len(samples) + 1))
+    assert table["return_pct"].is_monotonic_decreasing
+    # Workers see the shared-memory frame; a serial runner sees the original.
+    by_params = {tuple(row[name] for name in GRID): row for row in table.to_dict("records")}
+    for params in samples:
+        runner = BacktestRunner(
+            cash=config.initial_cash,
+            commission=config.commission,
+            risk_per_trade=config.risk_per_trade,
+            strategies=build_strategies(sweep.strategies, params),
+            engine=engine,
+        )
+        expected = runner.run(data)
+        got = by_params[tuple(params.values())]
+        assert {key: got[key] for key in expected} == pytest.approx(expected, rel=1e-12)
+
+
+def test_sweep_rejects_unknown_strategies(bars):
+    with pytest.raises(ValueError, match="Unknown strategy"):
+        list(ParameterSweep(samples=[{}], strategies=["nope"]).iter_results(bars(10)))
+    with pytest.raises(ValueError, match="not part of the sweep"):
+        build_strategies(["breakout"], {"trend_following.rsi_upper": 70.0})
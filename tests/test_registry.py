@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from ai_trading_bot.indicators import registry
+from ai_trading_bot.indicators.cache import IndicatorCache
+from ai_trading_bot.indicators.registry import (
+    Indicator,
+    indicator_columns,
+    lookahead_columns,
+    plan,
+    register,
+    register_session,
+)
+from ai_trading_bot.indicators.sessions import SESSIONS, Session
+
+
+@pytest.fixture
+def scratch_registry():
+    """Undo registrations made by a test."""
+
+    registry_before, aliases_before, sessions_before = dict(registry.REGISTRY), dict(registry.ALIASES), dict(SESSIONS)
+    yield
+    for table, before in ((registry.REGISTRY, registry_before), (registry.ALIASES, aliases_before), (SESSIONS, sessions_before)):
+        table.clear()
+        table.update(before)
+    plan.cache_clear()
+
+
+def _names(columns):
+    return [node.name for node in plan(tuple(columns)).nodes]
+
+
+def test_plan_orders_dependencies_and_shares_nodes():
+    nodes = _names(["rsi_14", "obv", "vwap"])
+    assert nodes.count("price_change") == 1 and nodes.count("typical_price") == 1
+    assert nodes.index("price_change") < nodes.index("rsi") and nodes.index("price_change") < nodes.index("obv")
+    assert nodes.index("typical_price") < nodes.index("vwap")
+    # Bar columns need no node.
+    assert _names(["close", "volume"]) == []
+
+
+def test_plan_warmup_adds_up_chained_nodes():
+    assert plan(("rsi_14",)).warmup == 15  # 14 changes need 15 bars
+    assert plan(("ema_20", "bb_upper", "volume_ma_30")).warmup == 60
+    assert plan(("ema_50", "rsi_14")).warmup == 150
+    # Unbounded nodes (cumulative, calendar sessions) add nothing; higher timeframes are ignored.
+    assert plan(("obv",)).warmup == 1
+    assert plan(("asia_high", "close@4h")).warmup == 0
+
+
+def test_lookahead_columns_flags_completed_session_levels():
+    assert lookahead_columns(["asia_high", "asia_running_high", "range_low", "vwap", "london_vwap"]) == (
+        "asia_high",
+        "range_low",
+        "london_vwap",
+    )
+    assert lookahead_columns(["asia_running_low", "london_running_vwap", "rsi_14"]) == ()
+
+
+def test_alias_resolves_to_the_same_values(bars):
+    df = bars(500)
+    cache = IndicatorCache()
+    columns = indicator_columns(df, ["range_high", "asia_high", "range_low", "asia_low"], cache)
+    np.testing.assert_array_equal(columns["range_high"].to_numpy(), columns["asia_high"].to_numpy())
+    np.testing.assert_array_equal(columns["range_low"].to_numpy(), columns["asia_low"].to_numpy())
+    # Renamed requests resolve the alias too.
+    renamed = indicator_columns(df, {"breakout_high": "range_high"}, cache)
+    np.testing.assert_array_equal(renamed["breakout_high"].to_numpy(), columns["asia_high"].to_numpy())
+
+
+def test_register_session_adds_columns_and_taints_consumers(bars, scratch_registry):
+    register_session(Session("tokyo", "09:00", "15:00", "Asia/Tokyo"))
+    register(
+        Indicator(
+            "tokyo_mid",
+            ("tokyo_mid",),
+            ("tokyo_high", "tokyo_low"),
+            lambda c: (c["tokyo_high"] + c["tokyo_low"]) / 2,
+        )
+    )
+    assert registry.registered("tokyo_running_vwap") and registry.registered("tokyo_mid")
+    # Built on the completed session range, so it leaks later bars as well.
+    assert lookahead_columns(["tokyo_mid", "tokyo_running_high"]) == ("tokyo_mid",)
+
+    df = bars(200)
+    columns = indicator_columns(df, ["tokyo_mid", "tokyo_high", "tokyo_low"])
+    np.testing.assert_allclose(columns["tokyo_mid"], (columns["tokyo_high"] + columns["tokyo_low"]) / 2)
+    assert columns["tokyo_high"].notna().any()
+
+    with pytest.raises(ValueError, match="already registered"):
+        register_session(Session("tokyo", "09:00", "15:00", "Asia/Tokyo"))
+
+
+def test_dependency_cycles_are_rejected(scratch_registry):
+    register(Indicator("a", ("cycle_a",), ("cycle_b",), lambda c: c["cycle_b"]))
+    register(Indicator("b", ("cycle_b",), ("cycle_a",), lambda c: c["cycle_a"]))
+    with pytest.raises(ValueError, match="cycle"):
+        plan(("cycle_a",))
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from ai_trading_bot.strategies.scanner import build_panel, default_strategies, scan_panel
+
+KEYS = ["symbol", "strategy", "signal", "confidence", "reason", "timestamp", "close"]
+
+
+def _expected(frames, strategies):
+    rows = set()
+    for symbol, frame in frames.items():
+        for strategy in strategies:
+            result = strategy.generate_signal(frame)
+            if result is not None:
+                last = frame.index[-1]
+                close = frame["close"].iloc[-1]
+                rows.add((symbol, strategy.name, result.signal, result.confidence, result.reason, last, close))
+    return rows
+
+
+@pytest.fixture
+def frames(bars):
+    rng = np.random.default_rng(11)
+    frames = {}
+    for k in range(60):
+        frame = bars(900, seed=100 + k, volatility=0.02)
+        if k % 7 == 1:
+            frame = frame.iloc[150:]  # listed later
+        if k % 11 == 2:
+            frame = frame.iloc[:-3]  # stale
+        if k % 5 == 3:
+            # Gaps: bars the other symbols have, inside this symbol's history.
+            dropped = rng.choice(np.arange(len(frame) - 40, len(frame) - 2), 4, replace=False)
+            frame = frame.drop(frame.index[dropped])
+        frames[f"S{k}"] = frame
+    return frames
+
+
+def test_scan_matches_per_symbol_signals(frames):
+    strategies = default_strategies()
+    table = scan_panel(build_panel(frames), strategies)
+    got = {tuple(row) for row in table[KEYS].itertuples(index=False)}
+    expected = _expected(frames, strategies)
+    assert expected, "the fixture should produce signals"
+    assert got == expected
+    assert list(table.index) == list(range(1, len(table) + 1))
+    assert table["score"].is_monotonic_decreasing
+
+
+def test_symbols_with_identical_gaps_share_a_panel(frames):
+    gapped = {symbol: frame for symbol, frame in frames.items() if symbol in ("S3", "S8")}
+    common = gapped["S3"].index.intersection(gapped["S8"].index)
+    gapped = {symbol: frame.loc[common] for symbol, frame in gapped.items()}
+    strategies = default_strategies()
+    table = scan_panel(build_panel({**gapped, "S0": frames["S0"]}), strategies)
+    got = {tuple(row) for row in table[KEYS].itertuples(index=False)}
+    assert got == _expected({**gapped, "S0": frames["S0"]}, strategies)
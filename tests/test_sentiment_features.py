@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_trading_bot.ml_engine.feature_engineering import SENTIMENT_COLUMNS
+from ai_trading_bot.sentiment.features import SentimentFeaturePipeline, load_headlines
+
+WORDS = ["rally", "crash", "flat", "surge", "hack", "etf", "halving"]
+
+
+def _fake_scores(calls):
+    def score(texts):
+        calls.append(list(texts))
+        # Deterministic scores in [-1, 1] from the text itself.
+        return [(sum(map(ord, text)) % 201 - 100) / 100.0 for text in texts]
+
+    return score
+
+
+@pytest.fixture
+def headlines(bars):
+    index = bars(24 * 10).index
+    rng = np.random.default_rng(3)
+    stamps = index[0] + pd.to_timedelta(np.sort(rng.uniform(0, 24 * 10 * 3600, 300)), unit="s")
+    # Some headlines land exactly on a bar and count for that bar.
+    stamps = stamps.append(index[[5, 50, 51, 200]]).sort_values()
+    texts = [" ".join(rng.choice(WORDS, 3)) for _ in range(len(stamps))]
+    return pd.DataFrame({"text": texts}, index=pd.DatetimeIndex(stamps, name="timestamp")).sort_index(kind="stable")
+
+
+def _reference(index, headlines, scores, window, halflife):
+    rows = []
+    for bar in index:
+        seen = headlines.index <= bar
+        recent = seen & (headlines.index > bar - pd.Timedelta(window))
+        age = (bar - headlines.index[seen]) / pd.Timedelta(halflife)
+        rows.append(
+            [
+                scores[recent].mean() if recent.any() else 0.0,
+                float(recent.sum()),
+                float((scores[seen] * 0.5 ** age.to_numpy()).sum()),
+            ]
+        )
+    return np.array(rows)
+
+
+@pytest.mark.parametrize("window,halflife", [("24h", "6h"), ("3h", "30min")])
+def test_features_are_as_of_the_bar(tmp_path, bars, headlines, window, halflife):
+    pipeline = SentimentFeaturePipeline(tmp_path, window=window, halflife=halflife)
+    pipeline._score_texts = _fake_scores([])
+    index = bars(24 * 10).index
+    features = pipeline.features(index, headlines)
+
+    assert list(features.columns) == SENTIMENT_COLUMNS and features.index.equals(index)
+    scores = pipeline.score(headlines).to_numpy()
+    expected = _reference(index, headlines, scores, window, halflife)
+    np.testing.assert_allclose(features.to_numpy(), expected, rtol=1e-9, atol=1e-12)
+    # A bar sees a headline stamped at its own time, not one a second later.
+    stamp = index[5]
+    assert features.loc[stamp, "sentiment_count"] == ((headlines.index <= stamp) & (headlines.index > stamp - pd.Timedelta(window))).sum()
+    assert features.loc[index[0], "sentiment_count"] == 0.0
+
+
+def test_scores_are_cached_by_normalised_text(tmp_path, headlines):
+    calls = []
+    pipeline = SentimentFeaturePipeline(tmp_path)
+    pipeline._score_texts = _fake_scores(calls)
+    first = pipeline.score(headlines)
+    distinct = headlines["text"].nunique()
+    assert len(calls) == 1 and len(calls[0]) == distinct
+    assert pipeline.cache_path.exists()
+    assert len(pd.read_parquet(pipeline.cache_path)) == distinct
+
+    # A new pipeline reads the Parquet cache and only scores unseen text.
+    again = SentimentFeaturePipeline(tmp_path)
+    again._score_texts = _fake_scores(calls)
+    more = pd.concat(
+        [headlines, pd.DataFrame({"text": ["  RALLY rally  rally ", "a brand new headline"]}, index=headlines.index[-2:])]
+    )
+    scores = again.score(more)
+    assert calls[1:] == [["a brand new headline"]]
+    pd.testing.assert_series_equal(scores.iloc[: len(headlines)], first)
+    assert scores.iloc[-2] == first[headlines["text"] == "rally rally rally"].iloc[0]
+
+
+def test_no_headlines_are_neutral(tmp_path, bars):
+    index = bars(10).index
+    features = SentimentFeaturePipeline(tmp_path).features(index, load_headlines([]))
+    assert (features.to_numpy() == 0.0).all() and features.index.equals(index)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_trading_bot.indicators.sessions import (
+    NO_SESSION,
+    SESSIONS,
+    Session,
+    session_id,
+    session_ids,
+    session_levels,
+    session_range,
+    session_vwap,
+)
+
+
+def _reference_ids(index: pd.DatetimeIndex, session: Session) -> np.ndarray:
+    """Session day per bar from a plain ``tz_convert`` and Python time arithmetic."""
+
+    local = index.tz_convert(session.tz) if session.tz is not None else index
+    start, end = (pd.Timedelta(f"{clock}:00") for clock in (session.start, session.end))
+    ids = []
+    for stamp in local:
+        # Wall-clock fields: ``stamp - stamp.normalize()`` would count the hour a DST switch skips.
+        clock = pd.Timedelta(hours=stamp.hour, minutes=stamp.minute, seconds=stamp.second)
+        day = (stamp.tz_localize(None).normalize() - pd.Timestamp("1970-01-01")).days
+        if start <= end:
+            ids.append(day if start <= clock <= end else NO_SESSION)
+        elif clock >= start:
+            ids.append(day)
+        else:
+            ids.append(day - 1 if clock <= end else NO_SESSION)
+    return np.array(ids, dtype=np.int64)
+
+
+def _check(index: pd.DatetimeIndex, session: Session) -> np.ndarray:
+    ids = session_ids(index, session)
+    np.testing.assert_array_equal(ids, _reference_ids(index, session))
+    scalar = [session_id(stamp, session) for stamp in index]
+    np.testing.assert_array_equal([NO_SESSION if value is None else value for value in scalar], ids)
+    return ids
+
+
+@pytest.mark.parametrize("day", ["2024-03-31", "2024-10-27"])
+def test_london_session_follows_daylight_saving(day):
+    index = pd.date_range(pd.Timestamp(day) - pd.Timedelta(days=2), periods=4 * 24 * 5, freq="15min", tz="UTC")
+    ids = _check(index, SESSIONS["london"])
+    opens = index[np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]] & (ids != NO_SESSION))]
+    # 08:00 in London is 08:00 UTC in winter and 07:00 UTC in summer.
+    hours = {stamp.date().isoformat(): stamp.hour for stamp in opens}
+    before, after = (7, 8) if day.startswith("2024-10") else (8, 7)
+    assert hours[(pd.Timestamp(day) - pd.Timedelta(days=1)).date().isoformat()] == before
+    assert hours[(pd.Timestamp(day) + pd.Timedelta(days=1)).date().isoformat()] == after
+
+
+def test_overnight_window_belongs_to_its_start_day():
+    session = Session("night", "22:00", "02:00")
+    index = pd.date_range("2024-01-01", periods=72, freq="h", tz="UTC")
+    ids = _check(index, session)
+    by_hour = dict(zip(index.strftime("%m-%d %H"), ids))
+    first = by_hour["01-01 22"]
+    assert by_hour["01-01 23"] == by_hour["01-02 00"] == by_hour["01-02 02"] == first
+    assert by_hour["01-02 03"] == by_hour["01-01 21"] == NO_SESSION
+    assert by_hour["01-01 01"] == first - 1  # the window that opened on Dec 31
+
+
+@pytest.mark.parametrize(
+    "session",
+    [
+        Session("kathmandu", "09:15", "15:00", "Asia/Kathmandu"),  # +05:45
+        Session("lord_howe", "10:00", "16:00", "Australia/Lord_Howe"),  # half-hour DST shift
+        Session("tokyo_overnight", "20:00", "03:00", "Asia/Tokyo"),
+    ],
+)
+def test_odd_offsets_and_unaligned_bars(session):
+    # Minute bars at odd seconds across the Lord Howe DST switch of 2024-04-07.
+    index = pd.date_range("2024-04-05 00:00:07", periods=60 * 24 * 4, freq="min", tz="UTC")
+    _check(index, session)
+
+
+def test_naive_index_reads_as_utc():
+    index = pd.date_range("2024-03-29", periods=24 * 5, freq="h")
+    np.testing.assert_array_equal(
+        session_ids(index, SESSIONS["london"]), _reference_ids(index.tz_localize("UTC"), SESSIONS["london"])
+    )
+
+
+def test_session_range_and_vwap_match_a_groupby(bars):
+    df = bars(24 * 20, freq="h", start="2024-03-20")
+    df.iloc[[34, 35], df.columns.get_loc("volume")] = np.nan  # inside the 2024-03-21 session
+    ids = session_ids(df.index, SESSIONS["london"])
+    price = (df["high"] + df["low"] + df["close"]) / 3
+    ranges = session_range(df["high"], df["low"], ids)
+    vwap = session_vwap(price, df["volume"], ids)
+
+    inside = df.assign(session=ids, price=price)[ids != NO_SESSION]
+    groups = inside.groupby("session")
+    weights = inside["volume"].fillna(0.0)
+    weighted = inside["price"] * weights
+    expected = pd.DataFrame(
+        {
+            "high": groups["high"].transform("max"),
+            "low": groups["low"].transform("min"),
+            "running_high": groups["high"].cummax(),
+            "running_low": groups["low"].cummin(),
+            "vwap": weighted.groupby(inside["session"]).transform("sum") / weights.groupby(inside["session"]).transform("sum"),
+            "running_vwap": weighted.groupby(inside["session"]).cumsum() / weights.groupby(inside["session"]).cumsum(),
+        }
+    )
+    # Outside the session every column carries the last session's value.
+    expected = expected.reindex(df.index).ffill()
+    got = pd.concat([ranges, vwap], axis=1)[expected.columns]
+    np.testing.assert_allclose(got.to_numpy(), expected.to_numpy(), rtol=1e-12)
+    assert got.iloc[: np.flatnonzero(ids != NO_SESSION)[0]].isna().all().all()
+
+
+def test_frames_without_session_bars(bars):
+    df = bars(5, start="2024-01-01 00:00")  # before the London open
+    levels = session_levels(df, [SESSIONS["london"]])
+    assert levels.shape == (5, 6) and levels.isna().all().all()
+    assert session_levels(df.iloc[:0], [SESSIONS["london"]]).shape == (0, 6)
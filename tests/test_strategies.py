@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from ai_trading_bot.indicators.cache import IndicatorCache
+from ai_trading_bot.strategies.breakout import BreakoutStrategy
+from ai_trading_bot.strategies.orderflow import OrderflowStrategy
+from ai_trading_bot.strategies.reversion import MeanReversionStrategy
+from ai_trading_bot.strategies.trend_following import TrendFollowingStrategy
+
+# (strategy, whether the bars carry aggressor buy/sell volume)
+CASES = [
+    (TrendFollowingStrategy(volume_threshold=1.0), False),
+    (BreakoutStrategy(), False),
+    (BreakoutStrategy(session="london", volume_multiplier=1.0), False),
+    (MeanReversionStrategy(), False),
+    (OrderflowStrategy(), False),
+    (OrderflowStrategy(), True),
+]
+
+
+def _case_id(case):
+    strategy, aggressor = case
+    return "-".join(filter(None, [strategy.name, getattr(strategy, "session", ""), "aggressor" if aggressor else ""]))
+
+
+def _per_bar(strategy, data):
+    rows = []
+    for i in range(len(data)):
+        try:
+            result = strategy.generate_signal(data.iloc[: i + 1])
+        except IndexError:  # a single bar has no previous row
+            result = None
+        rows.append((None, 0.0, None) if result is None else (result.signal, result.confidence, result.reason))
+    return rows
+
+
+@pytest.mark.parametrize("strategy,aggressor", CASES, ids=list(map(_case_id, CASES)))
+def test_vectorized_signals_match_the_per_bar_rule(bars, strategy, aggressor):
+    data = bars(400, seed=6, volatility=0.02)
+    if aggressor:
+        share = np.random.default_rng(7).uniform(0.2, 0.8, len(data))
+        data = data.assign(buy_volume=data["volume"] * share, sell_volume=data["volume"] * (1 - share))
+
+    frame = strategy.generate_signals(data, cache=IndicatorCache())
+    expected = _per_bar(strategy, data)
+
+    assert frame.index.equals(data.index)
+    assert list(frame.itertuples(index=False, name=None)) == expected
+    # The comparison covers both directions.
+    assert {"buy", "sell"} <= set(frame["signal"].dropna())
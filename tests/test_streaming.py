@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import json
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ai_trading_bot.indicators.streaming import (
+    RollingWindow,
+    StreamingIndicatorEngine,
+    compare_with_batch,
+    replay,
+)
+from ai_trading_bot.main import TradingBot
+
+
+def test_streaming_matches_batch(bars):
+    deviations = compare_with_batch(bars(3000))
+    assert deviations and all(math.isfinite(value) for value in deviations.values())
+
+
+def test_streaming_matches_batch_at_btc_prices(bars):
+    # An absolute tolerance: a relative one scales with the price and hides cancellation.
+    compare_with_batch(bars(3000, seed=1, price=65_000.0, volatility=1e-5), rtol=0.0, atol=1e-6)
+
+
+def test_rolling_std_at_btc_prices():
+    rng = np.random.default_rng(0)
+    values = 65_000 + np.cumsum(rng.normal(0, 0.5, 5000))
+    values[2500] = np.nan
+    window = RollingWindow(20)
+    streamed = []
+    for value in values:
+        window.update(value)
+        streamed.append(window.std(ddof=0))
+    expected = np.r_[np.full(19, np.nan), sliding_window_view(values, 20).std(axis=1)]
+    np.testing.assert_allclose(streamed, expected, rtol=0, atol=1e-7)
+
+
+def test_snapshot_restore_resumes_the_stream(bars):
+    df = bars(1500, seed=2)
+    first = StreamingIndicatorEngine()
+    head = replay(df.iloc[:900], first)
+    resumed = StreamingIndicatorEngine()
+    resumed.restore(json.loads(json.dumps(first.snapshot(), default=str)))
+    tail = replay(df.iloc[900:], resumed)
+    pd.testing.assert_frame_equal(pd.concat([head, tail]), replay(df), check_exact=False, rtol=1e-9)
+
+
+@pytest.mark.parametrize("strategy", TradingBot().strategies, ids=lambda strategy: strategy.name)
+def test_streaming_signals_match_generate_signals(bars, strategy):
+    df = bars(2500, seed=3)
+    streamed = replay(df)
+    merged = pd.concat([df, streamed.drop(columns=[c for c in streamed.columns if c in df.columns])], axis=1)
+    rows = merged.to_dict("records")
+    expected = strategy.generate_signals(df)["signal"].to_numpy()
+    for i in range(60, len(df)):
+        result = strategy.evaluate_streaming(rows[i], rows[i - 1])
+        assert (None if result is None else result.signal) == expected[i], i
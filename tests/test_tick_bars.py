@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_trading_bot.utils.tick_bars import TickBarBuilder
+
+
+def _trades(n: int = 3_000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    # Irregular arrivals with bursts and gaps longer than a bar; prices on a 0.5 grid so zero ticks occur.
+    gaps = rng.exponential(400.0, n) * np.where(rng.random(n) < 0.01, 200.0, 1.0)
+    price = 100.0 + 0.5 * np.cumsum(rng.integers(-1, 2, n))
+    return pd.DataFrame(
+        {
+            "timestamp": (1_700_000_000_000 + np.cumsum(gaps)).astype(np.int64),
+            "price": price,
+            "size": rng.gamma(2.0, 0.5, n).round(3),
+            "side": rng.choice(["buy", "sell"], n),
+        }
+    )
+
+
+def _build(trades: pd.DataFrame, chunk: int, **kwargs) -> pd.DataFrame:
+    builder = TickBarBuilder(**kwargs)
+    return builder.build(trades.iloc[i : i + chunk] for i in range(0, len(trades), chunk))
+
+
+@pytest.mark.parametrize(
+    "kind,size",
+    [("time", "1min"), ("volume", 25.0), ("tick", 37)],
+)
+def test_bars_do_not_depend_on_chunking(kind, size):
+    trades = _trades()
+    whole = _build(trades, len(trades), kind=kind, size=size, footprint_step=1.0)
+    assert len(whole.bars) > 20
+    assert whole.bars["trades"].sum() == len(trades)
+    for chunk in (7, 500, 1_001):
+        parts = _build(trades, chunk, kind=kind, size=size, footprint_step=1.0)
+        pd.testing.assert_frame_equal(parts.bars, whole.bars, check_dtype=False)
+        pd.testing.assert_frame_equal(parts.footprint, whole.footprint, check_dtype=False)
+
+
+def test_time_and_volume_bar_boundaries():
+    trades = _trades()
+    time_bars = _build(trades, 999, kind="time", size="1min").bars
+    stamps = pd.to_datetime(trades["timestamp"], unit="ms", utc=True)
+    expected = trades.groupby(stamps.dt.floor("1min").to_numpy()).agg(
+        open=("price", "first"), high=("price", "max"), low=("price", "min"), close=("price", "last"), volume=("size", "sum")
+    )
+    np.testing.assert_array_equal(time_bars.index.asi8, pd.DatetimeIndex(expected.index).as_unit("ns").asi8)
+    np.testing.assert_allclose(time_bars[expected.columns].to_numpy(), expected.to_numpy())
+
+    volume_bars = _build(trades, 999, kind="volume", size=25.0).bars
+    # Every bar but the last closes on the trade that crosses the next multiple of the size.
+    ends = np.cumsum(volume_bars["volume"].to_numpy())
+    starts = ends - volume_bars["volume"].to_numpy()
+    assert (np.floor(starts / 25.0) == np.arange(len(volume_bars))).all()
+    assert (ends[:-1] >= 25.0 * np.arange(1, len(volume_bars))).all()
+
+
+def test_aggressor_side_sources():
+    base = pd.DataFrame(
+        {"timestamp": np.arange(6) * 1_000, "price": [10.0, 10.5, 10.5, 10.0, 10.0, 10.5], "size": [1.0, 2, 3, 4, 5, 6]}
+    )
+    expected_buy = {"side": 1 + 3 + 6, "numeric": 1 + 3 + 6, "maker": 1 + 3 + 6, "tick": 1 + 2 + 3 + 6}
+
+    sides = {
+        "side": base.assign(side=["BUY", "sell", "b", "S", "sell", "buy"]),
+        "numeric": base.assign(side=[1, -1, 1, -1, -1, 1]),
+        "maker": base.assign(is_buyer_maker=[False, True, False, True, True, False]),
+        "tick": base,
+    }
+    for name, trades in sides.items():
+        bars = _build(trades, 2, kind="tick", size=6).bars
+        assert len(bars) == 1
+        row = bars.iloc[0]
+        assert row["buy_volume"] == expected_buy[name], name
+        # Every trade has a side, including the tick rule's opening trade.
+        assert row["buy_volume"] + row["sell_volume"] == row["volume"] == 21.0, name
+        assert row["delta"] == row["buy_volume"] - row["sell_volume"]
+
+
+def test_tick_rule_zero_ticks_repeat_across_chunks():
+    trades = pd.DataFrame({"timestamp": np.arange(5) * 1_000, "price": [10.0, 9.5, 9.5, 9.5, 10.0], "size": 1.0})
+    for chunk in (1, 2, 5):
+        bars = _build(trades, chunk, kind="tick", size=1).bars
+        np.testing.assert_array_equal(bars["delta"].to_numpy(), [1.0, -1.0, -1.0, -1.0, 1.0])
+
+
+def test_footprint_totals_match_bars():
+    trades = _trades()
+    result = _build(trades, 777, kind="volume", size=40.0, footprint_step=0.5)
+    footprint = result.footprint
+    assert (footprint["price"] % 0.5 == 0).all()
+    totals = footprint.groupby("bar")[["buy_volume", "sell_volume"]].sum()
+    np.testing.assert_allclose(totals.to_numpy(), result.bars[["buy_volume", "sell_volume"]].to_numpy())
+    # Each level sits inside its bar's range.
+    ranges = result.bars.loc[footprint["bar"], ["low", "high"]].to_numpy()
+    assert ((footprint["price"].to_numpy() <= ranges[:, 1]) & (footprint["price"].to_numpy() > ranges[:, 0] - 0.5)).all()
+
+
+def test_rejects_unsorted_ticks():
+    trades = _trades(100)
+    builder = TickBarBuilder(kind="tick", size=10)
+    builder.add(trades.iloc[50:])
+    with pytest.raises(ValueError, match="sorted"):
+        builder.add(trades.iloc[:50])
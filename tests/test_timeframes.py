@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_trading_bot.indicators.cache import IndicatorCache
+from ai_trading_bot.indicators.registry import indicator_columns
+
+COLUMNS = ["close@4h", "ema_20@4h", "high@4h", "volume@4h", "rsi_14@1d"]
+
+
+def _assert_same(got, expected):
+    for name, series in expected.items():
+        np.testing.assert_array_equal(got[name].to_numpy(), series.to_numpy(), err_msg=name)
+
+
+@pytest.fixture
+def series(bars):
+    first = bars(2400, seed=1)
+    # Gaps, and one half-hour bar that later slides out of the window and changes the bar length.
+    second = bars(2400, seed=2, price=40.0).drop(bars(2400).index[[300, 301, 950, 1777]])
+    second = second.rename(index={second.index[100]: second.index[100] - pd.Timedelta("30min")})
+    return first, second
+
+
+def test_sliding_window_matches_uncached(series):
+    first, second = series
+    cache = IndicatorCache()
+    for end in range(1000, 2400, 37):
+        for frame in (first.iloc[end - 1000 : end], second.iloc[end - 1000 : end], first.iloc[end - 600 : end]):
+            _assert_same(indicator_columns(frame, COLUMNS, cache), indicator_columns(frame, COLUMNS))
+    # One view per series and timeframe, shared by both windows of ``first``.
+    assert len(cache.views("4h")) == len(cache.views("1d")) == 2
+
+
+def test_growing_series_extends_its_view(series):
+    first, _ = series
+    cache = IndicatorCache()
+    indicator_columns(first.iloc[:1000], COLUMNS, cache)
+    ((key, view),) = cache.views("4h")
+    for end in range(1001, 1100):
+        frame = first.iloc[:end]
+        _assert_same(indicator_columns(frame, COLUMNS, cache), indicator_columns(frame, COLUMNS))
+    assert cache.views("4h") == [(key, view)]
+    assert len(view.bars) == 1099 // 4
+
+
+def test_views_count_towards_max_bytes(series):
+    first, second = series
+    cache = IndicatorCache(max_bytes=60_000)
+    indicator_columns(first.iloc[:2000], ["close@4h"], cache)
+    ((_, view),) = cache.views("4h")
+    assert cache.nbytes >= view.nbytes > 0
+    indicator_columns(second.iloc[:2000], ["close@4h"], cache)
+    assert cache.nbytes <= cache.max_bytes
+    assert len(cache.views("4h")) == 1
+    cache.clear()
+    assert cache.views("4h") == [] and cache.nbytes == 0
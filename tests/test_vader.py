@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+pytest.importorskip("vaderSentiment")
+
+from ai_trading_bot.sentiment import vader_analysis
+from ai_trading_bot.sentiment.vader_analysis import VaderSentimentAnalyzer
+
+LINES = ["Great news as Bitcoin rallies", "", "Terrible loss after exchange hack", "   ", "Markets are flat"]
+
+
+def test_blank_lines_keep_output_aligned_with_input(tmp_path):
+    source = tmp_path / "headlines.txt"
+    target = tmp_path / "scores.jsonl"
+    source.write_text("\n".join(LINES) + "\n", encoding="utf-8")
+
+    vader_analysis.main([str(source), str(target), "--workers", "1", "--chunk-size", "2"])
+
+    scores = [json.loads(line) for line in target.read_text(encoding="utf-8").splitlines()]
+    assert len(scores) == len(LINES)
+    analyzer = VaderSentimentAnalyzer(max_workers=1)
+    for text, row in zip(LINES, scores):
+        assert row == analyzer.analyze(text)
+    assert scores[1] == scores[3] == {"positive": 0.0, "negative": 0.0, "neutral": 1.0, "compound": 0.0}
+    assert scores[0]["compound"] > 0 > scores[2]["compound"]
+
+
+def test_pool_scores_match_in_process_scores():
+    texts = LINES * 7
+    pooled = list(VaderSentimentAnalyzer(chunk_size=3, max_workers=2).analyze_many(texts))
+    assert pooled == list(VaderSentimentAnalyzer(max_workers=1).analyze_many(texts))
+
+
+def test_single_chunk_scores_without_a_pool(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("started a process pool")
+
+    monkeypatch.setattr(vader_analysis, "ProcessPoolExecutor", no_pool)
+    analyzer = VaderSentimentAnalyzer(chunk_size=len(LINES))
+    assert list(analyzer.analyze_many(LINES)) == [analyzer.analyze(text) for text in LINES]
+    assert list(analyzer.analyze_many([])) == []